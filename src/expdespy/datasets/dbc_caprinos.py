@@ -1,7 +1,16 @@
 # src/expdespy/datasets/dbc_caprinos.py
 
+import numpy as np
 import pandas as pd
 
+_BLOCO = np.repeat(np.arange(1, 4, dtype=np.int8), 5)
+_PRODUTO = np.tile(np.arange(1, 6, dtype=np.int8), 3)
+_PPM = np.array([
+    83, 86, 103, 116, 132,  # bloco 1
+    63, 69, 79, 81, 98,     # bloco 2
+    55, 61, 79, 79, 91      # bloco 3
+], dtype=np.int64)
+
 
 def load_dbc_caprinos() -> tuple[pd.DataFrame, str]:
     """
@@ -9,16 +18,7 @@ def load_dbc_caprinos() -> tuple[pd.DataFrame, str]:
     aplicados a grupos de caprinos separados em 3 blocos por faixa etária. A variável resposta
     é a concentração de micronutrientes no sangue (ppm).
     """
-    data = {
-        "bloco": [1]*5 + [2]*5 + [3]*5,
-        "produto": [1, 2, 3, 4, 5]*3,
-        "ppm_micronutriente": [
-            83, 86, 103, 116, 132,  # bloco 1
-            63, 69, 79, 81, 98,     # bloco 2
-            55, 61, 79, 79, 91      # bloco 3
-        ]
-    }
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({"bloco": _BLOCO, "produto": _PRODUTO, "ppm_micronutriente": _PPM})
     desc = (
         "Experimento com 5 produtos comerciais fornecidos a caprinos organizados em 3 blocos "
         "de acordo com a idade. A variável resposta é a concentração de micronutrientes no sangue (ppm). "
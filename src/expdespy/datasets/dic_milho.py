@@ -1,23 +1,23 @@
 # src/expdespy/datasets/dic_milho.py
 
+import numpy as np
 import pandas as pd
 
+_VARIEDADE = pd.Categorical(["A"] * 5 + ["B"] * 5 + ["C"] * 5 + ["D"] * 5)
+_PRODUTIVIDADE = np.array([
+    25, 26, 20, 23, 21,  # A
+    31, 25, 28, 27, 24,  # B
+    22, 26, 28, 25, 29,  # C
+    33, 29, 31, 34, 28   # D
+], dtype=np.int64)
+
 
 def load_dic_milho() -> tuple[pd.DataFrame, str]:
     """
     Exemplo clássico de CRD (Delineamento Inteiramente Casualizado) com 4 variedades de milho
     e 5 repetições. A variável resposta é a produtividade (em sacas/ha).
     """
-    data = {
-        "variedade": ["A"] * 5 + ["B"] * 5 + ["C"] * 5 + ["D"] * 5,
-        "produtividade": [
-            25, 26, 20, 23, 21,  # A
-            31, 25, 28, 27, 24,  # B
-            22, 26, 28, 25, 29,  # C
-            33, 29, 31, 34, 28   # D
-        ]
-    }
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({"variedade": _VARIEDADE, "produtividade": _PRODUTIVIDADE})
     des = (
         "Experimento com 4 variedades de milho (A, B, C, D) distribuídas aleatoriamente "
         "em 20 parcelas (5 por variedade). A variável resposta é a produtividade em sacas por hectare. "
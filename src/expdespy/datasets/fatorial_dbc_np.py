@@ -1,5 +1,19 @@
+import numpy as np
 import pandas as pd
 
+_VALORES = {
+    (0, 0): [10.5, 11.0, 9.8, 11.2, 9.9],
+    (0, 1): [11.2, 11.0, 10.4, 13.1, 10.6],
+    (1, 0): [11.5, 12.4, 10.2, 12.7, 10.4],
+    (1, 1): [14.0, 14.1, 13.8, 13.5, 14.2],
+}
+_N_REPS = 5
+_BLOCK = np.tile(np.arange(1, _N_REPS + 1), len(_VALORES))
+_N = np.repeat([n for n, _ in _VALORES], _N_REPS)
+_P = np.repeat([p for _, p in _VALORES], _N_REPS)
+_PRODUTIVIDADE = np.concatenate(list(_VALORES.values()))
+
+
 def load_fatorial_rcbd_np():
     """
     Carrega dados de um experimento fatorial 2×2 em delineamento em blocos completos (RCBD),
@@ -13,18 +27,12 @@ def load_fatorial_rcbd_np():
         df (pd.DataFrame): colunas ['block', 'N', 'P', 'produtividade']
         description (dict): metadata com 'response', 'factors', etc.
     """
-    data = []
-    valores = {
-        (0,0): [10.5, 11.0, 9.8, 11.2, 9.9],
-        (0,1): [11.2, 11.0, 10.4, 13.1, 10.6],
-        (1,0): [11.5, 12.4, 10.2, 12.7, 10.4],
-        (1,1): [14.0, 14.1, 13.8, 13.5, 14.2],
-    }
-    for i, ((n, p), obs) in enumerate(valores.items()):
-        for rep, y in enumerate(obs, start=1):
-            data.append({'block': rep, 'N': n, 'P': p, 'produtividade': y})
-
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({
+        'block': _BLOCK,
+        'N': _N,
+        'P': _P,
+        'produtividade': _PRODUTIVIDADE,
+    })
     desc = """
         Dados de um experimento fatorial 2×2 em delineamento em blocos completos (RCBD),
         com 5 repetições por combinação de fatores.
@@ -1,7 +1,15 @@
 # src/expdespy/datasets/fatorial_dic_irrigacao.py
 
+import numpy as np
 import pandas as pd
 
+_F1 = np.repeat(np.array([0, 1], dtype=np.int8), 6)
+_F2 = np.tile(np.array([0, 0, 0, 1, 1, 1], dtype=np.int8), 2)
+_PRODUTIVIDADE = np.array([
+    25, 32, 27, 35, 28, 33,  # A0B0 e A0B1
+    41, 35, 38, 60, 67, 59   # A1B0 e A1B1
+], dtype=np.int64)
+
 
 def load_fatorial_dic():
     """
@@ -11,14 +19,6 @@ def load_fatorial_dic():
     Retorna:
         Tuple[pd.DataFrame, str]: dataframe com os dados e nome da variável resposta.
     """
-    data = {
-        "f1": [0]*6 + [1]*6,
-        "f2": [0, 0, 0, 1, 1, 1] * 2,
-        "produtividade": [
-            25, 32, 27, 35, 28, 33,  # A0B0 e A0B1
-            41, 35, 38, 60, 67, 59   # A1B0 e A1B1
-        ]
-    }
     description = {'description': """
         Dados de um experimento fatorial em CRD com dois fatores:
         Irrigação (f1) e Calagem (f2), ambos com dois níveis (0 = ausência, 1 = presença).
@@ -31,5 +31,5 @@ def load_fatorial_dic():
                     'f2': {0: 'ausência', 1: 'presença'}
                 }
     }
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({"f1": _F1, "f2": _F2, "produtividade": _PRODUTIVIDADE})
     return df, description
\ No newline at end of file
@@ -1,7 +1,17 @@
 # src/expdespy/datasets/fatorial_dic_irrigacao.py
 
+import numpy as np
 import pandas as pd
 
+_F1 = np.repeat(np.array([0, 1], dtype=np.int8), 10)
+_F2 = np.tile(np.repeat(np.array([0, 1], dtype=np.int8), 5), 2)
+_PRODUTIVIDADE = np.array([
+    10.5, 11.0, 9.8, 11.2, 9.9,    # N0P0
+    11.2, 11.0, 10.4, 13.1, 10.6,  # N0P1
+    11.5, 12.4, 10.2, 12.7, 10.4,  # N1P0
+    14.0, 14.1, 13.8, 13.5, 14.2   # N1P1
+])
+
 
 def load_fatorial_dic_nitrogenio_fosforo():
     """
@@ -12,17 +22,6 @@ def load_fatorial_dic_nitrogenio_fosforo():
     Returns:
         Tuple[pd.DataFrame, dict]: Dados e metadados do experimento.
     """
-    data = {
-        "f1": [0]*10 + [1]*10,
-        "f2": [0]*5 + [1]*5 + [0]*5 + [1]*5,
-        "produtividade": [
-            10.5, 11.0, 9.8, 11.2, 9.9,    # N0P0
-            11.2, 11.0, 10.4, 13.1, 10.6,  # N0P1
-            11.5, 12.4, 10.2, 12.7, 10.4,  # N1P0
-            14.0, 14.1, 13.8, 13.5, 14.2   # N1P1
-        ]
-    }
-
     description = {
         'description': """
             Dados de experimento fatorial em CRD com dois fatores:
@@ -38,5 +37,5 @@ def load_fatorial_dic_nitrogenio_fosforo():
         }
     }
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({"f1": _F1, "f2": _F2, "produtividade": _PRODUTIVIDADE})
     return df, description
\ No newline at end of file
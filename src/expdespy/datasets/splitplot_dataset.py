@@ -1,5 +1,35 @@
+import numpy as np
 import pandas as pd
 
+_DIC_VALORES = {
+    ("A", 0): [20.1, 20.3, 19.8],
+    ("A", 1): [22.5, 23.0, 22.1],
+    ("A", 2): [24.8, 25.0, 24.5],
+    ("B", 0): [19.5, 18.9, 19.8],
+    ("B", 1): [21.0, 20.7, 21.3],
+    ("B", 2): [22.0, 21.9, 22.4],
+}
+_DIC_N_REPS = 3
+_DIC_CULTIVAR = pd.Categorical(np.repeat([cultivar for cultivar, _ in _DIC_VALORES], _DIC_N_REPS))
+_DIC_ADUBO = np.repeat([adubo for _, adubo in _DIC_VALORES], _DIC_N_REPS)
+_DIC_PRODUTIVIDADE = np.concatenate(list(_DIC_VALORES.values()))
+
+_DBC_MEDIAS = {
+    ("A", 0): 20,
+    ("A", 1): 22.5,
+    ("A", 2): 25,
+    ("B", 0): 19,
+    ("B", 1): 21,
+    ("B", 2): 22,
+}
+_DBC_N_BLOCKS = 3
+_DBC_BLOCK = np.repeat(np.arange(1, _DBC_N_BLOCKS + 1), len(_DBC_MEDIAS))
+_DBC_CULTIVAR = pd.Categorical(np.tile([cultivar for cultivar, _ in _DBC_MEDIAS], _DBC_N_BLOCKS))
+_DBC_ADUBO = np.tile([adubo for _, adubo in _DBC_MEDIAS], _DBC_N_BLOCKS)
+_DBC_BASE = np.tile(list(_DBC_MEDIAS.values()), _DBC_N_BLOCKS)
+_DBC_JITTER = np.array([0.2, -0.1, 0.3])
+
+
 def load_splitplot_dic():
     """
     Carrega dados simulados para um experimento em parcelas subdivididas em CRD.
@@ -13,20 +43,11 @@ def load_splitplot_dic():
         df (pd.DataFrame): colunas ['cultivar', 'adubo', 'produtividade']
         description (dict): metadados do experimento
     """
-    data = []
-    valores = {
-        ("A", 0): [20.1, 20.3, 19.8],
-        ("A", 1): [22.5, 23.0, 22.1],
-        ("A", 2): [24.8, 25.0, 24.5],
-        ("B", 0): [19.5, 18.9, 19.8],
-        ("B", 1): [21.0, 20.7, 21.3],
-        ("B", 2): [22.0, 21.9, 22.4],
-    }
-    for (cultivar, adubo), obs in valores.items():
-        for y in obs:
-            data.append({'cultivar': cultivar, 'adubo': adubo, 'produtividade': y})
-    
-    df = pd.DataFrame(data)
+    df = pd.DataFrame({
+        'cultivar': _DIC_CULTIVAR,
+        'adubo': _DIC_ADUBO,
+        'produtividade': _DIC_PRODUTIVIDADE,
+    })
     desc = """
         Experimento com parcelas subdivididas (CRD): fator principal = Cultivar, subparcela = Adubo.
         3 repetições por combinação.
@@ -54,28 +75,16 @@ def load_splitplot_dbc():
         df (pd.DataFrame): colunas ['block', 'cultivar', 'adubo', 'produtividade']
         description (dict): metadados do experimento
     """
-    data = []
-    blocks = [1, 2, 3]
-    for block in blocks:
-        for cultivar in ["A", "B"]:
-            for adubo in [0, 1, 2]:
-                media = {
-                    ("A", 0): 20,
-                    ("A", 1): 22.5,
-                    ("A", 2): 25,
-                    ("B", 0): 19,
-                    ("B", 1): 21,
-                    ("B", 2): 22,
-                }[(cultivar, adubo)]
-                y = media + pd.Series([0.2, -0.1, 0.3]).sample(1).iloc[0]
-                data.append({
-                    'block': block,
-                    'cultivar': cultivar,
-                    'adubo': adubo,
-                    'produtividade': round(y, 2),
-                })
-    
-    df = pd.DataFrame(data)
+    # Estado global do NumPy, como o pd.Series.sample original: np.random.seed
+    # continua tornando o conjunto reprodutível
+    jitter = np.random.choice(_DBC_JITTER, size=len(_DBC_BASE))
+
+    df = pd.DataFrame({
+        'block': _DBC_BLOCK,
+        'cultivar': _DBC_CULTIVAR,
+        'adubo': _DBC_ADUBO,
+        'produtividade': np.round(_DBC_BASE + jitter, 2),
+    })
     desc = """
         Experimento com parcelas subdivididas (RCBD): fator principal = Cultivar, subparcela = Adubo.
         3 blocos (repetições).
@@ -0,0 +1,409 @@
+# src/expdespy/models/_fast_ols.py
+
+from itertools import combinations
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, qr, qr_delete, solve_triangular
+from scipy.special import fdtrc
+
+
+def _fit_anova_fast(y: np.ndarray, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Least-squares fit of `y` on a prebuilt design matrix `X` through a QR
+    decomposition, without going through the formula machinery.
+
+    Falls back to `np.linalg.lstsq` when `X` is rank-deficient.
+
+    Args:
+        y (np.ndarray): Response vector.
+        X (np.ndarray): Design matrix (treatment dummies plus intercept).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: Coefficients, residuals and
+            residual sum of squares.
+    """
+    # Compact (float32) design matrices are solved in double precision
+    X = np.asarray(X, dtype=float)
+    Q, R = np.linalg.qr(X)
+    diag = np.abs(np.diag(R))
+    if diag.size and diag.min() > np.finfo(float).eps * max(X.shape) * diag.max():
+        beta = solve_triangular(R, Q.T @ y)
+    else:
+        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+    resid = y - X @ beta
+    return beta, resid, float(resid @ resid)
+
+
+def _dummies(codes: np.ndarray, n_levels: int, dtype=float) -> np.ndarray:
+    """
+    Treatment-coded dummy columns for one factor, dropping the first
+    level as the reference (same coding as Patsy's `C()`).
+    """
+    block = np.zeros((codes.size, n_levels - 1), dtype=dtype)
+    rows = np.flatnonzero(codes > 0)
+    block[rows, codes[rows] - 1] = 1.0
+    return block
+
+
+def categorical_design(
+    factors: Sequence[np.ndarray], names: List[str], terms: Sequence[Tuple[int, ...]]
+) -> Tuple[np.ndarray, List[Tuple[str, slice, FrozenSet[str]]]]:
+    """
+    Treatment-coded design matrix of a model with categorical factors,
+    built directly from the factor codes instead of parsing a formula.
+
+    Produces the columns patsy gives for the same terms when every
+    lower-order term of an interaction is also in the model: an intercept,
+    the reduced dummies of each main effect, and the products of those
+    dummies for each interaction. Every entry is 0 or 1, so the matrix is
+    stored as float32 without loss, halving its memory traffic.
+
+    Args:
+        factors (Sequence[np.ndarray]): One label array (or categorical
+            Series) per factor, with no missing values.
+        names (List[str]): Label of each factor (e.g. "C(A)").
+        terms (Sequence[Tuple[int, ...]]): Terms of the model as tuples of
+            factor positions, in formula order (e.g. `[(0,), (1,), (0, 1)]`).
+
+    Returns:
+        Tuple[np.ndarray, List[Tuple[str, slice, FrozenSet[str]]]]: Design
+            matrix and, for each term, the label, column slice and factor
+            names expected by `type2_anova`.
+    """
+    dummies = []
+    for labels in factors:
+        codes, uniques = pd.factorize(labels, sort=True)
+        dummies.append(_dummies(codes, len(uniques), dtype=np.float32))
+    n = dummies[0].shape[0] if dummies else 0
+
+    blocks = [np.ones((n, 1), dtype=np.float32)]
+    slices = []
+    start = 1
+    for term in terms:
+        block = dummies[term[0]]
+        for a in term[1:]:
+            # Row-wise outer product of the dummy blocks
+            block = (block[:, :, None] * dummies[a][:, None, :]).reshape(n, -1)
+        blocks.append(block)
+        label = ":".join(names[a] for a in term)
+        slices.append((label, slice(start, start + block.shape[1]), frozenset(names[a] for a in term)))
+        start += block.shape[1]
+    return np.hstack(blocks), slices
+
+
+def _is_orthogonal(codes: List[np.ndarray], n_levels: List[int]) -> bool:
+    """
+    True when every pair of factors has proportional cell counts
+    (n_ij = n_i * n_j / N), as in balanced CRD, RCBD and LSD layouts.
+    """
+    n = codes[0].size
+    for i in range(len(codes)):
+        for j in range(i + 1, len(codes)):
+            cells = np.bincount(codes[i] * n_levels[j] + codes[j],
+                                minlength=n_levels[i] * n_levels[j])
+            expected = np.outer(np.bincount(codes[i]), np.bincount(codes[j])) / n
+            if not np.allclose(cells.reshape(n_levels[i], n_levels[j]), expected):
+                return False
+    return True
+
+
+def fit_anova(y: np.ndarray, factors: Sequence[np.ndarray], names: List[str]) -> pd.DataFrame:
+    """
+    Type II ANOVA for an additive model with categorical factors only
+    (no interactions), as used by CRD, RCBD and LSD.
+
+    When the factors are orthogonal (balanced layouts) each sum of squares
+    is the closed-form Σ n_i (ȳ_i − ȳ)² from group sums, with no matrix
+    factorisation. Otherwise the Type II sum of squares of a factor is the
+    increase in residual SS when that factor alone is dropped, computed
+    from one full fit plus one reduced fit per factor on dense dummy
+    matrices.
+
+    Args:
+        y (np.ndarray): Response vector.
+        factors (Sequence[np.ndarray]): One label array (or categorical
+            Series) per factor, aligned with `y`.
+        names (List[str]): Row label for each factor (e.g. "C(treatment)").
+
+    Returns:
+        pd.DataFrame: Table with the same layout as
+            `anova_lm(model, typ=2)`: columns `sum_sq`, `df`, `F`, `PR(>F)`
+            and a final "Residual" row.
+    """
+    y = np.asarray(y, dtype=float)
+    codes, n_levels = [], []
+    for labels in factors:
+        c, uniques = pd.factorize(labels, sort=True)
+        codes.append(c)
+        n_levels.append(len(uniques))
+
+    sum_sq = np.empty(len(codes) + 1)
+    df = np.empty(len(codes) + 1)
+    if _is_orthogonal(codes, n_levels):
+        yc = y - y.mean()
+        for i, c in enumerate(codes):
+            sum_sq[i] = np.sum(np.bincount(c, weights=yc) ** 2 / np.bincount(c))
+            df[i] = n_levels[i] - 1
+        ss_res = float(yc @ yc) - sum_sq[:-1].sum()
+        df_res = y.size - 1 - df[:-1].sum()
+    else:
+        blocks = [_dummies(c, k) for c, k in zip(codes, n_levels)]
+        intercept = np.ones((y.size, 1))
+        X_full = np.hstack([intercept, *blocks])
+        _, _, ss_res = _fit_anova_fast(y, X_full)
+        df_res = y.size - np.linalg.matrix_rank(X_full)
+        for i in range(len(blocks)):
+            X_red = np.hstack([intercept, *blocks[:i], *blocks[i + 1:]])
+            _, _, ss_red = _fit_anova_fast(y, X_red)
+            sum_sq[i] = ss_red - ss_res
+            df[i] = blocks[i].shape[1]
+    sum_sq[-1] = ss_res
+    df[-1] = df_res
+
+    F = (sum_sq / df) / (ss_res / df_res)
+    F[-1] = np.nan
+    p = fdtrc(df, df_res, F)
+
+    return pd.DataFrame(
+        {"sum_sq": sum_sq, "df": df, "F": F, "PR(>F)": p},
+        index=list(names) + ["Residual"],
+    )
+
+
+def _rss_cholesky(gram: np.ndarray, xty: np.ndarray, yty: float) -> Optional[float]:
+    """
+    Residual sum of squares of a least-squares fit from its normal
+    equations, solved by Cholesky.
+
+    Returns None when the Gram matrix is not positive definite or is too
+    ill-conditioned for the squared-condition-number normal equations, so
+    the caller can fall back to a QR fit.
+    """
+    try:
+        factor = cho_factor(gram, check_finite=False)
+    except LinAlgError:
+        return None
+    # The spread of diag(L) tracks cond(X); past eps**-0.25 the squared
+    # condition number of X'X would cost more than half the digits
+    diag = np.abs(np.diag(factor[0]))
+    if diag.min() <= np.finfo(float).eps ** 0.25 * diag.max():
+        return None
+    beta = cho_solve(factor, xty, check_finite=False)
+    return max(yty - float(xty @ beta), 0.0)
+
+
+def _rss_qr_delete(Q: np.ndarray, R: np.ndarray, y: np.ndarray, drop: np.ndarray) -> float:
+    """
+    Residual sum of squares of the fit on the columns of X left after
+    removing `drop`, from the economic QR decomposition `X = QR`.
+
+    The dropped columns are removed from the existing factorisation with
+    Givens updates (`scipy.linalg.qr_delete`), one contiguous run at a
+    time from the right, instead of factorising the reduced matrix again.
+    """
+    if drop.size:
+        runs = np.split(drop, np.flatnonzero(np.diff(drop) > 1) + 1)
+        for run in reversed(runs):
+            Q, R = qr_delete(Q, R, int(run[0]), run.size, which="col", check_finite=False)
+    resid = y - Q @ (Q.T @ y)
+    return float(resid @ resid)
+
+
+def type2_anova(
+    y: np.ndarray, X: np.ndarray, terms: Sequence[Tuple[str, slice, FrozenSet[str]]]
+) -> Optional[pd.DataFrame]:
+    """
+    Type II ANOVA for any model given as a design matrix whose columns are
+    grouped into terms, such as the matrices patsy builds from a formula.
+
+    The sum of squares of a term is the increase in residual SS when it is
+    dropped from the model that already excludes every higher-order term
+    containing it (the comparison `anova_lm(typ=2)` makes). Each reduced
+    model uses a column subset of `X`, solved by Cholesky on the matching
+    block of `X'X` (computed once). Ill-conditioned subsets fall back to
+    one QR decomposition of `X`, downdated by column deletion for each
+    subset. Nothing is re-parsed or refactorised, and every subset is
+    fitted only once.
+
+    Args:
+        y (np.ndarray): Response vector.
+        X (np.ndarray): Full design matrix.
+        terms (Sequence[Tuple[str, slice, FrozenSet[str]]]): For each
+            tested term, its row label, its column slice in `X` and the
+            names of the factors it involves. Columns outside every slice
+            (the intercept) are kept in all fits.
+
+    Returns:
+        Optional[pd.DataFrame]: Table with the same layout as
+            `anova_lm(model, typ=2)`, or None when `X` is rank-deficient
+            (e.g. an empty cell), where the sums of squares of nested
+            fits no longer match `anova_lm`.
+    """
+    y = np.asarray(y, dtype=float)
+    in_term = np.zeros(X.shape[1], dtype=bool)
+    for _, cols, _ in terms:
+        in_term[cols] = True
+    always = np.flatnonzero(~in_term)
+
+    # Every reduced model is a column subset of X, so its normal equations
+    # are a sub-block of one Gram matrix. The response is centred so that
+    # RSS = y'y - c'beta stays well conditioned (the intercept is in every fit).
+    yc = y - y.mean()
+    if X.dtype == np.float32 and y.size < 2 ** 24:
+        # 0/1 dummies: the entries of X'X are counts, exact in single
+        # precision below 2**24 rows, so the product runs in float32
+        gram = (X.T @ X).astype(float)
+    else:
+        gram = np.asarray(X.T @ X, dtype=float)
+    xty = yc @ X.astype(float, copy=False)
+    yty = float(yc @ yc)
+    rss_cache = {}
+    full_qr = []  # economic QR of X, factorised on first use
+
+    def rss_without(dropped: FrozenSet[int]) -> float:
+        if dropped not in rss_cache:
+            keep = np.concatenate([always] + [np.arange(X.shape[1])[cols]
+                                              for j, (_, cols, _) in enumerate(terms) if j not in dropped])
+            rss = _rss_cholesky(gram[np.ix_(keep, keep)], xty[keep], yty)
+            if rss is None:
+                # Ill-conditioned subset: downdate the QR of the full model
+                if not full_qr:
+                    full_qr.extend(qr(X.astype(float), mode="economic", check_finite=False))
+                drop = np.setdiff1d(np.arange(X.shape[1]), keep)
+                rss = _rss_qr_delete(*full_qr, yc, drop)
+            rss_cache[dropped] = rss
+        return rss_cache[dropped]
+
+    rank = np.linalg.matrix_rank(X)
+    if rank < X.shape[1]:
+        # Empty cells: anova_lm tests the estimable contrasts instead
+        return None
+    ss_res = rss_without(frozenset())
+    df_res = y.size - rank
+
+    sum_sq = np.empty(len(terms) + 1)
+    df = np.empty(len(terms) + 1)
+    for i, (_, cols, factors) in enumerate(terms):
+        containing = frozenset(j for j, (_, _, other) in enumerate(terms) if factors < other)
+        sum_sq[i] = rss_without(containing | {i}) - rss_without(containing)
+        df[i] = len(range(X.shape[1])[cols])
+    sum_sq[-1] = ss_res
+    df[-1] = df_res
+
+    F = (sum_sq / df) / (ss_res / df_res)
+    F[-1] = np.nan
+    p = fdtrc(df, df_res, F)
+
+    return pd.DataFrame(
+        {"sum_sq": sum_sq, "df": df, "F": F, "PR(>F)": p},
+        index=[name for name, _, _ in terms] + ["Residual"],
+    )
+
+
+def factorial_anova(y: np.ndarray, factors: Sequence[np.ndarray], names: List[str]) -> Optional[pd.DataFrame]:
+    """
+    Type II ANOVA of a full factorial model (all main effects and
+    interactions) when every cell has the same number of replicates.
+
+    In a balanced, complete factorial all terms are orthogonal, so the
+    Type II sum of squares of a term is its marginal sum of squares minus
+    those of the lower-order terms it contains, all computed from the
+    cell sums of the centred response. No model is fitted.
+
+    Args:
+        y (np.ndarray): Response vector.
+        factors (Sequence[np.ndarray]): One label array (or categorical
+            Series) per factor, aligned with `y`.
+        names (List[str]): Row label of each factor (e.g. "C(A)");
+            interaction rows are labelled "C(A):C(B)", in the order
+            patsy gives the terms.
+
+    Returns:
+        Optional[pd.DataFrame]: Table with the layout of
+            `anova_lm(model, typ=2)`, or None when the design is
+            unbalanced, has empty cells or has no residual degrees of
+            freedom.
+    """
+    y = np.asarray(y, dtype=float)
+    codes, n_levels = [], []
+    for labels in factors:
+        c, uniques = pd.factorize(labels, sort=True)
+        codes.append(c)
+        n_levels.append(len(uniques))
+
+    cells = np.ravel_multi_index(codes, n_levels)
+    counts = np.bincount(cells, minlength=int(np.prod(n_levels)))
+    df_res = y.size - counts.size
+    if counts.min() == 0 or counts.min() != counts.max() or df_res <= 0:
+        return None
+
+    yc = y - y.mean()
+    cell_sums = np.bincount(cells, weights=yc, minlength=counts.size).reshape(n_levels)
+    axes = range(len(n_levels))
+    terms = [combo for order in range(1, len(n_levels) + 1) for combo in combinations(axes, order)]
+
+    effect_ss = {}
+    for term in terms:
+        others = tuple(a for a in axes if a not in term)
+        margin = cell_sums.sum(axis=others) if others else cell_sums
+        marginal_ss = float(np.sum(margin ** 2)) * margin.size / y.size
+        # Remove the lower-order terms nested in this one
+        effect_ss[term] = marginal_ss - sum(
+            effect_ss[sub] for order in range(1, len(term)) for sub in combinations(term, order)
+        )
+
+    ss_res = float(yc @ yc) - sum(effect_ss.values())
+    sum_sq = np.array([effect_ss[t] for t in terms] + [ss_res])
+    df = np.array([float(np.prod([n_levels[a] - 1 for a in t])) for t in terms] + [float(df_res)])
+    F = (sum_sq / df) / (ss_res / df_res)
+    F[-1] = np.nan
+    p = fdtrc(df, df_res, F)
+
+    return pd.DataFrame(
+        {"sum_sq": sum_sq, "df": df, "F": F, "PR(>F)": p},
+        index=[":".join(names[a] for a in t) for t in terms] + ["Residual"],
+    )
+
+
+def oneway_anova(y: np.ndarray, codes: np.ndarray, name: str) -> pd.DataFrame:
+    """
+    One-way ANOVA from per-group counts and sums computed with
+    `np.bincount`, without building a design matrix.
+
+    Args:
+        y (np.ndarray): Response vector.
+        codes (np.ndarray): Integer group codes aligned with `y`, as returned
+            by `pd.factorize`; negative codes and missing responses are dropped.
+        name (str): Row label for the factor (e.g. "C(treatment)").
+
+    Returns:
+        pd.DataFrame: Table with the same layout as `anova_lm(model, typ=2)`.
+    """
+    y = np.asarray(y, dtype=float)
+    keep = (codes >= 0) & ~np.isnan(y)
+    y, codes = y[keep], codes[keep]
+    # Centre first so the sum-of-squares identities stay well conditioned
+    y = y - y.mean()
+
+    counts = np.bincount(codes)
+    sums = np.bincount(codes, weights=y)
+    present = counts > 0
+    ss_between = float(np.sum(sums[present] ** 2 / counts[present]))
+    ss_within = float(y @ y) - ss_between
+
+    df_between = int(present.sum()) - 1
+    df_within = y.size - df_between - 1
+    F = (ss_between / df_between) / (ss_within / df_within)
+    p = fdtrc(df_between, df_within, F)
+
+    return pd.DataFrame(
+        {
+            "sum_sq": [ss_between, ss_within],
+            "df": [float(df_between), float(df_within)],
+            "F": [F, np.nan],
+            "PR(>F)": [p, np.nan],
+        },
+        index=[name, "Residual"],
+    )
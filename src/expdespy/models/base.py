@@ -1,26 +1,123 @@
 # src/expdespy/models/base.py
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import scipy.stats as stats
-import statsmodels.formula.api as smf
-from statsmodels.stats.anova import anova_lm
+
+from expdespy.models._fast_ols import _fit_anova_fast, fit_anova, type2_anova
+from expdespy.posthoc import PostHocLoader
+from expdespy.stats import levene_fast, shapiro_fast
+
+_FACTOR_RE = re.compile(r"C\((\w+)\)")
+_SIGNIF_BINS = np.array([0.001, 0.01, 0.05])
+_SIGNIF_LABELS = np.array(["***", "**", "*", "ns"], dtype=object)
+# Indexed by whether H0 was rejected
+_CONCLUSION = ("H0 not rejected", "H0 rejected")
+# Above this many residuals scipy's Shapiro-Wilk p-value is no longer accurate
+_SHAPIRO_MAX_N = 5000
+
+
+def _significance_markers(p: np.ndarray, nan_marker: str = " ") -> np.ndarray:
+    """
+    Maps p-values to significance markers (***, **, *, ns) with a single
+    `np.searchsorted` over the cut points 0.001, 0.01 and 0.05.
+
+    Args:
+        p (np.ndarray): P-values; NaN for rows without a test (Residual).
+        nan_marker (str, optional): Marker used for NaN p-values.
+
+    Returns:
+        np.ndarray: One marker per p-value.
+    """
+    markers = _SIGNIF_LABELS[np.searchsorted(_SIGNIF_BINS, p, side="right")]
+    markers[np.isnan(p)] = nan_marker
+    return markers
+
+
+def _split_by_codes(values: np.ndarray, codes: np.ndarray) -> List[np.ndarray]:
+    """
+    Partitions `values` into one array per group code with a single
+    stable argsort, instead of materialising a DataFrame per group.
+
+    Args:
+        values (np.ndarray): Values to partition (e.g. the response).
+        codes (np.ndarray): Integer group codes aligned with `values`, as
+            returned by `pd.factorize`; negative codes (missing labels) are dropped.
+
+    Returns:
+        List[np.ndarray]: Values of each group, ordered by code.
+    """
+    keep = codes >= 0
+    values, codes = values[keep], codes[keep]
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes))[:-1]
+    return np.split(values[order], bounds)
+
+
+def _formula_design_info(ols):
+    """
+    Patsy term-to-column mapping of a model built from a formula.
+
+    It is read from the model data rather than from `orig_exog`, which
+    is a plain DataFrame without it when statsmodels drops rows with
+    missing values. statsmodels 0.15 stores it as `model_spec`, earlier
+    versions as `design_info`.
+
+    Args:
+        ols: Model returned by `statsmodels.formula.api.ols`.
+
+    Returns:
+        patsy.DesignInfo: Term names and column slices of the design matrix.
+    """
+    data = ols.data
+    design_info = getattr(data, "model_spec", None)
+    return design_info if design_info is not None else data.design_info
+
+
+def _combined_codes(data: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Integer code of each row's combination of `columns`, numbered 0..k-1
+    over the observed combinations in sorted order (the group order of
+    `data.groupby(columns)`).
+
+    Args:
+        data (pd.DataFrame): Dataset.
+        columns (List[str]): Label columns to cross.
+
+    Returns:
+        np.ndarray: Group codes; rows with a missing label get -1.
+    """
+    codes = np.zeros(len(data), dtype=np.int64)
+    valid = np.ones(len(data), dtype=bool)
+    for col in columns:
+        col_codes, uniques = pd.factorize(data[col], sort=True)
+        codes = codes * len(uniques) + col_codes
+        valid &= col_codes >= 0
+    # Renumber so unobserved combinations leave no empty groups
+    combined = np.full(len(data), -1, dtype=np.int64)
+    combined[valid] = np.unique(codes[valid], return_inverse=True)[1]
+    return combined
+
 
 class ExperimentalDesign(ABC):
     """
     Abstract base class for experimental designs.
 
-    This class provides common methods for statistical analysis,
-    such as ANOVA, assumption checking, post hoc testing, and
-    visualization of group means.
+    This class provides the common statistical analysis shared by
+    every design: ANOVA and checking of its assumptions. Post hoc
+    tests and plots live in `expdespy.posthoc`.
 
     Each specific design should inherit from this class and
     implement the abstract method `_get_formula`, which returns
     the statistical formula used for modeling.
 
+    Treatment (and block) columns are converted to `pd.Categorical`
+    on construction, so the grouping steps work on integer codes
+    instead of hashing Python strings on every call.
+
     Attributes:
         data (pd.DataFrame): Experimental dataset.
         response (str): Name of the response variable.
@@ -31,6 +128,54 @@ class ExperimentalDesign(ABC):
         self.data = data
         self.response = response
         self.treatment = treatment
+        self._as_categorical(treatment)
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """pd.DataFrame: Experimental dataset; reassigning it clears the cached fits."""
+        return self._data
+
+    @data.setter
+    def data(self, value: pd.DataFrame):
+        # Replacing the dataset invalidates every cached fit
+        self._data = value
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Drops the cached model fit, design matrices, ANOVA table, post hoc
+        letters and columns.
+
+        Reassigning `data` does this automatically; call it after
+        modifying `data` in place (same object, same shape).
+        """
+        self._model_cache = None
+        self._design_cache = None
+        self._matrix_cache = None
+        self._anova_cache = None
+        self._resid_cache = None
+        self._normality_cache = None
+        self._letters_cache = None
+        self._column_cache = {}
+
+    def _as_categorical(self, *columns: str):
+        """
+        Stores the given label columns as `pd.Categorical`, once.
+
+        Columns that are missing (e.g. a formula passed as `treatment`) or
+        already categorical are left alone. The conversion goes through
+        `DataFrame.assign`, so the caller's frame is never modified.
+
+        Args:
+            *columns (str): Names of label columns (treatment, blocks).
+        """
+        convert = {
+            col: self.data[col].astype("category")
+            for col in columns
+            if col in self.data.columns and not isinstance(self.data[col].dtype, pd.CategoricalDtype)
+        }
+        if convert:
+            self.data = self.data.assign(**convert)
 
     @abstractmethod
     def _get_formula(self) -> str:
@@ -45,6 +190,274 @@ class ExperimentalDesign(ABC):
         """
         pass
 
+    def _column(self, name: str) -> np.ndarray:
+        """
+        Returns column `name` of `self.data` as a NumPy array.
+
+        The array is taken with `to_numpy(copy=False)` and cached until
+        `self.data` is reassigned or changes shape, so repeated calls skip
+        the column lookup and conversion.
+
+        Args:
+            name (str): Column name.
+
+        Returns:
+            np.ndarray: Column values.
+        """
+        cached = self._column_cache.get(name)
+        if cached is None or cached[0] != self.data.shape:
+            cached = (self.data.shape, self.data[name].to_numpy(copy=False))
+            self._column_cache[name] = cached
+        return cached[1]
+
+    def _anova_factors(self) -> Optional[List[str]]:
+        """
+        Returns the factor columns of an additive, interaction-free design.
+
+        Designs that override this (CRD, RCBD, LSD) get their ANOVA table
+        from the NumPy path in `_fast_ols` instead of statsmodels. The
+        order must match the terms of `_get_formula`.
+
+        Returns:
+            Optional[List[str]]: Factor column names, or None to use statsmodels.
+        """
+        return None
+
+    def _fast_anova(self) -> Optional[pd.DataFrame]:
+        """
+        Computes the ANOVA table without statsmodels, when the design allows it.
+
+        The default handles the additive designs declared through
+        `_anova_factors`. Subclasses can override it for other layouts and
+        return None to fall back to `anova_lm`.
+
+        Returns:
+            Optional[pd.DataFrame]: Type II ANOVA table, or None.
+        """
+        factors = self._anova_factors()
+        if factors is None:
+            return None
+        data = self.data.dropna(subset=[self.response, *factors])
+        return fit_anova(
+            data[self.response].to_numpy(),
+            # Categorical columns are factorized from their codes
+            [data[f] for f in factors],
+            [f"C({f})" for f in factors],
+        )
+
+    def _cache_key(self) -> tuple:
+        """
+        Key under which fits are cached: the formula plus the identity and
+        shape of `self.data`.
+        """
+        return (self._get_formula(), id(self.data), self.data.shape)
+
+    def _ols_model(self):
+        """
+        Returns the unfitted OLS model built from `_get_formula`.
+
+        Parsing the formula (missing-value handling and categorical
+        encoding) is the expensive part of `smf.ols`, so the model is
+        built once per cache key and shared by `_fitted_model` and
+        `_design_matrices`.
+
+        Returns:
+            OLS: Unfitted statsmodels OLS model.
+        """
+        import statsmodels.formula.api as smf
+
+        key = self._cache_key()
+        if self._design_cache is None or self._design_cache[0] != key:
+            # The model keeps a reference to the data, so its id cannot be
+            # recycled while the entry is alive
+            self._design_cache = (key, smf.ols(key[0], data=self.data))
+        return self._design_cache[1]
+
+    def _fitted_model(self):
+        """
+        Returns the OLS model fitted with the formula from `_get_formula`.
+
+        The fit is cached on the instance and reused by `run_anova` and
+        `check_assumptions`; it is refitted only when the formula changes,
+        `self.data` is reassigned or its shape changes.
+
+        Returns:
+            RegressionResultsWrapper: Fitted statsmodels OLS results.
+        """
+        ols = self._ols_model()
+        if self._model_cache is None or self._model_cache[0] is not ols:
+            self._model_cache = (ols, ols.fit())
+        return self._model_cache[1]
+
+    def _build_design(self) -> Optional[Tuple[np.ndarray, np.ndarray, list]]:
+        """
+        Builds the response, design matrix and term layout of the model
+        without patsy.
+
+        Designs whose formula is fixed by their structure override this to
+        skip formula parsing; the default returns None, and the matrices
+        are taken from the parsed formula instead.
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray, list]]: Response vector,
+                design matrix and `(label, slice, factor names)` for each
+                term, or None.
+        """
+        return None
+
+    def _design(self) -> Tuple[np.ndarray, np.ndarray, list]:
+        """
+        Returns the response vector, design matrix and term layout of the
+        model, cached under the same key as the fitted model.
+
+        They come from `_build_design` when the design provides it, and
+        otherwise from the parsed formula (using patsy's term-to-column
+        mapping), without fitting.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, list]: Response vector, design
+                matrix and `(label, slice, factor names)` for each term
+                (the intercept excluded).
+        """
+        key = self._cache_key()
+        if self._matrix_cache is None or self._matrix_cache[0] != key:
+            design = self._build_design()
+            if design is None:
+                ols = self._ols_model()
+                design_info = _formula_design_info(ols)
+                terms = [
+                    (term.name(), design_info.slice(term), frozenset(f.name() for f in term.factors))
+                    for term in design_info.terms
+                    if term.factors  # the intercept is kept in every fit
+                ]
+                design = (ols.endog, ols.exog, terms)
+            self._matrix_cache = (key, design)
+        return self._matrix_cache[1]
+
+    def _design_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the response vector and design matrix of the model,
+        without fitting.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Response vector and design matrix.
+        """
+        y, X, _ = self._design()
+        return y, X
+
+    def _residuals(self) -> np.ndarray:
+        """
+        Returns the residuals of the model.
+
+        They come from a QR solve on the cached design matrices (no
+        statsmodels fit) and are cached under the same key as the fitted
+        model, so repeated assumption checks reuse them.
+
+        Returns:
+            np.ndarray: Read-only residual vector.
+        """
+        key = self._cache_key()
+        if self._resid_cache is None or self._resid_cache[0] != key:
+            _, residuals, _ = _fit_anova_fast(*self._design_matrices())
+            residuals.setflags(write=False)
+            self._resid_cache = (key, residuals)
+        return self._resid_cache[1]
+
+    def _normality(self) -> Tuple[str, float]:
+        """
+        Normality test of the residuals: Shapiro-Wilk, or D'Agostino-Pearson
+        above `_SHAPIRO_MAX_N` residuals, where the Shapiro-Wilk p-value is
+        unreliable.
+
+        The result is cached under the same key as the residuals, so
+        repeated assumption checks do not rerun the test.
+
+        Returns:
+            Tuple[str, float]: Name of the test used and its p-value.
+        """
+        key = self._cache_key()
+        if self._normality_cache is None or self._normality_cache[0] != key:
+            residuals = self._residuals()
+            if len(residuals) <= _SHAPIRO_MAX_N:
+                result = ("Shapiro-Wilk", shapiro_fast(residuals).pvalue)
+            else:
+                # scipy.stats is only needed on this branch
+                from scipy.stats import normaltest
+
+                result = ("D'Agostino-Pearson", normaltest(residuals).pvalue)
+            self._normality_cache = (key, result)
+        return self._normality_cache[1]
+
+    def _type2_anova(self) -> Optional[pd.DataFrame]:
+        """
+        Type II ANOVA of the model computed with NumPy from the cached
+        design matrix and its term layout (see `_fast_ols.type2_anova`).
+
+        Returns:
+            Optional[pd.DataFrame]: Type II ANOVA table, or None for a
+                rank-deficient design.
+        """
+        return type2_anova(*self._design())
+
+    def _compact_letters(
+        self, posthoc: str, alpha: float, factor: str, stratum, get_data: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Compact letter display of `factor`, cached per dataset.
+
+        Post hoc results are kept under (posthoc, alpha, factor, stratum)
+        for as long as the cached model is valid, so calling
+        `unfold_interactions` again (e.g. to print the results) reuses them.
+
+        Args:
+            posthoc (str): Post hoc test name, as accepted by `PostHocLoader`.
+            alpha (float): Significance level.
+            factor (str): Factor whose levels are compared.
+            stratum: Hashable identifier of the data subset (None for the full data).
+            get_data (Callable[[], pd.DataFrame]): Returns the data subset;
+                only called on a cache miss.
+
+        Returns:
+            pd.DataFrame: Copy of the compact letter display.
+        """
+        key = self._cache_key()
+        if self._letters_cache is None or self._letters_cache[0] != key:
+            self._letters_cache = (key, {})
+        entries = self._letters_cache[1]
+        entry = (posthoc, alpha, factor, stratum)
+        if entry not in entries:
+            entries[entry] = PostHocLoader.create(
+                test_name=posthoc,
+                data=get_data(),
+                values_column=self.response,
+                treatments_column=factor,
+                alpha=alpha,
+            ).run_compact_letters_display()
+        return entries[entry].copy()
+
+    def _anova_table(self) -> pd.DataFrame:
+        """
+        Returns the Type II ANOVA table of the design.
+
+        Designs handled by `_fast_anova` are solved with NumPy; every
+        other design goes through `anova_lm` on the fitted statsmodels
+        model. The table is cached
+        under the same key as the fitted model and a copy is returned so
+        callers can add columns freely.
+
+        Returns:
+            pd.DataFrame: Type II ANOVA table.
+        """
+        key = self._cache_key()
+        if self._anova_cache is None or self._anova_cache[0] != key:
+            table = self._fast_anova()
+            if table is None:
+                from statsmodels.stats.anova import anova_lm
+
+                table = anova_lm(self._fitted_model(), typ=2)
+            self._anova_cache = (key, table)
+        return self._anova_cache[1].copy()
+
     def run_anova(self) -> pd.DataFrame:
         """
         Performs Analysis of Variance (ANOVA) using the formula
@@ -53,31 +466,16 @@ class ExperimentalDesign(ABC):
         Returns:
             pd.DataFrame: ANOVA table of the fitted model (Type II).
         """
-        formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-
-        def significance_marker(p):
-            if p < 0.001:
-                return "***"
-            elif p < 0.01:
-                return "**"
-            elif p < 0.05:
-                return "*"
-            elif np.isnan(p):
-                return " "
-            else:
-                return "ns"
-
-        anova_table = anova_lm(model, typ=2)
-        # Add significance markers
-        anova_table["Signif"] = anova_table["PR(>F)"].apply(significance_marker)
+        anova_table = self._anova_table()
+        anova_table["Signif"] = _significance_markers(anova_table["PR(>F)"].to_numpy())
 
         return anova_table
 
     def check_assumptions(self, alpha: float = 0.05, print_conclusions: bool = True) -> Dict[str, bool]:
         """
         Checks the assumptions of ANOVA:
-        - Normality of residuals (Shapiro-Wilk test)
+        - Normality of residuals (Shapiro-Wilk test; D'Agostino-Pearson
+          above 5000 residuals, where the Shapiro-Wilk p-value is unreliable)
         - Homoscedasticity (Levene's test)
 
         Args:
@@ -88,34 +486,16 @@ class ExperimentalDesign(ABC):
             Dict[str, Dict]: Dictionary containing the results of the tests.
         """
         formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-        residuals = model.resid
-
-        # Normality test
-        normality_p = stats.shapiro(residuals).pvalue
+        # Normality test, cached with the residuals
+        normality_test, normality_p = self._normality()
         is_normal = normality_p > alpha
 
         # Homoscedasticity test
         try:
-            import re
-            factor_names = re.findall(r"C\((\w+)\)", formula)
-            if not factor_names:
-                factor_names = [self.treatment]
-<<<<<<< Updated upstream
-
-<<<<<<< HEAD
-=======
-            # Agrupar pelos fatores para o teste de Levene
-=======
-            else:
-                factor_names = factor_names[0]
->>>>>>> Stashed changes
->>>>>>> develop
-            groups = [
-                group[self.response].values
-                for _, group in self.data.groupby(factor_names)
-            ]
-            levene_p = stats.levene(*groups).pvalue
+            factor_names = _FACTOR_RE.findall(formula)
+            factor = factor_names[0] if factor_names else self.treatment
+            codes, _ = pd.factorize(self.data[factor])
+            levene_p = levene_fast(self._column(self.response), codes).pvalue
             is_homoscedastic = levene_p > alpha
         except Exception as e:
             levene_p = np.nan
@@ -123,32 +503,36 @@ class ExperimentalDesign(ABC):
             if print_conclusions:
                 print(f"[ERROR while checking homoscedasticity]: {e}")
 
+        normality_conclusion = _CONCLUSION[not is_normal]
+        homoscedasticity_conclusion = _CONCLUSION[not is_homoscedastic]
+
         if print_conclusions:
             print(f"""
-    Normality (Shapiro-Wilk):
+    Normality ({normality_test}):
         H0: Residuals are normally distributed
         H1: Residuals are not normally distributed
         p-value: {normality_p:.4f}
-        Conclusion: H0 {"not rejected" if is_normal else "rejected"}
+        Conclusion: {normality_conclusion}
 
     Homoscedasticity (Levene):
         H0: Group variances are equal
         H1: Group variances are not equal
         p-value: {levene_p if not np.isnan(levene_p) else 'N/A'}
-        Conclusion: H0 {"not rejected" if is_homoscedastic else "rejected"}
+        Conclusion: {homoscedasticity_conclusion}
     """)
 
         return {
             "normality (Shapiro-Wilk)": {
+                "Test": normality_test,
                 "H0": "Residuals are normally distributed",
                 "H1": "Residuals are not normally distributed",
                 "p-value": normality_p,
-                "Conclusion": "H0 not rejected" if is_normal else "H0 rejected",
+                "Conclusion": normality_conclusion,
             },
             "homoscedasticity (Levene)": {
                 "H0": "Group variances are equal",
                 "H1": "Group variances are not equal",
                 "p-value": levene_p,
-                "Conclusion": "H0 not rejected" if is_homoscedastic else "H0 rejected",
+                "Conclusion": homoscedasticity_conclusion,
             }
         }
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import List
+
 from expdespy.models.base import ExperimentalDesign
 import pandas as pd
 
@@ -6,6 +8,10 @@ class RCBD(ExperimentalDesign):
     def __init__(self, data: pd.DataFrame, response: str, treatment: str, block: str):
         super().__init__(data, response, treatment)
         self.block = block
+        self._as_categorical(block)
 
     def _get_formula(self) -> str:
         return f"{self.response} ~ C({self.treatment}) + C({self.block})"
+
+    def _anova_factors(self) -> List[str]:
+        return [self.treatment, self.block]
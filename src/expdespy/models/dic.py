@@ -1,6 +1,11 @@
+from typing import List
+
 from expdespy.models.base import ExperimentalDesign
 
 
 class CRD(ExperimentalDesign):
     def _get_formula(self) -> str:
         return f"{self.response} ~ C({self.treatment})"
+
+    def _anova_factors(self) -> List[str]:
+        return [self.treatment]
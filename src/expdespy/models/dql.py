@@ -1,3 +1,5 @@
+from typing import List
+
 from expdespy.models.base import ExperimentalDesign
 import pandas as pd
 
@@ -7,6 +9,10 @@ class LSD(ExperimentalDesign):
         super().__init__(data, response, treatment)
         self.block_row = block_row
         self.block_col = block_col
+        self._as_categorical(block_row, block_col)
 
     def _get_formula(self) -> str:
         return f"{self.response} ~ C({self.treatment}) + C({self.block_row}) + C({self.block_col})"
+
+    def _anova_factors(self) -> List[str]:
+        return [self.treatment, self.block_row, self.block_col]
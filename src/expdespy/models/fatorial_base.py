@@ -1,14 +1,20 @@
+import io
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from functools import partial
 from itertools import combinations
+from typing import Dict, List, Union
 import numpy as np
 import pandas as pd
-import scipy.stats as stats
-import statsmodels.formula.api as smf
-from statsmodels.stats.anova import anova_lm
-from tabulate import tabulate
-from expdespy.models.base import ExperimentalDesign
-from expdespy.posthoc import PostHocLoader
+from expdespy.models._fast_ols import oneway_anova
+from expdespy.models.base import (
+    _CONCLUSION,
+    ExperimentalDesign,
+    _combined_codes,
+    _significance_markers,
+    _split_by_codes,
+)
+from expdespy.stats import levene_fast
 
 
 class FactorialDesign(ExperimentalDesign, ABC):
@@ -21,18 +27,27 @@ class FactorialDesign(ExperimentalDesign, ABC):
 
     Attributes:
         original_factors (List[str]): List of original factor names as provided by the user.
-        data (pd.DataFrame): Experimental dataset (a copy of the original).
+        data (pd.DataFrame): Experimental dataset (the caller's frame is never modified).
         factors (List[str]): Sanitized list of factor names used in formulas.
-        treatment (str): Statistical treatment formula built from the factors.
+        treatment (str): Statistical treatment formula built from the factors
+            (e.g. "C(A)*C(B)"), built once so `_get_formula` can reuse it.
         response (str): Name of the response variable.
     """
 
     def __init__(self, data, response: str, factors: List[str]):
         self.original_factors = factors
-        self.data = data.copy()
+        # No upfront copy: renames and categorical conversion build new frames
+        self.data = data
         self.factors = [self._safe_factor(f) for f in factors]
         treatment_formula = "*".join([f"C({f})" for f in self.factors])
         super().__init__(self.data, response, treatment_formula)
+        # ANOVA row label of every interaction -> its factors, e.g. "C(A):C(B)" -> ("A", "B")
+        self._term_factors = {
+            ":".join(f"C({f})" for f in combo): combo
+            for order in range(2, len(self.factors) + 1)
+            for combo in combinations(self.factors, order)
+        }
+        self._as_categorical(*self.factors)
 
     def _safe_factor(self, factor_name: str) -> str:
         """
@@ -49,7 +64,7 @@ class FactorialDesign(ExperimentalDesign, ABC):
 
         if factor_name in reserved_names and factor_name in self.data.columns:
             new_name = factor_name + "_"
-            self.data.rename(columns={factor_name: new_name}, inplace=True)
+            self.data = self.data.rename(columns={factor_name: new_name})
             return new_name
 
         return factor_name
@@ -71,7 +86,8 @@ class FactorialDesign(ExperimentalDesign, ABC):
     ) -> Dict[str, bool]:
         """
         Checks ANOVA assumptions for factorial designs:
-        - Normality of residuals (Shapiro-Wilk test)
+        - Normality of residuals (Shapiro-Wilk test; D'Agostino-Pearson
+          above 5000 residuals, where the Shapiro-Wilk p-value is unreliable)
         - Homogeneity of variances across factorial combinations (Levene's test)
 
         Args:
@@ -81,47 +97,47 @@ class FactorialDesign(ExperimentalDesign, ABC):
         Returns:
             Dict[str, bool]: Results of assumption checks.
         """
-        formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-        residuals = model.resid
-
-        normality_p = stats.shapiro(residuals).pvalue
+        # Residuals and the test result are cached with the model
+        normality_test, normality_p = self._normality()
         is_normal = normality_p > alpha
 
-        groups = [
-            group[self.response].values for _, group in self.data.groupby(self.factors)
-        ]
-        levene_p = stats.levene(*groups).pvalue
+        # Levene over all factor combinations in one vectorized pass
+        codes = _combined_codes(self.data, self.factors)
+        levene_p = levene_fast(self._column(self.response), codes).pvalue
         is_homoscedastic = levene_p > alpha
 
+        normality_conclusion = _CONCLUSION[not is_normal]
+        homoscedasticity_conclusion = _CONCLUSION[not is_homoscedastic]
+
         if print_conclusions:
             print(
                 f"""
     Assumption checks for factorial design:
-    1. Normality of residuals (Shapiro-Wilk)
+    1. Normality of residuals ({normality_test})
         - H0: Residuals are normally distributed
         - p-value: {normality_p:.4f}
-        - Conclusion: H0 {"not rejected" if is_normal else "rejected"}
+        - Conclusion: {normality_conclusion}
 
     2. Homoscedasticity (Levene)
         - H0: Variances are equal across groups
         - p-value: {levene_p:.4f}
-        - Conclusion: H0 {"not rejected" if is_homoscedastic else "rejected"}
+        - Conclusion: {homoscedasticity_conclusion}
             """
             )
 
         return {
             "normality (Shapiro-Wilk)": {
+                "Test": normality_test,
                 "H0": "Residuals are normally distributed",
                 "H1": "Residuals are not normally distributed",
                 "p-value": normality_p,
-                "Conclusion": "H0 not rejected" if is_normal else "H0 rejected",
+                "Conclusion": normality_conclusion,
             },
             "homoscedasticity (Levene)": {
                 "H0": "Group variances are equal",
                 "H1": "Group variances are not equal",
                 "p-value": levene_p,
-                "Conclusion": "H0 not rejected" if is_homoscedastic else "H0 rejected",
+                "Conclusion": homoscedasticity_conclusion,
             },
         }
 
@@ -133,34 +149,20 @@ class FactorialDesign(ExperimentalDesign, ABC):
         Args:
             max_interaction (int, optional): Maximum interaction order to include
                 (1 = main effects, 2 = two-way, ...). If None, all interactions are used.
+                Higher-order rows are dropped from the full-model table; the
+                model itself is not refitted, so the residual row is unchanged.
 
         Returns:
             pd.DataFrame: ANOVA table with significance markers.
         """
-        def significance_marker(p):
-            if p < 0.001:
-                return "***"
-            elif p < 0.01:
-                return "**"
-            elif p < 0.05:
-                return "*"
-            elif np.isnan(p):
-                return ""
-            else:
-                return "ns"
-
-        terms = []
-        for i in range(1, len(self.factors) + 1):
-            if max_interaction is not None and i > max_interaction:
-                break
-            for combo in combinations(self.factors, i):
-                terms.append(":".join([f"C({f})" for f in combo]))
-
-        formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-        anova_table = anova_lm(model, typ=2)
-
-        anova_table["Signif"] = anova_table["PR(>F)"].apply(significance_marker)
+        # Shared with unfold_interactions through the base-class cache, so a
+        # prior run_anova() call leaves nothing to refit
+        anova_table = self._anova_table()
+        if max_interaction is not None:
+            order = anova_table.index.str.count(":") + 1
+            anova_table = anova_table[(order <= max_interaction) | (anova_table.index == "Residual")]
+
+        anova_table["Signif"] = _significance_markers(anova_table["PR(>F)"].to_numpy(), nan_marker="")
         return anova_table
 
     def unfold_interactions(
@@ -182,6 +184,10 @@ class FactorialDesign(ExperimentalDesign, ABC):
         Returns:
             dict: ANOVA results and post hoc test outputs.
         """
+        # Output is collected and written in one go at the end
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+
         anova_table = self.run_anova(max_interaction=max_interaction)
         result = {
             "anova": anova_table,
@@ -197,53 +203,58 @@ class FactorialDesign(ExperimentalDesign, ABC):
 
         if not significant_interactions:
             if print_results:
-                print(
+                out(
                     "No significant interactions. Applying post hoc tests on main effects."
                 )
             for factor in self.factors:
                 try:
-                    test = PostHocLoader.create(
-                        test_name=posthoc,
-                        data=self.data,
-                        values_column=self.response,
-                        treatments_column=factor,
-                        alpha=alpha,
-                    )
-                    output = test.run_compact_letters_display()
+                    output = self._compact_letters(posthoc, alpha, factor, None, lambda: self.data)
                     result["main_effects"][factor] = output
                     if print_results:
-                        print(f"\nPost hoc ({posthoc}) for {factor}")
-                        print(output)
+                        out(f"\nPost hoc ({posthoc}) for {factor}")
+                        out(output)
                 except Exception as e:
                     if print_results:
-                        print(f"Error applying post hoc ({posthoc}) to {factor}: {e}")
+                        out(f"Error applying post hoc ({posthoc}) to {factor}: {e}")
         else:
             if print_results:
-                print("Significant interactions found. Performing unfolding.")
+                out("Significant interactions found. Performing unfolding.")
+            # Factorize every factor once; each simple effect is then a
+            # one-way ANOVA on group sums instead of a formula refit
+            y = self._column(self.response)
+            codes = {f: pd.factorize(self.data[f], sort=True) for f in self.factors}
+            # Row positions of every level, split once per factor; the
+            # level subsets are sliced lazily and shared across f1
+            positions = np.arange(len(self.data))
+            rows = {f: _split_by_codes(positions, codes[f][0]) for f in self.factors}
+            subsets = {}
+
+            def level_subset(f2, i):
+                if (f2, i) not in subsets:
+                    subsets[f2, i] = self.data.iloc[rows[f2][i]]
+                return subsets[f2, i]
+            # The same (f1, f2, level) stratum shows up once per significant
+            # term that contains both factors; unfold each one only once
+            unfolded = set()
             for term in significant_interactions:
-                factors = [f.split("(")[1].strip(")") for f in term.split(":")]
+                factors = self._term_factors[term]
                 for f1 in factors:
                     others = [f for f in factors if f != f1]
                     for f2 in others:
-                        for level in sorted(self.data[f2].unique()):
-                            subset = self.data[self.data[f2] == level]
-                            if subset[f1].nunique() <= 1:
+                        levels_f2 = codes[f2][1]
+                        for i, level in enumerate(levels_f2):
+                            if (f1, f2, i) in unfolded:
+                                continue
+                            unfolded.add((f1, f2, i))
+                            idx = rows[f2][i]
+                            codes_f1 = codes[f1][0][idx]
+                            if np.unique(codes_f1[codes_f1 >= 0]).size <= 1:
                                 continue
                             try:
-                                model_sub = smf.ols(
-                                    f"{self.response} ~ C({f1})", data=subset
-                                ).fit()
-                                anova_sub = anova_lm(model_sub, typ=2)
-
-                                test_posthoc = PostHocLoader.create(
-                                    test_name=posthoc,
-                                    data=subset,
-                                    values_column=self.response,
-                                    treatments_column=f1,
-                                    alpha=alpha,
-                                )
-                                posthoc_result = (
-                                    test_posthoc.run_compact_letters_display()
+                                anova_sub = oneway_anova(y[idx], codes_f1, f"C({f1})")
+                                posthoc_result = self._compact_letters(
+                                    posthoc, alpha, f1, (f2, i),
+                                    lambda f2=f2, i=i: level_subset(f2, i),
                                 )
 
                                 key = f"{f1} within {f2}={level}"
@@ -253,13 +264,15 @@ class FactorialDesign(ExperimentalDesign, ABC):
                                 }
 
                                 if print_results:
-                                    print(f"\nUnfolding: {key}")
-                                    print(anova_sub)
-                                    print(posthoc_result)
+                                    out(f"\nUnfolding: {key}")
+                                    out(anova_sub)
+                                    out(posthoc_result)
                             except Exception as e:
                                 if print_results:
-                                    print(f"Error unfolding {f1} within {f2}={level}: {e}")
+                                    out(f"Error unfolding {f1} within {f2}={level}: {e}")
 
+        if print_results:
+            sys.stdout.write(buf.getvalue())
         return result
 
     @staticmethod
@@ -270,38 +283,45 @@ class FactorialDesign(ExperimentalDesign, ABC):
         Args:
             results (dict): Output from the `unfold_interactions` method.
         """
-        print("\n" + "=" * 50)
-        print("📊 MAIN ANOVA")
-        print("=" * 50)
+        from tabulate import tabulate
+
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+
+        out("\n" + "=" * 50)
+        out("📊 MAIN ANOVA")
+        out("=" * 50)
         try:
-            print(
+            out(
                 tabulate(results["anova"].round(4), headers="keys", tablefmt="pretty")
             )
         except:
-            print(results["anova"])
+            out(results["anova"])
 
         if results.get("main_effects"):
-            print("\n" + "=" * 50)
-            print("🧪 MAIN EFFECTS - Post Hoc")
-            print("=" * 50)
+            out("\n" + "=" * 50)
+            out("🧪 MAIN EFFECTS - Post Hoc")
+            out("=" * 50)
             for factor, letters in results["main_effects"].items():
-                print(f"\n🔹 Factor: {factor}")
-                print(letters)
+                out(f"\n🔹 Factor: {factor}")
+                out(letters)
 
         if results.get("interactions"):
-            print("\n" + "=" * 50)
-            print("🔬 SIGNIFICANT INTERACTIONS - Unfolding")
-            print("=" * 50)
+            out("\n" + "=" * 50)
+            out("🔬 SIGNIFICANT INTERACTIONS - Unfolding")
+            out("=" * 50)
             for label, blocks in results["interactions"].items():
-                print(f"\n🧩 {label}")
-                print("- ANOVA:")
+                out(f"\n🧩 {label}")
+                out("- ANOVA:")
                 try:
-                    print(
+                    out(
                         tabulate(
                             blocks["anova"].round(4), headers="keys", tablefmt="github"
                         )
                     )
                 except:
-                    print(blocks["anova"])
-                print("\n- Post hoc:")
-                print(blocks["posthoc"])
\ No newline at end of file
+                    out(blocks["anova"])
+                out("\n- Post hoc:")
+                out(blocks["posthoc"])
+
+        sys.stdout.write(buf.getvalue())
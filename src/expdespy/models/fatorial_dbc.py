@@ -2,10 +2,11 @@
 
 from expdespy.models.fatorial_base import FactorialDesign
 
+
 class FactorialRCBD(FactorialDesign):
     def __init__(self, data, response, factors, block):
         self.block = block
         super().__init__(data, response, factors)
 
     def _get_formula(self):
-        return f"{self.response} ~ {self.block} + " + "*".join([f"C({f})" for f in self.factors])
\ No newline at end of file
+        return f"{self.response} ~ {self.block} + {self.treatment}"
@@ -1,8 +1,24 @@
 # src/expdespy/models/fatorial_dic.py
 
+from typing import Optional
+
+import pandas as pd
+
+from expdespy.models._fast_ols import factorial_anova
 from expdespy.models.fatorial_base import FactorialDesign
 
+
 class FactorialCRD(FactorialDesign):
 
     def _get_formula(self):
-        return f"{self.response} ~ " + "*".join([f"C({f})" for f in self.factors])
+        return f"{self.response} ~ {self.treatment}"
+
+    def _fast_anova(self) -> Optional[pd.DataFrame]:
+        # Balanced, complete factorials have a closed-form table; anything
+        # else falls back to anova_lm
+        data = self.data.dropna(subset=[self.response, *self.factors])
+        return factorial_anova(
+            data[self.response].to_numpy(),
+            [data[f] for f in self.factors],
+            [f"C({f})" for f in self.factors],
+        )
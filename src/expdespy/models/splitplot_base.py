@@ -1,15 +1,15 @@
 # src/expdespy/models/splitplot_base.py
 
+import io
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Union
+from functools import partial
+from typing import Dict, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
-import scipy.stats as stats
-import statsmodels.formula.api as smf
-from statsmodels.stats.anova import anova_lm
-from tabulate import tabulate
-from expdespy.models.base import ExperimentalDesign
-from expdespy.posthoc import PostHocLoader
+from expdespy.models._fast_ols import categorical_design, oneway_anova
+from expdespy.models.base import _CONCLUSION, ExperimentalDesign, _combined_codes, _significance_markers
+from expdespy.stats import levene_fast
 
 
 class SplitPlotDesign(ExperimentalDesign, ABC):
@@ -21,23 +21,29 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
     interaction unfolding, and post hoc testing.
 
     Attributes:
-        data (pd.DataFrame): Experimental dataset (copy of the original).
+        data (pd.DataFrame): Experimental dataset (the caller's frame is never modified).
         main_plot (str): Factor name for the main plot.
         subplot (str): Factor name for the subplot.
         block (str, optional): Factor name for blocks (if provided).
         response (str): Response variable name.
+        treatment (str): Main plot x subplot formula term
+            (e.g. "C(A) * C(B)"), built once so `_get_formula` can reuse it.
     """
 
     def __init__(
         self, data, response: str, main_plot: str, subplot: str, block: str = None
     ):
-        self.data = data.copy()
+        # No upfront copy: renames and categorical conversion build new frames
+        self.data = data
         self.main_plot = self._safe_factor(main_plot)
         self.subplot = self._safe_factor(subplot)
         self.block = self._safe_factor(block) if block else None
 
         treatment_formula = f"C({self.main_plot}) * C({self.subplot})"
         super().__init__(self.data, response, treatment_formula)
+        # Grouping, level masks and factorizing then run on integer codes
+        factors = [self.main_plot, self.subplot] + ([self.block] if self.block else [])
+        self._as_categorical(*(f for f in factors if f != response))
 
     def _safe_factor(self, factor_name: str) -> str:
         """
@@ -56,7 +62,7 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         if factor_name in reserved:
             safe_name = reserved[factor_name]
             if factor_name in self.data.columns:
-                self.data.rename(columns={factor_name: safe_name}, inplace=True)
+                self.data = self.data.rename(columns={factor_name: safe_name})
             return safe_name
         return factor_name
 
@@ -72,12 +78,41 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         """
         pass
 
+    def _crossed_design(self, *additive: str) -> Tuple[np.ndarray, np.ndarray, list]:
+        """
+        Builds the matrices of `response ~ additive + main_plot * subplot`
+        from the factor codes, without parsing the formula.
+
+        Args:
+            *additive (str): Columns entering as additive terms before the
+                crossed main plot and subplot (e.g. the block).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, list]: Response vector, design
+                matrix and term layout, as returned by `_build_design`.
+        """
+        columns = [*additive, self.main_plot, self.subplot]
+        # Rows with missing values are dropped, as patsy does
+        data = self.data.dropna(subset=[self.response, *columns])
+        k = len(additive)
+        terms = [(i,) for i in range(k + 2)] + [(k, k + 1)]
+        X, layout = categorical_design(
+            [data[c] for c in columns], [f"C({c})" for c in columns], terms
+        )
+        return data[self.response].to_numpy(dtype=float), X, layout
+
+    def _fast_anova(self) -> Optional[pd.DataFrame]:
+        # Main plot, subplot, interaction (and block) from fits on column
+        # subsets of the cached design matrix; empty cells go to anova_lm
+        return self._type2_anova()
+
     def check_assumptions(
         self, alpha: float = 0.05, print_conclusions: bool = True
     ) -> Dict[str, bool]:
         """
         Checks ANOVA assumptions for Split-Plot designs:
-        - Normality of residuals (Shapiro-Wilk test)
+        - Normality of residuals (Shapiro-Wilk test; D'Agostino-Pearson
+          above 5000 residuals, where the Shapiro-Wilk p-value is unreliable)
         - Homogeneity of variances across treatment combinations (Levene's test)
 
         Args:
@@ -87,41 +122,43 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         Returns:
             Dict[str, bool]: Results of assumption tests.
         """
-        formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-        residuals = model.resid
-
-        normality_p = stats.shapiro(residuals).pvalue
+        # Residuals come from the cached QR solve and the test result is
+        # cached with them, so repeated checks are free
+        normality_test, normality_p = self._normality()
         is_normal = normality_p > alpha
 
-        groups = [
-            group[self.response].values
-            for _, group in self.data.groupby([self.main_plot, self.subplot])
-        ]
-        levene_p = stats.levene(*groups).pvalue
+        # One code per main plot x subplot cell; no per-group DataFrames
+        levene_p = levene_fast(
+            self._column(self.response),
+            _combined_codes(self.data, [self.main_plot, self.subplot]),
+        ).pvalue
         is_homoscedastic = levene_p > alpha
 
+        normality_conclusion = _CONCLUSION[not is_normal]
+        homoscedasticity_conclusion = _CONCLUSION[not is_homoscedastic]
+
         if print_conclusions:
             print(
                 f"""
     ANOVA assumptions (Split-Plot design):
-    1. Normality of residuals (Shapiro-Wilk)
+    1. Normality of residuals ({normality_test})
         - p-value: {normality_p:.4f}
-        - Conclusion: H0 {"not rejected" if is_normal else "rejected"}
+        - Conclusion: {normality_conclusion}
     2. Homoscedasticity (Levene)
         - p-value: {levene_p:.4f}
-        - Conclusion: H0 {"not rejected" if is_homoscedastic else "rejected"}
+        - Conclusion: {homoscedasticity_conclusion}
             """
             )
 
         return {
             "normality (Shapiro-Wilk)": {
+                "Test": normality_test,
                 "p-value": normality_p,
-                "Conclusion": "H0 not rejected" if is_normal else "H0 rejected",
+                "Conclusion": normality_conclusion,
             },
             "homoscedasticity (Levene)": {
                 "p-value": levene_p,
-                "Conclusion": "H0 not rejected" if is_homoscedastic else "H0 rejected",
+                "Conclusion": homoscedasticity_conclusion,
             },
         }
 
@@ -132,23 +169,12 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         Returns:
             pd.DataFrame: ANOVA table with significance markers.
         """
-
-        def significance_marker(p):
-            if p < 0.001:
-                return "***"
-            elif p < 0.01:
-                return "**"
-            elif p < 0.05:
-                return "*"
-            elif np.isnan(p):
-                return ""
-            else:
-                return "ns"
-
-        formula = self._get_formula()
-        model = smf.ols(formula, data=self.data).fit()
-        anova_table = anova_lm(model, typ=2)
-        anova_table["Signif"] = anova_table["PR(>F)"].apply(significance_marker)
+        # Cached on the design, so the call from unfold_interactions after a
+        # user's run_anova() does not refit
+        anova_table = self._anova_table()
+        anova_table["Signif"] = _significance_markers(
+            anova_table["PR(>F)"].to_numpy(), nan_marker=""
+        )
         return anova_table
 
     def unfold_interactions(
@@ -165,6 +191,9 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         Returns:
             dict: Results including ANOVA, main effects, and interactions.
         """
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+
         anova_table = self.run_anova()
         result = {
             "anova": anova_table,
@@ -180,61 +209,59 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
 
         if not significant_interactions:
             if print_results:
-                print(
+                out(
                     "No significant interactions. Applying post hoc tests to main effects."
                 )
             for factor in [self.main_plot, self.subplot]:
                 try:
-                    test = PostHocLoader.create(
-                        test_name=posthoc,
-                        data=self.data,
-                        values_column=self.response,
-                        treatments_column=factor,
-                        alpha=alpha,
-                    )
-                    output = test.run_compact_letters_display()
+                    output = self._compact_letters(posthoc, alpha, factor, None, lambda: self.data)
                     result["main_effects"][factor] = output
                     if print_results:
-                        print(f"\nPost hoc ({posthoc}) for {factor}")
-                        print(output)
+                        out(f"\nPost hoc ({posthoc}) for {factor}")
+                        out(output)
                 except Exception as e:
                     if print_results:
-                        print(f"Error applying post hoc for {factor}: {e}")
+                        out(f"Error applying post hoc for {factor}: {e}")
         else:
             if print_results:
-                print("Significant interactions found. Performing unfolding.")
+                out("Significant interactions found. Performing unfolding.")
             # Example: unfold subplot within each level of the main plot
-            for level in sorted(self.data[self.main_plot].unique()):
-                subset = self.data[self.data[self.main_plot] == level]
+            # One groupby pass hands over every main-plot level instead of
+            # a boolean mask over the whole frame per level
+            for level, subset in self.data.groupby(
+                self.main_plot, sort=True, observed=True
+            ):
+                key = f"{self.subplot} within {self.main_plot}={level}"
                 try:
-                    model_sub = smf.ols(
-                        f"{self.response} ~ C({self.subplot})", data=subset
-                    ).fit()
-                    anova_sub = anova_lm(model_sub, typ=2)
-
-                    test_posthoc = PostHocLoader.create(
-                        test_name=posthoc,
-                        data=subset,
-                        values_column=self.response,
-                        treatments_column=self.subplot,
-                        alpha=alpha,
+                    # y ~ C(subplot) is a one-way ANOVA: group sums replace
+                    # the formula parse and OLS fit
+                    codes, _ = pd.factorize(subset[self.subplot], sort=True)
+                    anova_sub = oneway_anova(
+                        subset[self.response].to_numpy(), codes, f"C({self.subplot})"
+                    )
+
+                    # Letters are cached per main-plot level, so a repeated
+                    # unfold (e.g. to print it) skips the studentized range
+                    posthoc_result = self._compact_letters(
+                        posthoc, alpha, self.subplot, (self.main_plot, level),
+                        lambda subset=subset: subset,
                     )
-                    posthoc_result = test_posthoc.run_compact_letters_display()
 
-                    key = f"{self.subplot} within {self.main_plot}={level}"
                     result["interactions"][key] = {
                         "anova": anova_sub,
                         "posthoc": posthoc_result,
                     }
 
                     if print_results:
-                        print(f"\nUnfolding: {key}")
-                        print(anova_sub)
-                        print(posthoc_result)
+                        out(f"\nUnfolding: {key}")
+                        out(anova_sub)
+                        out(posthoc_result)
                 except Exception as e:
                     if print_results:
-                        print(f"Error unfolding {key}: {e}")
+                        out(f"Error unfolding {key}: {e}")
 
+        if print_results:
+            sys.stdout.write(buf.getvalue())
         return result
 
     @staticmethod
@@ -245,38 +272,46 @@ class SplitPlotDesign(ExperimentalDesign, ABC):
         Args:
             results (dict): Output of the `unfold_interactions` method.
         """
-        print("\n" + "=" * 50)
-        print("📊 MAIN ANOVA")
-        print("=" * 50)
+        from tabulate import tabulate
+
+        # Everything is written to one buffer and flushed with a single write
+        buf = io.StringIO()
+        out = partial(print, file=buf)
+
+        out("\n" + "=" * 50)
+        out("📊 MAIN ANOVA")
+        out("=" * 50)
         try:
-            print(
+            out(
                 tabulate(results["anova"].round(4), headers="keys", tablefmt="pretty")
             )
         except:
-            print(results["anova"])
+            out(results["anova"])
 
         if results.get("main_effects"):
-            print("\n" + "=" * 50)
-            print("🧪 MAIN EFFECTS - Post Hoc")
-            print("=" * 50)
+            out("\n" + "=" * 50)
+            out("🧪 MAIN EFFECTS - Post Hoc")
+            out("=" * 50)
             for factor, letters in results["main_effects"].items():
-                print(f"\n🔹 Factor: {factor}")
-                print(letters)
+                out(f"\n🔹 Factor: {factor}")
+                out(letters)
 
         if results.get("interactions"):
-            print("\n" + "=" * 50)
-            print("🔬 SIGNIFICANT INTERACTIONS - Unfolding")
-            print("=" * 50)
+            out("\n" + "=" * 50)
+            out("🔬 SIGNIFICANT INTERACTIONS - Unfolding")
+            out("=" * 50)
             for label, blocks in results["interactions"].items():
-                print(f"\n🧩 {label}")
-                print("- ANOVA:")
+                out(f"\n🧩 {label}")
+                out("- ANOVA:")
                 try:
-                    print(
+                    out(
                         tabulate(
                             blocks["anova"].round(4), headers="keys", tablefmt="github"
                         )
                     )
                 except:
-                    print(blocks["anova"])
-                print("\n- Post hoc:")
-                print(blocks["posthoc"])
+                    out(blocks["anova"])
+                out("\n- Post hoc:")
+                out(blocks["posthoc"])
+
+        sys.stdout.write(buf.getvalue())
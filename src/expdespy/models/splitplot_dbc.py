@@ -4,4 +4,7 @@ from expdespy.models.splitplot_base import SplitPlotDesign
 
 class SplitPlotRCBD(SplitPlotDesign):
     def _get_formula(self):
-        return f"{self.response} ~ C({self.block}) + C({self.main_plot}) * C({self.subplot})"
\ No newline at end of file
+        return f"{self.response} ~ C({self.block}) + {self.treatment}"
+
+    def _build_design(self):
+        return self._crossed_design(self.block)
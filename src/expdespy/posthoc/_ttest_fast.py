@@ -0,0 +1,121 @@
+# src/expdespy/posthoc/_ttest_fast.py
+
+import numpy as np
+import pandas as pd
+from scipy.special import stdtr
+
+# Pairs per block in `_pair_pvalues`: the temporaries of a block stay in
+# cache and the peak memory stays bounded when the number of groups is large
+_PAIR_BLOCK = 1 << 16
+
+
+def pairwise_ttest(values: np.ndarray, groups, equal_var: bool = True) -> pd.DataFrame:
+    """
+    Independent two-sample t-tests for all pairs of groups, computed on
+    the vectors of pairwise statistics at once.
+
+    Group counts, means and sums of squared deviations come from
+    `np.bincount` over the factorized labels, so the data is scanned a
+    fixed number of times regardless of the number of pairs. Reproduces
+    `scipy.stats.ttest_ind` per pair (pooled or Welch variance, NaN
+    propagated to the p-value of every pair involving a group with
+    missing values).
+
+    Args:
+        values (np.ndarray): Response values.
+        groups: Group label of each value; missing labels are dropped.
+        equal_var (bool, optional): Pooled variance if True, Welch's
+            t-test otherwise. Default is True.
+
+    Returns:
+        pd.DataFrame: One row per pair (in upper-triangle order of the
+            groups in order of appearance) with columns `group1`,
+            `group2`, `meandiff` (difference of the means, skipping
+            missing values) and `p-value`.
+    """
+    values = np.asarray(values, dtype=float)
+    codes, labels = pd.factorize(groups)
+    keep = codes >= 0
+    values, codes = values[keep], codes[keep]
+    # The pair columns are gathered from the typed labels, so pandas does
+    # not infer a dtype over all k * (k - 1) / 2 Python objects
+    labels = pd.Index(labels)
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        labels = labels.astype(labels.categories.dtype)
+    k = len(labels)
+
+    counts = np.bincount(codes, minlength=k).astype(float)
+    means = np.bincount(codes, weights=values, minlength=k) / counts
+    # Centred second pass: no cancellation as with sum(x**2) - n * mean**2
+    dev = values - means[codes]
+    ss = np.bincount(codes, weights=dev * dev, minlength=k)
+
+    # The grouped sums are reused for the mean differences; only missing
+    # values (which propagate into `means`) need a second, filtered pass
+    observed = ~np.isnan(values)
+    if observed.all():
+        valid_means = means
+    else:
+        valid_means = np.bincount(
+            codes[observed], weights=values[observed], minlength=k
+        ) / np.bincount(codes[observed], minlength=k)
+
+    i, j = np.triu_indices(k, 1)
+    pvalues = _pair_pvalues(i, j, means, ss, counts, equal_var)
+
+    return pd.DataFrame({
+        "group1": labels.take(i),
+        "group2": labels.take(j),
+        "meandiff": valid_means[i] - valid_means[j],
+        "p-value": pvalues,
+    })
+
+
+def _pair_pvalues(
+    i: np.ndarray,
+    j: np.ndarray,
+    means: np.ndarray,
+    ss: np.ndarray,
+    counts: np.ndarray,
+    equal_var: bool,
+) -> np.ndarray:
+    """
+    Two-sided p-values of the t-tests between groups `i` and `j`, filled
+    block by block into one preallocated array.
+
+    Args:
+        i (np.ndarray): First group of each pair.
+        j (np.ndarray): Second group of each pair.
+        means (np.ndarray): Group means.
+        ss (np.ndarray): Sums of squared deviations from the group means.
+        counts (np.ndarray): Group sizes (float).
+        equal_var (bool): Pooled variance if True, Welch's t-test otherwise.
+
+    Returns:
+        np.ndarray: P-value of each pair.
+    """
+    pvalues = np.empty(i.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Per-group terms are computed once (k values); the pair blocks
+        # only gather and combine them
+        if equal_var:
+            inv_n = 1.0 / counts
+        else:
+            # Squared standard error of each mean and its Welch-Satterthwaite term
+            v = ss / (counts - 1) / counts
+            w = v ** 2 / (counts - 1)
+
+        for start in range(0, i.size, _PAIR_BLOCK):
+            a, b = i[start:start + _PAIR_BLOCK], j[start:start + _PAIR_BLOCK]
+            if equal_var:
+                # Each pair pools its own two groups, as ttest_ind does; one
+                # variance over all groups would be Fisher's LSD instead
+                df = counts[a] + counts[b] - 2
+                se = np.sqrt((ss[a] + ss[b]) / df * (inv_n[a] + inv_n[b]))
+            else:
+                se2 = v[a] + v[b]
+                se = np.sqrt(se2)
+                df = se2 ** 2 / (w[a] + w[b])
+            t = (means[a] - means[b]) / se
+            pvalues[start:start + _PAIR_BLOCK] = 2 * stdtr(df, -np.abs(t))
+    return pvalues
@@ -1,13 +1,30 @@
 # src/expdespy/posthoc/base.py
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Tuple
+import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-import seaborn as sns
 
 from expdespy.utils.utils import assign_letters
 
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+
+@lru_cache(maxsize=1)
+def _cld_style() -> dict:
+    """
+    rcParams of seaborn's "whitegrid" style, resolved once and applied
+    with `plt.rc_context` around each plot instead of `sns.set_style`,
+    which rewrote the global rcParams on every call.
+    """
+    import seaborn as sns
+
+    return dict(sns.axes_style("whitegrid"))
+
 
 class PostHocTest(ABC):
     """
@@ -33,10 +50,75 @@ class PostHocTest(ABC):
             treatments_column (str): Column containing treatment labels.
             alpha (float, optional): Significance level for tests. Default is 0.05.
         """
+        # Stored as `pd.Categorical` once, so factorizing and grouping the
+        # treatments reuse the integer codes; `assign` leaves the caller's
+        # frame untouched
+        if treatments_column in data.columns and not isinstance(
+            data[treatments_column].dtype, pd.CategoricalDtype
+        ):
+            data = data.assign(**{treatments_column: data[treatments_column].astype("category")})
         self.data = data
         self.values_column = values_column
         self.treatments_column = treatments_column
         self.alpha = alpha
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """
+        Drop the cached values, test results, group statistics and compact
+        letter display.
+
+        Reassigning `data`, `alpha` or the column names is detected
+        automatically; call it after modifying `data` in place (same
+        object, same shape).
+        """
+        self._run_cache = None
+        self._cld_cache = None
+        self._stats_cache = None
+        self._values_cache = None
+
+    def _cache_key(self) -> tuple:
+        """
+        Key under which results are cached: the test settings plus the
+        identity and shape of `self.data`.
+        """
+        return (
+            self.values_column,
+            self.treatments_column,
+            self.alpha,
+            id(self.data),
+            self.data.shape,
+        )
+
+    def _values(self) -> np.ndarray:
+        """
+        Return the values column as a contiguous float64 array, converted
+        once per cache key and shared by `run()` and the group statistics.
+
+        Returns:
+            np.ndarray: Response values (not copied; do not modify).
+        """
+        key = self._cache_key()
+        if self._values_cache is None or self._values_cache[0] != key:
+            values = np.ascontiguousarray(
+                self.data[self.values_column].to_numpy(dtype=np.float64)
+            )
+            self._values_cache = (key, self.data, values)
+        return self._values_cache[2]
+
+    def _cached_run(self) -> pd.DataFrame:
+        """
+        Return the result of `run()`, computed once per cache key.
+
+        Returns:
+            pd.DataFrame: Test results, shared with the cache (not copied).
+        """
+        key = self._cache_key()
+        if self._run_cache is None or self._run_cache[0] != key:
+            # The entry keeps a reference to the data, so its id cannot be
+            # recycled while the entry is alive
+            self._run_cache = (key, self.data, self.run())
+        return self._run_cache[2]
 
     @abstractmethod
     def run(self) -> pd.DataFrame:
@@ -60,6 +142,68 @@ class PostHocTest(ABC):
         """
         pass
 
+    def _treatment_codes(self) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Integer code of each row's treatment and the observed treatments
+        in sorted order, as `pd.factorize(..., sort=True)` returns them.
+
+        Categorical columns (the default since `__init__`) reuse their
+        codes, with unobserved categories dropped, instead of being
+        factorized again; other columns go through `pd.factorize`.
+
+        Returns:
+            Tuple[np.ndarray, pd.Index]: Codes (-1 for missing labels)
+                        and the treatment of each code.
+        """
+        column = self.data[self.treatments_column]
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            codes, groups = pd.factorize(column, sort=True)
+            return codes, pd.Index(groups)
+
+        codes = column.cat.codes.to_numpy()
+        observed = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories)) > 0
+        if not observed.all():
+            codes = np.where(codes >= 0, (np.cumsum(observed) - 1)[codes], -1)
+        groups = pd.Categorical.from_codes(np.flatnonzero(observed), dtype=column.dtype)
+        return codes, pd.CategoricalIndex(groups)
+
+    def _group_stats(self) -> pd.DataFrame:
+        """
+        Compute the mean and maximum of each treatment with `np.bincount`
+        and `np.maximum.at` over the treatment codes, once per
+        cache key.
+
+        The letter display needs the means and the plot needs the maxima
+        (to place the letters), so both come from the same pass instead
+        of two pandas groupbys.
+
+        Returns:
+            pd.DataFrame: Columns "Mean" and "Max", indexed by treatment
+                        (sorted, missing labels and values skipped).
+        """
+        key = self._cache_key()
+        if self._stats_cache is not None and self._stats_cache[0] == key:
+            return self._stats_cache[2]
+
+        codes, groups = self._treatment_codes()
+        values = self._values()
+        keep = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[keep], values[keep]
+        sums = np.bincount(codes, weights=values, minlength=len(groups))
+        counts = np.bincount(codes, minlength=len(groups))
+        maxima = np.full(len(groups), -np.inf)
+        np.maximum.at(maxima, codes, values)
+        maxima[counts == 0] = np.nan
+        with np.errstate(invalid="ignore"):
+            means = sums / counts
+
+        stats = pd.DataFrame(
+            {"Mean": means, "Max": maxima},
+            index=groups.rename(self.treatments_column),
+        )
+        self._stats_cache = (key, self.data, stats)
+        return stats
+
     def run_compact_letters_display(self) -> pd.DataFrame:
         """
         Run the post hoc test and return a compact letter display (CLD).
@@ -67,10 +211,32 @@ class PostHocTest(ABC):
         The method calculates treatment means and assigns significance
         letters based on pairwise comparisons.
 
+        The table is cached, so calling it again (or plotting after it)
+        does not repeat the pairwise tests.
+
         Returns:
             pd.DataFrame: A DataFrame with treatment means and assigned letters.
         """
-        df_posthoc = self.run()
+        key = self._cache_key()
+        if self._cld_cache is None or self._cld_cache[0] != key:
+            self._cld_cache = (key, self.data, self._compact_letters_display())
+        return self._cld_cache[2].copy()
+
+    def _compact_letters_display(self) -> pd.DataFrame:
+        """
+        Build the compact letter display from the cached test results.
+
+        Returns:
+            pd.DataFrame: A DataFrame with treatment means and assigned letters.
+        """
+        df_posthoc = self._cached_run()
+
+        # The means are computed once and also give the letter order, so
+        # assign_letters does not copy the data and group it again
+        means = self._group_stats()["Mean"]
+        # Stable sort: tied means keep the treatment order instead of an
+        # arbitrary one, so the table and letters are reproducible
+        ranked = means.sort_values(ascending=False, kind="stable")
 
         cld_result = assign_letters(
             df_post_hoc=df_posthoc,
@@ -78,25 +244,23 @@ class PostHocTest(ABC):
             G2="group2",
             P=self._pvalue_column_name(),
             alpha=self.alpha,
-            order="descending",
-            data=self.data,
-            vals=self.values_column,
-            group=self.treatments_column,
+            order=ranked.index.tolist(),
         )
 
-        means = (
-            self.data.groupby(self.treatments_column)[self.values_column]
-            .mean()
-            .rename("Mean")
+        # assign_letters returns one row per group in `ranked` order, so the
+        # table is assembled directly from arrays; the row labels keep the
+        # position of each treatment in the sorted list of treatments
+        return pd.DataFrame(
+            {
+                self.treatments_column: ranked.index,
+                "Mean": ranked.to_numpy(),
+                "Letters": cld_result["Letters"].to_numpy(),
+            },
+            index=means.index.get_indexer(ranked.index),
         )
 
-        final_result = pd.concat([means, cld_result], axis=1).reset_index()
-        final_result.rename(columns={"index": self.treatments_column}, inplace=True)
-        final_result.sort_values(by="Mean", ascending=False, inplace=True)
-        return final_result
-
     def plot_compact_letters_display(
-        self, ax: Optional[plt.Axes] = None, points_color: str = None, hue: str = None, palette: str = "Blues", order_by: str = None
+        self, ax: Optional[Axes] = None, points_color: str = None, hue: str = None, palette: str = "Blues", order_by: str = None
     ) -> None:
         """
         Plot a boxplot with compact letter display (CLD).
@@ -109,69 +273,79 @@ class PostHocTest(ABC):
             palette (str, optional): Color palette for the boxplot. Default is "Blues".
             order_by (str, optional): Column name to order treatments by. Default is None. If None, treatments are ordered by mean values.
         """
+        # Plotting libraries are imported here so that importing the models
+        # (which pull in the post hoc tests) does not load matplotlib/seaborn
+        from matplotlib import pyplot as plt
+        import seaborn as sns
+
         cld_result = self.run_compact_letters_display()
-        sns.set_style("whitegrid")
-        group_stats = (
-            self.data.groupby(self.treatments_column)[self.values_column]
-            .agg(["mean", "max"])
-            .rename(columns={"mean": "Mean", "max": "Max"})
-            .reset_index()
+        # Same per-treatment pass as the letter display, not a second groupby;
+        # only the maxima are merged in, since the letter table has the means
+        group_stats = self._group_stats()[["Max"]].reset_index()
+        cld_plot_df = cld_result[[self.treatments_column, "Letters", "Mean"]].merge(
+            group_stats, on=self.treatments_column
         )
-        cld_plot_df = cld_result.merge(group_stats, on=self.treatments_column)
-        if order_by is not None and order_by in cld_plot_df.columns:
-            ordered_groups = cld_plot_df.sort_values(by=order_by, ascending=True)[self.treatments_column].tolist()
-        else:
-            ordered_groups = cld_plot_df.sort_values(by="Mean", ascending=True)[self.treatments_column].tolist()
-
-        if ax is None:
-            fig, ax = plt.subplots(figsize=(8, 5))
-
-        if hue is not None and hue in self.data.columns:
-            sns.boxplot(
-                data=self.data,
-                x=self.treatments_column,
-                y=self.values_column,
-                hue=hue,
-                order=ordered_groups,
-                palette=palette,
-                ax=ax,
-                legend=False,
-            )
-        else:
-            sns.boxplot(
-                data=self.data,
-                x=self.treatments_column,
-                y=self.values_column,
-                order=ordered_groups,
-                palette=palette,
-                ax=ax,
-                hue=self.treatments_column,
-                legend=False,
-            )
-        if points_color is not None:
-            sns.stripplot(
-                data=self.data,
-                x=self.treatments_column,
-                y=self.values_column,
-                order=ordered_groups,
-                dodge=True,
-                color=points_color,
-                size=5,
-                ax=ax,
-            )
+        # The table is kept in plotting order, so the i-th letter lands on
+        # the i-th box
+        sort_by = order_by if order_by is not None and order_by in cld_plot_df.columns else "Mean"
+        cld_plot_df = cld_plot_df.sort_values(by=sort_by, ascending=True, kind="stable")
+        ordered_groups = cld_plot_df[self.treatments_column].tolist()
+
+        # Scoped style: the caller's global rcParams are left untouched
+        with plt.rc_context(_cld_style()):
+            if ax is None:
+                fig, ax = plt.subplots(figsize=(8, 5))
+
+            if hue is not None and hue in self.data.columns:
+                sns.boxplot(
+                    data=self.data,
+                    x=self.treatments_column,
+                    y=self.values_column,
+                    hue=hue,
+                    order=ordered_groups,
+                    palette=palette,
+                    ax=ax,
+                    legend=False,
+                )
+            else:
+                sns.boxplot(
+                    data=self.data,
+                    x=self.treatments_column,
+                    y=self.values_column,
+                    order=ordered_groups,
+                    palette=palette,
+                    ax=ax,
+                    hue=self.treatments_column,
+                    legend=False,
+                )
+            if points_color is not None:
+                sns.stripplot(
+                    data=self.data,
+                    x=self.treatments_column,
+                    y=self.values_column,
+                    order=ordered_groups,
+                    dodge=True,
+                    color=points_color,
+                    size=5,
+                    ax=ax,
+                )
 
-        for i, row in cld_plot_df.iterrows():
-            ax.text(
-                x=i,
-                y=row["Max"] + 0.1,
-                s=row["Letters"],
+            # Plain arrays instead of one boxed Series per row from iterrows;
+            # the heights, the data transform and the text properties are
+            # resolved once for all letters
+            heights = cld_plot_df["Max"].to_numpy(dtype=float) + 0.1
+            text_props = dict(
                 ha="center",
                 va="bottom",
                 fontsize=12,
                 color="black",
+                transform=ax.transData,
+                clip_on=False,
             )
+            for i, (y, letters) in enumerate(zip(heights, cld_plot_df["Letters"].to_numpy())):
+                ax.text(i, y, letters, **text_props)
 
-        ax.spines["right"].set_visible(False)
-        ax.spines["top"].set_visible(False)
-        ax.yaxis.grid(True, linestyle="-", linewidth=0.5)
-        ax.set_title("Treatment means with significance letters")
+            ax.spines["right"].set_visible(False)
+            ax.spines["top"].set_visible(False)
+            ax.yaxis.grid(True, linestyle="-", linewidth=0.5)
+            ax.set_title("Treatment means with significance letters")
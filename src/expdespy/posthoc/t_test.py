@@ -1,7 +1,6 @@
 import pandas as pd
-import scipy.stats as stats
-from itertools import combinations
 
+from expdespy.posthoc._ttest_fast import pairwise_ttest
 from expdespy.posthoc.base import PostHocTest
 
 
@@ -33,22 +32,17 @@ class PairwiseTTest(PostHocTest):
                 - meandiff (difference of means)
                 - p-value
         """
-        results = []
-        groups = self.data[self.treatments_column].unique()
-
-        for g1, g2 in combinations(groups, 2):
-            vals1 = self.data[self.data[self.treatments_column] == g1][self.values_column]
-            vals2 = self.data[self.data[self.treatments_column] == g2][self.values_column]
-            stat, pval = stats.ttest_ind(vals1, vals2, equal_var=self.equal_var)
-
-            results.append({
-                "group1": g1,
-                "group2": g2,
-                "meandiff": vals1.mean() - vals2.mean(),
-                "p-value": pval
-            })
-
-        return pd.DataFrame(results)
+        # One factorization and a few bincounts replace a mask over the
+        # data and a ttest_ind call per pair
+        return pairwise_ttest(
+            self._values(),
+            self.data[self.treatments_column],
+            equal_var=self.equal_var,
+        )
+
+    def _cache_key(self) -> tuple:
+        # The variance assumption changes the p-values
+        return super()._cache_key() + (self.equal_var,)
 
     def _pvalue_column_name(self) -> str:
         """
@@ -1,6 +1,6 @@
 import pandas as pd
-from statsmodels.stats.multicomp import pairwise_tukeyhsd
 
+from expdespy.posthoc._tukey_fast import tukey_hsd_codes
 from expdespy.posthoc.base import PostHocTest
 
 
@@ -33,18 +33,16 @@ class TukeyHSD(PostHocTest):
                 - upper
                 - reject
         """
-        tukey_result = pairwise_tukeyhsd(
-            endog=self.data[self.values_column],
-            groups=self.data[self.treatments_column].astype(str),
-            alpha=self.alpha
+        # Groups are compared by their string labels. Only the k labels are
+        # cast and sorted; the rows keep their integer codes instead of
+        # being cast and hashed again one by one
+        codes, groups = self._treatment_codes()
+        label_codes, labels = pd.factorize(groups.astype(str).to_numpy(dtype=object), sort=True)
+        # Rows without a treatment label are left out, as in the other tests
+        keep = codes >= 0
+        return tukey_hsd_codes(
+            self._values()[keep], label_codes[codes[keep]], labels, alpha=self.alpha
         )
-        df = pd.DataFrame(
-            tukey_result._results_table.data[1:],
-            columns=tukey_result._results_table.data[0]
-        )
-        df.columns = ['group1', 'group2', 'meandiff',
-                    'p-adj', 'lower', 'upper', 'reject']
-        return df
 
     def _pvalue_column_name(self) -> str:
         """
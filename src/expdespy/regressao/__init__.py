@@ -15,6 +15,7 @@ from .diagnostics import (
     qq_plot_residuals,
     plot_residual_hist,
     cooks_distance_plot,
+    diagnostics_panel,
     shapiro_test,
     breusch_pagan_test,
     durbin_watson_test,
@@ -29,6 +30,7 @@ __all__ = [
     "qq_plot_residuals",
     "plot_residual_hist",
     "cooks_distance_plot",
+    "diagnostics_panel",
     "shapiro_test",
     "breusch_pagan_test",
     "durbin_watson_test",
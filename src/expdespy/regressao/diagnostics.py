@@ -1,11 +1,96 @@
 # src/expdespy/utils/diagnostics.py
+import weakref
 import numpy as np
 import seaborn as sns
 import statsmodels.api as sm
+from statsmodels.nonparametric.kde import KDEUnivariate
 from statsmodels.stats.diagnostic import het_breuschpagan
 from statsmodels.stats.stattools import durbin_watson
-from scipy import stats
+from scipy.special import chdtrc, fdtrc
 from matplotlib import pyplot as plt
+from expdespy.stats import shapiro_fast
+
+# Above this many residuals the Shapiro-Wilk p-value is unreliable
+_SHAPIRO_MAX_N = 5000
+
+# Above this many residuals the histogram's KDE is estimated by FFT
+# instead of seaborn's direct n x 200 kernel evaluation
+_KDE_DIRECT_MAX_N = 10000
+
+# Quantities shared by the diagnostics of one fitted model (residuals,
+# fitted values, Cook's distance), so a full check reads each of them once;
+# weak keys drop the entry together with the model. Only arrays are stored:
+# an influence object refers back to the results and would keep the key alive
+_diagnostics_cache = weakref.WeakKeyDictionary()
+
+
+def _cached(model, name: str, compute):
+    """
+    Returns `compute()` memoized per model under `name`.
+
+    Args:
+        model: Fitted model used as the (weak) cache key.
+        name (str): Name of the cached quantity.
+        compute (callable): Computes the quantity on a cache miss.
+
+    Returns:
+        The cached quantity.
+    """
+    try:
+        entry = _diagnostics_cache.setdefault(model, {})
+    except TypeError:
+        # Objects that cannot be weakly referenced are not cached
+        return compute()
+    if name not in entry:
+        entry[name] = compute()
+    return entry[name]
+
+
+def _resid(model):
+    return _cached(model, "resid", lambda: model.resid)
+
+
+def _resid_array(model) -> np.ndarray:
+    # One contiguous float64 buffer shared by the tests and plots that only
+    # need the values, instead of a conversion from the Series per call;
+    # read-only, since every caller sees the same array
+    def compute():
+        residuals = np.array(_resid(model), dtype=np.float64, order="C")
+        residuals.setflags(write=False)
+        return residuals
+
+    return _cached(model, "resid_array", compute)
+
+
+def _fitted(model):
+    return _cached(model, "fitted", lambda: model.fittedvalues)
+
+
+def _cooks_distance(model):
+    return _cached(model, "cooks", lambda: _cooks_from_leverage(model))
+
+
+def _cooks_from_leverage(model) -> np.ndarray:
+    """
+    Cook's distance from the closed form
+    D_i = r_i^2 / (p s^2) * h_i / (1 - h_i)^2.
+
+    Only the leverages and the residuals are needed, so the full
+    `OLSInfluence` object (studentized residuals, DFFITS, DFBETAS, ...)
+    is never built. Matches `model.get_influence().cooks_distance[0]`.
+
+    Args:
+        model (sm.regression.linear_model.RegressionResultsWrapper): Fitted model.
+
+    Returns:
+        np.ndarray: Cook's distance of each observation.
+    """
+    exog = model.model.exog
+    # Diagonal of the hat matrix from the pseudo-inverse the model already
+    # holds, without forming the n x n matrix
+    leverage = np.einsum("ij,ji->i", exog, model.model.pinv_wexog)
+    resid = _resid_array(model)
+    return resid ** 2 / (exog.shape[1] * model.mse_resid) * leverage / (1 - leverage) ** 2
 
 
 def plot_residuals_vs_fitted(model: sm.regression.linear_model.RegressionResultsWrapper, ax: plt.Axes = None) -> plt.Axes:
@@ -22,8 +107,8 @@ def plot_residuals_vs_fitted(model: sm.regression.linear_model.RegressionResults
     if ax is None:
         _, ax = plt.subplots(figsize=(8, 5))
 
-    fitted_vals = model.fittedvalues
-    residuals = model.resid
+    fitted_vals = _fitted(model)
+    residuals = _resid(model)
 
     sns.scatterplot(x=fitted_vals, y=residuals, ax=ax)
     ax.axhline(0, linestyle='--', color='red')
@@ -47,7 +132,7 @@ def qq_plot_residuals(model: sm.regression.linear_model.RegressionResultsWrapper
     if ax is None:
         _, ax = plt.subplots(figsize=(8, 5))
 
-    sm.qqplot(model.resid, line='s', ax=ax)
+    sm.qqplot(_resid_array(model), line='s', ax=ax)
     ax.set_title("QQ Plot of Residuals")
 
     return ax
@@ -67,13 +152,49 @@ def plot_residual_hist(model: sm.regression.linear_model.RegressionResultsWrappe
     if ax is None:
         _, ax = plt.subplots(figsize=(8, 5))
 
-    sns.histplot(model.resid, kde=True, ax=ax)
+    # Single precision is plenty for a picture and halves the memory the
+    # histogram and the KDE evaluation stream through
+    residuals = _resid_array(model).astype(np.float32)
+    if residuals.size <= _KDE_DIRECT_MAX_N:
+        sns.histplot(residuals, kde=True, ax=ax)
+    else:
+        first_bar = len(ax.patches)
+        sns.histplot(residuals, color="C0", ax=ax)
+        # The curve is scaled to the histogram area, as seaborn does
+        area = sum(bar.get_height() * bar.get_width() for bar in ax.patches[first_bar:])
+        grid, density = _kde_fft(residuals)
+        ax.plot(grid, density * area, color="C0")
     ax.set_title("Residuals Distribution")
     ax.set_xlabel("Residuals")
 
     return ax
 
 
+def _kde_fft(x: np.ndarray, gridsize: int = 200):
+    """
+    Gaussian KDE of `x` on `gridsize` points spanning its range, computed
+    by FFT in O(n + m log m) instead of the O(n * m) direct evaluation.
+
+    Uses Scott's bandwidth, like `scipy.stats.gaussian_kde` (which seaborn
+    calls), so the curve matches seaborn's to plotting precision.
+
+    Args:
+        x (np.ndarray): Sample.
+        gridsize (int, optional): Number of evaluation points. Default is 200.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Evaluation grid and density.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    bandwidth = np.std(x, ddof=1) * x.size ** -0.2
+    kde = KDEUnivariate(x)
+    # Support padded by 3 bandwidths so the FFT's circular convolution does
+    # not fold mass back at the edges; the curve is cut to the data range
+    kde.fit(kernel="gau", fft=True, bw=bandwidth, cut=3)
+    grid = np.linspace(x.min(), x.max(), gridsize)
+    return grid, np.interp(grid, kde.support, kde.density)
+
+
 def cooks_distance_plot(model: sm.regression.linear_model.RegressionResultsWrapper, ax: plt.Axes = None) -> plt.Axes:
     """
     Plot Cook's Distance to identify influential observations.
@@ -88,10 +209,13 @@ def cooks_distance_plot(model: sm.regression.linear_model.RegressionResultsWrapp
     if ax is None:
         _, ax = plt.subplots(figsize=(8, 5))
 
-    influence = model.get_influence()
-    cooks_d, _ = influence.cooks_distance
+    cooks_d = _cooks_distance(model)
 
-    ax.stem(np.arange(len(cooks_d)), cooks_d, markerfmt=",", basefmt=" ")
+    # One LineCollection for the stems and one Line2D for the markers,
+    # whatever the number of observations
+    index = np.arange(len(cooks_d))
+    ax.vlines(index, 0, cooks_d, color="C0")
+    ax.plot(index, cooks_d, ",", color="C0")
     ax.set_xlabel("Observation Index")
     ax.set_ylabel("Cook's Distance")
     ax.set_title("Cook's Distance Plot")
@@ -99,18 +223,65 @@ def cooks_distance_plot(model: sm.regression.linear_model.RegressionResultsWrapp
     return ax
 
 
+def diagnostics_panel(
+    model: sm.regression.linear_model.RegressionResultsWrapper,
+    figsize: tuple = (12, 10),
+) -> plt.Figure:
+    """
+    Plot the four residual diagnostics on one 2 x 2 figure: residuals vs
+    fitted, QQ-plot, residual histogram and Cook's distance.
+
+    One figure is created for the whole panel, and the residuals, fitted
+    values and Cook's distance are computed once and shared by the four
+    plots through the per-model cache.
+
+    Args:
+        model (sm.regression.linear_model.RegressionResultsWrapper): Fitted model.
+        figsize (tuple, optional): Figure size. Default is (12, 10).
+
+    Returns:
+        plt.Figure: The figure with the four diagnostic plots.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=figsize)
+    plot_residuals_vs_fitted(model, ax=axes[0, 0])
+    qq_plot_residuals(model, ax=axes[0, 1])
+    plot_residual_hist(model, ax=axes[1, 0])
+    cooks_distance_plot(model, ax=axes[1, 1])
+    fig.tight_layout()
+    return fig
+
+
 def shapiro_test(model: sm.regression.linear_model.RegressionResultsWrapper):
     """
     Perform the Shapiro-Wilk test for normality of residuals.
 
+    The residuals are centred on their median before the test (W is
+    location invariant), which keeps the statistic accurate when their
+    magnitude dwarfs their spread. Above 5000 residuals, where the
+    Shapiro-Wilk p-value is unreliable, the test runs on a fixed-seed
+    random subsample of 5000 of them.
+
     Args:
         model (sm.regression.linear_model.RegressionResultsWrapper): Fitted model.
 
     Returns:
-        dict: Dictionary containing test statistic and p-value.
+        dict: Contains:
+            - statistic (float): W statistic.
+            - p_value (float): p-value of the test.
+            - n_used (int): Number of residuals tested.
+            - subsampled (bool): Whether the residuals were subsampled.
     """
-    stat, p_value = stats.shapiro(model.resid)
-    return {"statistic": stat, "p_value": p_value}
+    residuals = _resid_array(model)
+    subsampled = residuals.size > _SHAPIRO_MAX_N
+    if subsampled:
+        residuals = np.random.default_rng(0).choice(residuals, _SHAPIRO_MAX_N, replace=False)
+    stat, p_value = shapiro_fast(residuals)
+    return {
+        "statistic": stat,
+        "p_value": p_value,
+        "n_used": residuals.size,
+        "subsampled": subsampled,
+    }
 
 
 def breusch_pagan_test(model: sm.regression.linear_model.RegressionResultsWrapper):
@@ -127,7 +298,7 @@ def breusch_pagan_test(model: sm.regression.linear_model.RegressionResultsWrappe
             - f_stat (float): F-statistic for the null hypothesis that error variance does not depend on x.
             - f_pvalue (float): p-value of the F-statistic.
     """
-    lm_stat, lm_pvalue, f_stat, f_pvalue = het_breuschpagan(model.resid, model.model.exog)
+    lm_stat, lm_pvalue, f_stat, f_pvalue = _breusch_pagan(model)
     return {
         "lm_stat": lm_stat,
         "lm_pvalue": lm_pvalue,
@@ -136,6 +307,42 @@ def breusch_pagan_test(model: sm.regression.linear_model.RegressionResultsWrappe
     }
 
 
+def _breusch_pagan(model):
+    """
+    Koenker's (studentized) Breusch-Pagan test from the primary fit.
+
+    The auxiliary regression of the squared residuals on `exog` reuses the
+    pseudo-inverse of `exog` the model already holds, so no second OLS is
+    factorized. Same results as `het_breuschpagan(model.resid, model.model.exog)`,
+    which is still used for weighted models and designs without an
+    explicit constant column (where it raises the usual error).
+
+    Args:
+        model (sm.regression.linear_model.RegressionResultsWrapper): Fitted model.
+
+    Returns:
+        tuple: LM statistic, its p-value, F statistic and its p-value.
+    """
+    exog = model.model.exog
+    x_max = exog.max(axis=0)
+    has_constant = np.any((x_max - exog.min(axis=0) == 0) & (x_max != 0))
+    if model.model.wexog is not exog or not has_constant or exog.shape[1] < 2:
+        return het_breuschpagan(_resid_array(model), exog)
+
+    u = _resid_array(model) ** 2
+    aux_resid = u - exog @ (model.model.pinv_wexog @ u)
+    ssr = float(aux_resid @ aux_resid)
+    centered = u - u.mean()
+    ess = float(centered @ centered) - ssr
+
+    nobs, nvars = exog.shape
+    df_model, df_resid = model.model.df_model, model.model.df_resid
+    # LM = n * R^2 of the auxiliary regression, on nvars - 1 degrees of freedom
+    lm = nobs * ess / (ess + ssr)
+    f = (ess / df_model) / (ssr / df_resid)
+    return lm, chdtrc(nvars - 1, lm), f, fdtrc(df_model, df_resid, f)
+
+
 def durbin_watson_test(model: sm.regression.linear_model.RegressionResultsWrapper):
     """
     Perform the Durbin-Watson test for autocorrelation of residuals.
@@ -146,19 +353,14 @@ def durbin_watson_test(model: sm.regression.linear_model.RegressionResultsWrappe
     Returns:
         float: Durbin-Watson test statistic.
     """
-    return durbin_watson(model.resid)
+    return durbin_watson(_resid_array(model))
 
 # if __name__ == "__main__":
 #     import matplotlib.pyplot as plt
 #     data = sm.datasets.get_rdataset("mtcars").data
 #     model = sm.OLS(data["mpg"], sm.add_constant(data[["wt", "hp"]])).fit()
 
-#     fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-#     plot_residuals_vs_fitted(model, ax=axes[0, 0])
-#     qq_plot_residuals(model, ax=axes[0, 1])
-#     plot_residual_hist(model, ax=axes[1, 0])
-#     cooks_distance_plot(model, ax=axes[1, 1])
-#     plt.tight_layout()
+#     diagnostics_panel(model)
 #     plt.show()
 
 #     print("Shapiro-Wilk Test:", shapiro_test(model))
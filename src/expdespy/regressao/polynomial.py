@@ -1,19 +1,25 @@
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
-import statsmodels.formula.api as smf
 import matplotlib.pyplot as plt
+from numpy.polynomial.polynomial import polyval
+from scipy.special import fdtrc
 
 class PolynomialRegression:
     """
     Fits polynomial models for quantitative treatments.
     """
     def __init__(self, data: pd.DataFrame, response: str, factor: str):
-        self.data = data.copy()
+        # No upfront copy: fit adds the power columns through assign, which
+        # builds a new frame and leaves the caller's untouched
+        self.data = data
         self.response = response
         self.factor = factor
         self.model = None
         self.results = None
+        # Fitted coefficients as a plain array (increasing powers), so
+        # repeated predictions skip the pandas wrapper around the params
+        self._coeffs = None
 
     def fit(self, degree: int = 1) -> sm.regression.linear_model.RegressionResultsWrapper:
         """
@@ -28,17 +34,24 @@ class PolynomialRegression:
         if degree < 1:
             raise ValueError("The polynomial degree must be at least 1.")
 
-        # Create polynomial terms
-        for d in range(2, degree + 1):
-            self.data[f"{self.factor}^{d}"] = self.data[self.factor] ** d
-
-        # Create model formula
-        predictors = [f"Q('{self.factor}')" ] + [f"Q('{self.factor}^{d}')" for d in range(2, degree + 1)]
-        formula = f"Q('{self.response}') ~ {' + '.join(predictors)}"
-
-        # Fit model
-        self.model = smf.ols(formula=formula, data=self.data)
+        # All powers of the factor in one Vandermonde build (columns x^0..x^degree)
+        x = self.data[self.factor].to_numpy(dtype=np.float64)
+        X = np.vander(x, N=degree + 1, increasing=True)
+
+        # Power columns kept in the data, as with the formula interface
+        self.data = self.data.assign(
+            **{f"{self.factor}^{d}": X[:, d] for d in range(2, degree + 1)}
+        )
+
+        # Fit model on the design matrix directly; the term names are the
+        # ones the former Q('...') formula produced
+        names = ["Intercept", f"Q('{self.factor}')"] + [
+            f"Q('{self.factor}^{d}')" for d in range(2, degree + 1)
+        ]
+        exog = pd.DataFrame(X, index=self.data.index, columns=names)
+        self.model = sm.OLS(self.data[self.response], exog, missing="drop")
         self.results = self.model.fit()
+        self._coeffs = self.results.params.to_numpy()
         return self.results
 
     def anova(self) -> pd.DataFrame:
@@ -50,7 +63,39 @@ class PolynomialRegression:
         """
         if self.results is None:
             raise ValueError("Model not fitted. Use .fit() first.")
-        return sm.stats.anova_lm(self.results)
+        # Sequential (type I) sums of squares: the squared QR effects of the
+        # polynomial terms, as anova_lm computes them for a formula model
+        Q, _ = np.linalg.qr(self.model.exog)
+        ss = (Q.T @ self.model.endog)[1:] ** 2
+        ssr, df_resid = self.results.ssr, self.results.df_resid
+        F = ss / (ssr / df_resid)
+        return pd.DataFrame(
+            {
+                "df": np.append(np.ones(ss.size), df_resid),
+                "sum_sq": np.append(ss, ssr),
+                "mean_sq": np.append(ss, ssr / df_resid),
+                "F": np.append(F, np.nan),
+                "PR(>F)": np.append(fdtrc(1, df_resid, F), np.nan),
+            },
+            index=list(self.results.params.index[1:]) + ["Residual"],
+        )
+
+    def predict(self, x) -> np.ndarray:
+        """
+        Evaluates the fitted polynomial at the given factor levels.
+
+        Uses Horner's rule on the cached coefficients, so no matrix of
+        powers is built, whatever the degree and the number of points.
+
+        Args:
+            x (array-like): Factor levels at which to evaluate the fit.
+
+        Returns:
+            np.ndarray: Predicted responses.
+        """
+        if self.results is None:
+            raise ValueError("Model not fitted. Use .fit() first.")
+        return polyval(np.asarray(x, dtype=np.float64), self._coeffs)
 
     def plot(self, ax: plt.Axes = None):
         """
@@ -70,14 +115,9 @@ class PolynomialRegression:
         # Generate values for prediction
         x_vals = np.linspace(self.data[self.factor].min(),
                             self.data[self.factor].max(), 100)
-        X_pred = pd.DataFrame({self.factor: x_vals})
-
-        # Add polynomial terms
-        for d in range(2, len(self.results.params)):
-            X_pred[f"{self.factor}^{d}"] = X_pred[self.factor] ** d
 
-        # Predict values
-        y_pred = self.results.predict(X_pred)
+        # Fitted curve by Horner's rule, without building the powers of the grid
+        y_pred = self.predict(x_vals)
 
         # Plot observed data and fitted curve
         ax.scatter(self.data[self.factor], self.data[self.response], color="blue", label="Data")
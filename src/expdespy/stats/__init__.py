@@ -0,0 +1,4 @@
+from ._levene import levene_fast
+from ._shapiro import shapiro_fast
+
+__all__ = ["levene_fast", "shapiro_fast"]
@@ -0,0 +1,58 @@
+# src/expdespy/stats/_levene.py
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy.special import fdtrc
+
+
+class LeveneResult(NamedTuple):
+    statistic: float
+    pvalue: float
+
+
+def levene_fast(values: np.ndarray, codes: np.ndarray) -> LeveneResult:
+    """
+    Levene's test for equal variances centred on the group medians
+    (Brown-Forsythe), the default of `scipy.stats.levene`.
+
+    Group medians come from one lexsort of (code, value), the absolute
+    deviations from one gather, and the one-way F statistic on those
+    deviations from `np.bincount` sums, so no per-group Python loop runs.
+
+    Args:
+        values (np.ndarray): Observations.
+        codes (np.ndarray): Integer group codes aligned with `values`, as
+            returned by `pd.factorize`; negative codes and missing values
+            are dropped.
+
+    Returns:
+        LeveneResult: W statistic and p-value.
+    """
+    values = np.asarray(values, dtype=float)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+
+    counts = np.bincount(codes)
+    present = counts > 0
+    codes = np.cumsum(present)[codes] - 1  # drop empty groups
+    counts = counts[present]
+    k, n = counts.size, values.size
+    if k < 2:
+        raise ValueError("Levene's test requires at least two groups.")
+
+    # Sorting by (code, value) makes each group contiguous and ordered
+    ordered = values[np.lexsort((values, codes))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = 0.5 * (ordered[starts + (counts - 1) // 2] + ordered[starts + counts // 2])
+
+    z = np.abs(values - medians[codes])
+    z_means = np.bincount(codes, weights=z) / counts
+    between = float(counts @ (z_means - z.mean()) ** 2)
+    within = float(np.sum((z - z_means[codes]) ** 2))
+
+    # Groups of two observations have identical deviations; like scipy,
+    # return inf (or nan) instead of raising
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = float((n - k) / (k - 1) * np.float64(between) / within)
+    return LeveneResult(w, float(fdtrc(k - 1, n - k, w)))
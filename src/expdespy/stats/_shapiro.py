@@ -0,0 +1,126 @@
+# src/expdespy/stats/_shapiro.py
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+# Polynomial coefficients from Royston (1995), algorithm AS R94
+_C1 = np.array([0.0, 0.221157, -0.147981, -2.071190, 4.434685, -2.706056])
+_C2 = np.array([0.0, 0.042981, -0.293762, -1.752461, 5.682633, -3.582633])
+_C3 = np.array([0.5440, -0.39978, 0.025054, -6.714e-4])
+_C4 = np.array([1.3822, -0.77857, 0.062767, -0.0020322])
+_C5 = np.array([-1.5861, -0.31082, -0.083751, 0.0038915])
+_C6 = np.array([-0.4803, -0.082676, 0.0030302])
+_G = np.array([-2.273, 0.459])
+
+
+class ShapiroResult(NamedTuple):
+    statistic: float
+    pvalue: float
+
+
+def _poly(coeffs: np.ndarray, x: float) -> float:
+    # Coefficients are stored in increasing order of power
+    return float(np.polynomial.polynomial.polyval(x, coeffs))
+
+
+@lru_cache(maxsize=128)
+def _sw_coeffs(n: int) -> np.ndarray:
+    """
+    Shapiro-Wilk weights for a sample of size `n` (Royston's approximation).
+
+    The weights depend only on `n`, so they are computed once per size and
+    cached. Only the first `n // 2` weights are returned; the rest follow by
+    antisymmetry.
+
+    Args:
+        n (int): Sample size (3 <= n).
+
+    Returns:
+        np.ndarray: Read-only array with the `n // 2` leading weights.
+    """
+    if n < 3:
+        raise ValueError("Shapiro-Wilk requires at least 3 observations.")
+
+    half = n // 2
+    if n == 3:
+        a = np.array([np.sqrt(0.5)])
+    else:
+        m = -ndtri((np.arange(1, half + 1) - 0.375) / (n + 0.25))
+        summ2 = 2.0 * float(m @ m)
+        ssumm2 = np.sqrt(summ2)
+        rsn = 1.0 / np.sqrt(n)
+        a1 = _poly(_C1, rsn) + m[0] / ssumm2
+
+        if n > 5:
+            a2 = _poly(_C2, rsn) + m[1] / ssumm2
+            fac = np.sqrt((summ2 - 2.0 * m[0] ** 2 - 2.0 * m[1] ** 2)
+                          / (1.0 - 2.0 * a1 ** 2 - 2.0 * a2 ** 2))
+            a = m / fac
+            a[1] = a2
+        else:
+            fac = np.sqrt((summ2 - 2.0 * m[0] ** 2) / (1.0 - 2.0 * a1 ** 2))
+            a = m / fac
+        a[0] = a1
+
+    a.setflags(write=False)
+    return a
+
+
+def _sw_pvalue(w: float, n: int) -> float:
+    """P-value of the W statistic for a sample of size `n` (AS R94)."""
+    if n == 3:
+        pw = 6.0 / np.pi * (np.arcsin(np.sqrt(w)) - np.pi / 3.0)
+        return max(pw, 0.0)
+
+    y = np.log1p(-w)
+    if n <= 11:
+        gamma = _poly(_G, n)
+        if y >= gamma:
+            return 1e-99
+        y = -np.log(gamma - y)
+        m = _poly(_C3, n)
+        s = np.exp(_poly(_C4, n))
+    else:
+        xx = np.log(n)
+        m = _poly(_C5, xx)
+        s = np.exp(_poly(_C6, xx))
+    return float(ndtr(-(y - m) / s))
+
+
+def shapiro_fast(x: np.ndarray, coeffs: Optional[np.ndarray] = None,
+                 presorted: bool = False) -> ShapiroResult:
+    """
+    Shapiro-Wilk normality test with cached weights.
+
+    Produces the same statistic and p-value as `scipy.stats.shapiro`, but
+    reuses the weights for a given sample size across calls and can skip
+    the sort when the caller already holds sorted data.
+
+    Args:
+        x (np.ndarray): Sample (e.g. model residuals).
+        coeffs (np.ndarray, optional): Weights from `_sw_coeffs(len(x))`.
+            Looked up from the cache when omitted.
+        presorted (bool, optional): If True, `x` is assumed to be sorted
+            in ascending order.
+
+    Returns:
+        ShapiroResult: W statistic and p-value.
+    """
+    x = np.asarray(x, dtype=float)
+    if not presorted:
+        x = np.sort(x)
+    n = x.size
+    a = _sw_coeffs(n) if coeffs is None else coeffs
+    half = a.size
+
+    x = x - np.median(x)
+    ss = float(np.sum((x - x.mean()) ** 2))
+    if ss == 0.0:
+        raise ValueError("Data must not be constant.")
+
+    diffs = x[::-1][:half] - x[:half]
+    w = min(float(a @ diffs) ** 2 / ss, 1.0)
+    return ShapiroResult(w, _sw_pvalue(w, n))
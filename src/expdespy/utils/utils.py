@@ -1,29 +1,85 @@
+import numpy as np
 import pandas as pd
 import string
 from typing import Optional, Union, List
 
 
 def get_summary(df: pd.DataFrame):
-    df_summary = pd.DataFrame(columns=[
-                            'clumn_dtype', 'na', 'na_pct', 'top_class', 'top_class_pct', 'nunique', 'unique_values'])
+    # Ausentes, valores distintos e tipos saem de uma passada vetorizada
+    # sobre todas as colunas; value_counts roda uma única vez por coluna
+    n = len(df)
+    na = df.isna().sum()
+    na_pct = na / n * 100
+    nunique = df.nunique()
+
+    top_class, top_class_pct, unique_values = [], [], []
     for col in df.columns:
-        df_summary.at[col, 'clumn_dtype'] = df[col].dtype
-        df_summary.at[col, 'na'] = df[col].isna().sum()
-        na_pct = df[col].isna().sum() / len(df)*100
-        df_summary.at[col, 'na_pct'] = na_pct
-        if na_pct == 100:
-            df_summary.at[col, 'top_class'] = '...'
-            df_summary.at[col, 'top_class_pct'] = '...'
-        else:
-            df_summary.at[col, 'top_class'] = df[col].value_counts().index[0]
-            df_summary.at[col, 'top_class_pct'] = df[col].value_counts(
-            ).values[0] / len(df)*100
-        df_summary.at[col, 'nunique'] = df[col].nunique()
-        if df[col].nunique() < 10:
-            df_summary.at[col, 'unique_values'] = df[col].unique().tolist()
+        if na_pct[col] == 100:
+            top_class.append('...')
+            top_class_pct.append('...')
         else:
-            df_summary.at[col, 'unique_values'] = '...'
-    return df_summary
+            # Só a classe mais frequente interessa: contagens sem ordenar e
+            # argmax (o primeiro máximo, mesmo desempate do value_counts)
+            counts = df[col].value_counts(sort=False)
+            top = int(np.argmax(counts.to_numpy()))
+            top_class.append(counts.index[top])
+            top_class_pct.append(counts.iat[top] / n * 100)
+        unique_values.append(df[col].unique().tolist() if nunique[col] < 10 else '...')
+
+    # Colunas montadas de uma vez: contagens e percentuais ficam numéricos
+    return pd.DataFrame({
+        'clumn_dtype': df.dtypes.astype(object),
+        'na': na,
+        'na_pct': na_pct,
+        'top_class': pd.Series(top_class, index=df.columns, dtype=object),
+        'top_class_pct': pd.Series(top_class_pct, index=df.columns, dtype=object),
+        'nunique': nunique,
+        'unique_values': pd.Series(unique_values, index=df.columns, dtype=object),
+    }, index=df.columns)
+
+
+def _letter_sets(significant: np.ndarray) -> List[int]:
+    """
+    Núcleo numérico do CLD: agrupa os grupos que não diferem entre si.
+
+    Para cada grupo `i`, percorre os demais na ordem dada e inclui `j` no
+    conjunto de `i` quando `j` não difere de nenhum membro já incluído.
+    Conjuntos repetidos são descartados, mantendo a ordem de criação.
+
+    Conjuntos e linhas da matriz são máscaras de bits (inteiros Python, sem
+    limite de grupos): a união das linhas dos membros diz, num único E
+    bit a bit, quais grupos ainda podem entrar.
+
+    Args:
+        significant (np.ndarray): Matriz booleana simétrica k x k; True
+            quando o par de grupos difere significativamente.
+
+    Returns:
+        List[int]: Máscaras (bit `i` = posição `i`) dos conjuntos que
+            recebem a mesma letra.
+    """
+    k = significant.shape[0]
+    # Casos degenerados resolvidos sem a varredura: nenhum par difere (uma
+    # letra para todos) ou todos diferem (uma letra por grupo)
+    off_diagonal = significant[~np.eye(k, dtype=bool)]
+    if k and not off_diagonal.any():
+        return [(1 << k) - 1]
+    if off_diagonal.all():
+        return [1 << i for i in range(k)]
+
+    rows = [
+        int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+        for row in significant
+    ]
+    sets = {}
+    for i in range(k):
+        members, blocked = 1 << i, rows[i]
+        for j in range(k):
+            if j != i and not (blocked >> j) & 1:
+                members |= 1 << j
+                blocked |= rows[j]
+        sets[members] = None
+    return list(sets)
 
 
 # 3. Função assign_letters para atribuir letras aos grupos para testes post hoc
@@ -65,17 +121,9 @@ def assign_letters(
         pd.DataFrame: DataFrame com os grupos como índice e as letras de significância atribuídas.
     """
 
-    # Função auxiliar para verificar se há diferença significativa entre dois grupos
-    def is_significant(lv1, lv2, df=df_post_hoc, alpha=alpha) -> bool:
-        match = df.loc[
-            ((df[G1] == lv1) & (df[G2] == lv2)) |
-            ((df[G1] == lv2) & (df[G2] == lv1)),
-            P
-        ]
-        return not match.empty and match.iloc[0] < alpha
-
     letters = string.ascii_lowercase
-    df_post_hoc[P] = df_post_hoc[P].apply(pd.to_numeric)
+    # Conversão em bloco, sem reescrever a coluna do DataFrame recebido
+    p_values = pd.to_numeric(df_post_hoc[P]).to_numpy()
 
     # Determina a ordem dos grupos
     if order is None:
@@ -86,30 +134,41 @@ def assign_letters(
             raise ValueError(
                 "Para ordenação por média/mediana, forneça `data`, `vals` e `group`.")
         ascending = order == 'ascending'
-        data = data.copy()
-        data[vals] = data[vals].apply(pd.to_numeric)
-        group_stats = data.groupby(group)[vals].mean(
-        ) if param else data.groupby(group)[vals].median()
-        order = group_stats.sort_values(ascending=ascending).index.tolist()
-
-    # Atribuição das letras com base em significância
-    draft: dict[int, set[str]] = {}
-    sets: List[set[str]] = []
-    for i, l1 in enumerate(order):
-        draft[i] = {l1}
-        for l2 in order:
-            if l1 != l2 and not any([
-                is_significant(l1, l2),
-                *[is_significant(l_, l2) for l_ in draft[i]]
-            ]):
-                draft[i].add(l2)
-    [sets.append(s) for s in draft.values() if s not in sets]
+        # Só a coluna de valores é convertida; o DataFrame não é copiado.
+        # observed=True: níveis categóricos sem observações não viram grupos
+        grouped = pd.to_numeric(data[vals]).groupby(data[group], observed=True)
+        group_stats = grouped.mean() if param else grouped.median()
+        # Ordenação estável: empates mantêm a ordem dos grupos
+        order = group_stats.sort_values(ascending=ascending, kind='stable').index.tolist()
+
+    k = len(order)
+    if not (p_values < alpha).any():
+        # Nenhum par significativo: uma letra para todos, sem montar a matriz
+        sets = [(1 << k) - 1]
+    else:
+        # Matriz de significância montada uma única vez (vale a primeira linha
+        # de cada par, em qualquer sentido); o laço de letras só consulta arrays
+        position = {lv: i for i, lv in enumerate(order)}
+        rows = np.array([position.get(g, -1) for g in df_post_hoc[G1]], dtype=np.intp)
+        cols = np.array([position.get(g, -1) for g in df_post_hoc[G2]], dtype=np.intp)
+        valid = np.flatnonzero((rows >= 0) & (cols >= 0))
+        # Primeira ocorrência de cada par não ordenado, numa chave inteira
+        pair = np.minimum(rows, cols)[valid] * k + np.maximum(rows, cols)[valid]
+        _, first = np.unique(pair, return_index=True)
+        valid = valid[first]
+        significant = np.zeros((k, k), dtype=bool)
+        significant[rows[valid], cols[valid]] = p_values[valid] < alpha
+        significant |= significant.T
+
+        sets = _letter_sets(significant)
 
     # Cria o DataFrame final com as letras
-    cld = pd.DataFrame(columns=['Group', 'Letters'])
-    for i, lt in enumerate(order):
-        cld.loc[i, ['Group', 'Letters']] = lt, ''.join([
-            letters[j] for j, s in enumerate(sets) if lt in s
-        ])
+    cld = pd.DataFrame({
+        'Group': pd.Series(list(order), dtype=object),
+        'Letters': pd.Series(
+            [''.join(letters[s] for s, mask in enumerate(sets) if mask >> i & 1) for i in range(k)],
+            dtype=object,
+        ),
+    })
 
     return cld.set_index('Group')
@@ -0,0 +1,6 @@
+# Backend não interativo para toda a suíte (pytest), escolhido pela variável
+# de ambiente: o matplotlib só é importado pelos testes que desenham, e sem
+# descoberta de Tk/Qt por figura
+import os
+
+os.environ["MPLBACKEND"] = "Agg"
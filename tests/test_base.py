@@ -1,9 +1,14 @@
 # tests/test_base.py
 
 import unittest
+from unittest import mock
 import numpy as np
 import pandas as pd
-from expdespy.models.base import ExperimentalDesign
+from expdespy.models._fast_ols import categorical_design, oneway_anova
+from expdespy.stats import shapiro_fast
+from expdespy.models.base import (
+    ExperimentalDesign, _combined_codes, _fit_anova_fast, _significance_markers, _split_by_codes
+)
 
 
 class DummyDesign(ExperimentalDesign):
@@ -69,3 +74,193 @@ class TestExperimentalDesign(unittest.TestCase):
         self.assertLess(p_val, 0.001)
         self.assertEqual(signif, "***")
 
+    def test_fitted_model_is_cached(self):
+        """
+        Testa se o modelo ajustado é reaproveitado entre chamadas
+        e reajustado quando os dados são substituídos
+        """
+        model = self.design._fitted_model()
+        self.design.run_anova()
+        self.design.check_assumptions(print_conclusions=False)
+        self.assertIs(self.design._fitted_model(), model)
+        # O ajuste e as matrizes de delineamento compartilham a mesma fórmula processada
+        self.assertIs(model.model, self.design._ols_model())
+
+        self.design.data = self.data.copy()
+        self.assertIsNone(self.design._anova_cache)
+        self.assertIsNot(self.design._fitted_model(), model)
+
+    def test_anova_table_is_cached_copy(self):
+        """
+        Testa se a tabela ANOVA em cache é devolvida como cópia,
+        de modo que alterações do chamador não afetem chamadas seguintes
+        """
+        first = self.design.run_anova()
+        first.loc[:, "Signif"] = "x"
+        second = self.design.run_anova()
+
+        self.assertIsNot(first, second)
+        self.assertNotIn("x", second["Signif"].tolist())
+
+    def test_categorical_design_matches_patsy(self):
+        """
+        Testa se a matriz montada pelos códigos coincide com a do patsy, em float32
+        """
+        from patsy import dmatrix
+
+        data = pd.DataFrame({
+            "a": list("xyzxyzxyz"),
+            "b": list("ppqqppqqp"),
+        })
+        X, terms = categorical_design(
+            [data["a"], data["b"]], ["C(a)", "C(b)"], [(0,), (1,), (0, 1)]
+        )
+        expected = dmatrix("C(a) * C(b)", data)
+
+        self.assertEqual(X.dtype, np.float32)
+        np.testing.assert_array_equal(X, np.asarray(expected))
+        self.assertEqual(
+            [(name, cols) for name, cols, _ in terms],
+            [(term.name(), expected.design_info.slice(term)) for term in expected.design_info.terms[1:]],
+        )
+
+    def test_fit_anova_fast_matches_statsmodels(self):
+        """
+        Testa se o ajuste por QR reproduz os resíduos do statsmodels
+        """
+        y, X = self.design._design_matrices()
+        _, resid, ss_res = _fit_anova_fast(y, X)
+        model = self.design._fitted_model()
+
+        np.testing.assert_allclose(resid, model.resid.to_numpy())
+        self.assertAlmostEqual(ss_res, model.ssr)
+
+    def test_split_by_codes_groups_values(self):
+        """
+        Testa se a partição por códigos agrupa os valores corretamente
+        e descarta rótulos ausentes (código -1)
+        """
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        codes = np.array([1, 0, 1, -1, 0])
+
+        groups = _split_by_codes(values, codes)
+
+        self.assertEqual(len(groups), 2)
+        np.testing.assert_array_equal(groups[0], [2.0, 5.0])
+        np.testing.assert_array_equal(groups[1], [1.0, 3.0])
+
+    def test_significance_markers_boundaries(self):
+        """
+        Testa os limites dos marcadores: os cortes são exclusivos
+        (p < 0.001, p < 0.01, p < 0.05) e NaN recebe o marcador vazio
+        """
+        p = np.array([0.0005, 0.001, 0.01, 0.049, 0.05, np.nan])
+
+        markers = _significance_markers(p)
+
+        self.assertEqual(list(markers), ["***", "**", "*", "*", "ns", " "])
+
+    def test_oneway_anova_matches_statsmodels(self):
+        """
+        Testa se a ANOVA de um fator por somas de grupo reproduz o anova_lm
+        """
+        from statsmodels.stats.anova import anova_lm
+
+        codes, _ = pd.factorize(self.data["trat"])
+        expected = anova_lm(self.design._fitted_model(), typ=2)
+
+        result = oneway_anova(self.data["y"].to_numpy(), codes, "C(trat)")
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_treatment_converted_to_categorical(self):
+        """
+        Testa se a coluna de tratamento é convertida para Categorical
+        sem alterar o DataFrame do chamador
+        """
+        self.assertIsInstance(self.design.data["trat"].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(self.data["trat"].dtype, pd.CategoricalDtype)
+
+    def test_invalidate_cache_after_in_place_change(self):
+        """
+        Testa se invalidate_cache força o reajuste após alterar os dados no próprio objeto
+        """
+        before = self.design.run_anova()
+        self.design.data.loc[:, "y"] = self.design.data["y"] * 2
+        self.design.invalidate_cache()
+        after = self.design.run_anova()
+
+        self.assertAlmostEqual(after.loc["Residual", "sum_sq"], 4 * before.loc["Residual", "sum_sq"])
+
+    def test_combined_codes_follow_groupby_order(self):
+        """
+        Testa se os códigos combinados numeram apenas as combinações observadas,
+        na ordem do groupby, e marcam rótulos ausentes com -1
+        """
+        data = pd.DataFrame({
+            "a": ["y", "x", "y", None, "x"],
+            "b": [2, 1, 1, 1, 1],
+        })
+
+        codes = _combined_codes(data, ["a", "b"])
+
+        np.testing.assert_array_equal(codes, [2, 0, 1, -1, 0])
+
+    def test_residuals_are_cached_and_read_only(self):
+        """
+        Testa se os resíduos são reaproveitados entre verificações e protegidos contra escrita
+        """
+        residuals = self.design._residuals()
+        self.design.check_assumptions(print_conclusions=False)
+
+        self.assertIs(self.design._residuals(), residuals)
+        self.assertFalse(residuals.flags.writeable)
+        np.testing.assert_allclose(residuals, self.design._fitted_model().resid.to_numpy())
+
+    def test_check_assumptions_with_missing_response(self):
+        """
+        Testa se uma resposta ausente sai do ajuste, como no statsmodels, sem erro nos pressupostos
+        """
+        from scipy.stats import shapiro
+
+        data = self.data.copy()
+        data.loc[2, "y"] = np.nan
+        design = DummyDesign(data, response="y", treatment="trat")
+
+        result = design.check_assumptions(print_conclusions=False)
+
+        expected = design._fitted_model().resid.to_numpy()
+        np.testing.assert_allclose(design._residuals(), expected, atol=1e-10)
+        self.assertAlmostEqual(
+            result["normality (Shapiro-Wilk)"]["p-value"], shapiro(expected).pvalue, places=6
+        )
+
+    def test_normality_is_cached_until_invalidated(self):
+        """
+        Testa se o teste de normalidade roda uma única vez por ajuste
+        """
+        with mock.patch("expdespy.models.base.shapiro_fast", wraps=shapiro_fast) as spy:
+            first = self.design._normality()
+            self.assertEqual(self.design._normality(), first)
+            self.assertEqual(spy.call_count, 1)
+
+            self.design.invalidate_cache()
+            self.design._normality()
+            self.assertEqual(spy.call_count, 2)
+
+        self.assertEqual(first[0], "Shapiro-Wilk")
+
+    def test_check_assumptions_uses_cached_normality(self):
+        """
+        Testa se check_assumptions reaproveita o teste de normalidade em cache
+        e informa qual teste foi usado
+        """
+        self.design.invalidate_cache()
+        with mock.patch("expdespy.models.base.shapiro_fast", wraps=shapiro_fast) as spy:
+            result = self.design.check_assumptions(print_conclusions=False)
+            self.design.check_assumptions(print_conclusions=False)
+            self.assertEqual(spy.call_count, 1)
+
+        normality = result["normality (Shapiro-Wilk)"]
+        self.assertEqual(normality["Test"], "Shapiro-Wilk")
+        self.assertEqual(normality["p-value"], self.design._normality()[1])
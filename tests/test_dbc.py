@@ -1,14 +1,16 @@
 import unittest
+import pandas as pd
 from expdespy.datasets.dbc_caprinos import load_dbc_caprinos
 from expdespy.models import RCBD
 
 
 class TestDBC(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Arrange (setup global)
-        self.df, _ = load_dbc_caprinos()
-        self.dbc = RCBD(data=self.df, response="ppm_micronutriente",
+        cls.df, _ = load_dbc_caprinos()
+        cls.dbc = RCBD(data=cls.df, response="ppm_micronutriente",
                     treatment="produto", block="bloco")
 
     def test_trivial_test(self):
@@ -20,10 +22,42 @@ class TestDBC(unittest.TestCase):
         f_calc_expected = 33.58
         # Act
         result = self.dbc.run_anova()
-        f_calc = float(result.loc["C(produto)", "F"])
+        f_calc = float(result.at["C(produto)", "F"])
 
         # Assert
-        self.assertIsInstance(result, type(self.df))
+        self.assertIsInstance(result, pd.DataFrame)
         self.assertIn("F", result.columns)
         self.assertIn("PR(>F)", result.columns)
         self.assertAlmostEqual(f_calc, f_calc_expected, delta=0.1)
+
+    def test_anova_matches_statsmodels_unbalanced(self):
+        import statsmodels.formula.api as smf
+        from statsmodels.stats.anova import anova_lm
+
+        # Arrange: remove parcelas para desbalancear o experimento
+        df = self.df.iloc[:-2]
+        dbc = RCBD(data=df, response="ppm_micronutriente",
+                   treatment="produto", block="bloco")
+        model = smf.ols(dbc._get_formula(), data=df).fit()
+        expected = anova_lm(model, typ=2)
+
+        # Act
+        result = dbc.run_anova().drop(columns="Signif")
+
+        # Assert
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_check_assumptions_with_missing_response(self):
+        # Uma parcela sem resposta sai do ajuste, como no statsmodels
+        import numpy as np
+        from scipy.stats import shapiro
+
+        df = self.df.copy()
+        df.loc[0, "ppm_micronutriente"] = np.nan
+        dbc = RCBD(data=df, response="ppm_micronutriente",
+                   treatment="produto", block="bloco")
+
+        result = dbc.check_assumptions(print_conclusions=False)
+
+        expected = shapiro(dbc._fitted_model().resid).pvalue
+        self.assertAlmostEqual(result["normality (Shapiro-Wilk)"]["p-value"], expected, places=6)
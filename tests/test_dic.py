@@ -1,14 +1,16 @@
 import unittest
+import pandas as pd
 from expdespy.datasets.dic_milho import load_dic_milho
 from expdespy.models import CRD
 
 
 class TestDIC(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Arrange (global): carregamento dos dados e modelo
-        self.df, _ = load_dic_milho()
-        self.dic = CRD(data=self.df, response="produtividade",
+        cls.df, _ = load_dic_milho()
+        cls.dic = CRD(data=cls.df, response="produtividade",
                     treatment="variedade")
 
     def test_anova_returns_dataframe(self):
@@ -17,10 +19,10 @@ class TestDIC(unittest.TestCase):
 
         # Act
         result = self.dic.run_anova()
-        f_calc = float(result.loc["C(variedade)", "F"])
+        f_calc = float(result.at["C(variedade)", "F"])
 
         # Assert
-        self.assertIsInstance(result, type(self.df))
+        self.assertIsInstance(result, pd.DataFrame)
         self.assertIn("PR(>F)", result.columns)
         self.assertIn("F", result.columns)
         self.assertIsInstance(f_calc, float)
@@ -1,14 +1,16 @@
 import unittest
+import pandas as pd
 from expdespy.datasets import load_dql_cana
 from expdespy.models import LSD
 
 
 class TestDQL(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Arrange (setup global)
-        self.df, _ = load_dql_cana()
-        self.dql = LSD(data=self.df, response="resposta", treatment="tratamento", block_row="linha", block_col="coluna")
+        cls.df, _ = load_dql_cana()
+        cls.dql = LSD(data=cls.df, response="resposta", treatment="tratamento", block_row="linha", block_col="coluna")
 
     def test_trivial_test(self):
         # Arrange, Act, Assert
@@ -19,10 +21,10 @@ class TestDQL(unittest.TestCase):
         f_calc_expected = 12.09 
         # Act
         result = self.dql.run_anova()
-        f_calc = float(result.loc["C(tratamento)", "F"])
+        f_calc = float(result.at["C(tratamento)", "F"])
 
         # Assert
-        self.assertIsInstance(result, type(self.df))
+        self.assertIsInstance(result, pd.DataFrame)
         self.assertIn("F", result.columns)
         self.assertIn("PR(>F)", result.columns)
         self.assertAlmostEqual(f_calc, f_calc_expected, delta=0.1)
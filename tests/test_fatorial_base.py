@@ -1,8 +1,44 @@
+import io
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
+from expdespy.posthoc import PostHocLoader
 from expdespy.models.fatorial_base import FactorialDesign
 
 
+# Dados montados uma vez na importação e compartilhados pelos testes
+# Dados simples sem interação significativa
+_DATA_SIMPLE = pd.DataFrame({
+    "f1": ["A", "A", "A", "A", "B", "B", "B", "B"],
+    "f2": ["X", "X", "Y", "Y", "X", "X", "Y", "Y"],
+    "y": [10, 11, 12, 13, 15, 16, 18, 19]
+})
+
+# Dados com interação significativa
+_DATA_INTERACTION = pd.DataFrame({
+    "f1": ["A", "A", "B", "B"] * 4,
+    "f2": ["X", "Y", "X", "Y"] * 4,
+    "y": [10, 15, 12, 30, 9, 14, 11, 29,
+          10, 15, 13, 31, 8, 16, 12, 28]
+})
+
+# Fator com nome reservado ("C")
+_DATA_RESERVED = pd.DataFrame({
+    "C": ["A", "B"] * 4,
+    "f2": ["X", "Y"] * 4,
+    "y": [10, 12, 14, 16, 11, 13, 15, 17]
+})
+
+# Interação forte, com nomes de fatores comuns
+_DATA_INTERACTION_STRONG = pd.DataFrame({
+    "f1": ["A", "A", "B", "B"] * 4,
+    "f2": ["X", "Y", "X", "Y"] * 4,
+    "y": [10, 25, 12, 30, 9, 26, 11, 29,
+          10, 27, 13, 31, 8, 28, 12, 32]
+})
+
+
 class DummyFatorialDesign(FactorialDesign):
     """Classe auxiliar para testar FactorialDesign com fórmula no padrão real (C(...))."""
     def _get_formula(self):
@@ -12,28 +48,20 @@ class DummyFatorialDesign(FactorialDesign):
 
 class TestFatorialDesign(unittest.TestCase):
 
-    def setUp(self):
-        # Dados simples sem interação significativa
-        self.data = pd.DataFrame({
-            "f1": ["A", "A", "A", "A", "B", "B", "B", "B"],
-            "f2": ["X", "X", "Y", "Y", "X", "X", "Y", "Y"],
-            "y": [10, 11, 12, 13, 15, 16, 18, 19]
-        })
-        self.model = DummyFatorialDesign(
-            data=self.data,
+    @classmethod
+    def setUpClass(cls):
+        # Modelos montados uma vez por classe sobre os dados do módulo: os
+        # testes só leem o modelo, que guarda o próprio ajuste entre as chamadas
+        cls.data = _DATA_SIMPLE
+        cls.model = DummyFatorialDesign(
+            data=cls.data,
             response="y",
             factors=["f1", "f2"]
         )
 
-        # Dados com interação significativa
-        self.data_interaction = pd.DataFrame({
-            "f1": ["A", "A", "B", "B"] * 4,
-            "f2": ["X", "Y", "X", "Y"] * 4,
-            "y": [10, 15, 12, 30, 9, 14, 11, 29,
-                  10, 15, 13, 31, 8, 16, 12, 28]
-        })
-        self.model_interaction = DummyFatorialDesign(
-            data=self.data_interaction,
+        cls.data_interaction = _DATA_INTERACTION
+        cls.model_interaction = DummyFatorialDesign(
+            data=cls.data_interaction,
             response="y",
             factors=["f1", "f2"]
         )
@@ -57,6 +85,10 @@ class TestFatorialDesign(unittest.TestCase):
         result = self.model.run_anova(max_interaction=1)
         self.assertIsInstance(result, pd.DataFrame)
         self.assertIn("Signif", result.columns)
+        # Apenas efeitos principais e resíduo, sem reajustar o modelo
+        self.assertEqual(list(result.index), ["C(f1)", "C(f2)", "Residual"])
+        full = self.model.run_anova()
+        pd.testing.assert_frame_equal(result, full.loc[result.index])
 
     def test_unfold_interactions_without_significant_interaction(self):
         results = self.model.unfold_interactions(print_results=False)
@@ -68,6 +100,125 @@ class TestFatorialDesign(unittest.TestCase):
         self.assertIn("anova", results)
         self.assertTrue("interactions" in results or "main_effects" in results)
 
+    def test_unfold_interactions_runs_each_stratum_once(self):
+        # Interação tripla forte: os estratos de A:B também aparecem em A:B:C
+        rng = np.random.default_rng(0)
+        grid = np.array(np.meshgrid([0, 1], [0, 1], [0, 1])).reshape(3, -1).T.repeat(3, axis=0)
+        a, b, c = grid.T
+        data = pd.DataFrame({
+            "a": a, "b": b, "c": c,
+            "y": 10 * a * b * c + 5 * a * b + 3 * b * c + 4 * a * c + rng.normal(0, 0.1, len(a)),
+        })
+        model = DummyFatorialDesign(data=data, response="y", factors=["a", "b", "c"])
+
+        with mock.patch.object(
+            PostHocLoader, "create", wraps=PostHocLoader.create
+        ) as create:
+            results = model.unfold_interactions(print_results=False)
+
+        self.assertEqual(create.call_count, len(results["interactions"]))
+
+    def test_unfold_interactions_reuses_prior_anova(self):
+        # A ANOVA já calculada por run_anova() é reaproveitada no desdobramento
+        expected = self.model_interaction.run_anova()
+
+        with mock.patch("statsmodels.stats.anova.anova_lm") as anova_lm:
+            results = self.model_interaction.unfold_interactions(print_results=False)
+
+        anova_lm.assert_not_called()
+        pd.testing.assert_frame_equal(results["anova"], expected)
+
+    def test_fitted_model_shared_across_methods(self):
+        # check_assumptions, run_anova e unfold_interactions usam o mesmo ajuste
+        self.model_interaction.check_assumptions(print_conclusions=False)
+        model = self.model_interaction._fitted_model()
+        self.model_interaction.run_anova()
+        self.model_interaction.unfold_interactions(print_results=False)
+
+        self.assertIs(self.model_interaction._fitted_model(), model)
+
+    def test_unfolded_anova_matches_statsmodels(self):
+        # A ANOVA de cada desdobramento coincide com o ajuste via statsmodels no subconjunto
+        import statsmodels.formula.api as smf
+        from statsmodels.stats.anova import anova_lm
+
+        results = self.model_interaction.unfold_interactions(print_results=False)
+
+        for key, blocks in results["interactions"].items():
+            f1, rest = key.split(" within ")
+            f2, level = rest.split("=")
+            subset = self.data_interaction[self.data_interaction[f2] == level]
+            expected = anova_lm(smf.ols(f"y ~ C({f1})", data=subset).fit(), typ=2)
+            pd.testing.assert_frame_equal(blocks["anova"], expected, check_exact=False, rtol=1e-8)
+
+    def test_factors_converted_to_categorical(self):
+        # Os fatores passam a Categorical sem alterar o DataFrame original
+        for f in self.model.factors:
+            self.assertIsInstance(self.model.data[f].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(self.data["f1"].dtype, pd.CategoricalDtype)
+
+    def test_run_anova_residual_has_empty_marker(self):
+        # A linha de resíduo (sem p-valor) recebe marcador vazio
+        anova = self.model_interaction.run_anova()
+        self.assertEqual(anova.loc["Residual", "Signif"], "")
+        self.assertEqual(anova.loc["C(f1):C(f2)", "Signif"], "***")
+
+    def test_check_assumptions_large_sample_uses_dagostino(self):
+        # Acima de 5000 resíduos a normalidade é avaliada por D'Agostino-Pearson
+        rng = np.random.default_rng(1)
+        data = pd.DataFrame({
+            "f1": np.tile(["A", "B"], 3000),
+            "f2": np.repeat(["X", "Y", "Z"], 2000),
+            "y": rng.normal(size=6000),
+        })
+        model = DummyFatorialDesign(data=data, response="y", factors=["f1", "f2"])
+
+        result = model.check_assumptions(print_conclusions=False)
+
+        self.assertEqual(result["normality (Shapiro-Wilk)"]["Test"], "D'Agostino-Pearson")
+        self.assertEqual(
+            self.model.check_assumptions(print_conclusions=False)["normality (Shapiro-Wilk)"]["Test"],
+            "Shapiro-Wilk",
+        )
+
+    def test_levene_ignores_unobserved_categories(self):
+        # Categorias sem observações não geram grupos vazios no teste de Levene
+        from scipy import stats
+
+        data = self.data_interaction.copy()
+        data["f1"] = pd.Categorical(data["f1"], categories=["A", "B", "Z"])
+        model = DummyFatorialDesign(data=data, response="y", factors=["f1", "f2"])
+        groups = [g["y"].to_numpy() for _, g in self.data_interaction.groupby(["f1", "f2"])]
+
+        result = model.check_assumptions(print_conclusions=False)
+
+        self.assertAlmostEqual(
+            result["homoscedasticity (Levene)"]["p-value"], stats.levene(*groups).pvalue
+        )
+
+    def test_unfold_interactions_reuses_posthoc_letters(self):
+        # Uma segunda chamada reaproveita as letras já calculadas
+        first = self.model_interaction.unfold_interactions(print_results=False)
+
+        with mock.patch.object(PostHocLoader, "create") as create:
+            second = self.model_interaction.unfold_interactions(print_results=False)
+
+        create.assert_not_called()
+        for key, blocks in first["interactions"].items():
+            pd.testing.assert_frame_equal(second["interactions"][key]["posthoc"], blocks["posthoc"])
+
+    def test_unfold_interactions_writes_output_once(self):
+        # A saída é montada em buffer e escrita em sys.stdout ao final
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            self.model_interaction.unfold_interactions(print_results=True)
+            self.model_interaction.display_unfolded_interactions(
+                self.model_interaction.unfold_interactions(print_results=False)
+            )
+
+        self.assertIn("Unfolding: f1 within f2=X", out.getvalue())
+        self.assertIn("SIGNIFICANT INTERACTIONS - Unfolding", out.getvalue())
+
     def test_display_unfolded_interactions(self):
         results = self.model.unfold_interactions(print_results=False)
         # Apenas verifica se a função roda sem erros
@@ -75,26 +226,20 @@ class TestFatorialDesign(unittest.TestCase):
 
 
 class TestFatorialDesignExtra(unittest.TestCase):
-    def setUp(self):
-        self.data = pd.DataFrame({
-            "C": ["A", "B"] * 4,
-            "f2": ["X", "Y"] * 4,
-            "y": [10, 12, 14, 16, 11, 13, 15, 17]
-        })
-        self.model_reserved = DummyFatorialDesign(
-            data=self.data.copy(),
+    @classmethod
+    def setUpClass(cls):
+        # O modelo não altera o DataFrame recebido, então os dados do módulo
+        # são compartilhados sem cópia
+        cls.data = _DATA_RESERVED
+        cls.model_reserved = DummyFatorialDesign(
+            data=cls.data,
             response="y",
             factors=["C", "f2"]
         )
 
-        self.data_interaction = pd.DataFrame({
-            "f1": ["A", "A", "B", "B"] * 4,
-            "f2": ["X", "Y", "X", "Y"] * 4,
-            "y": [10, 25, 12, 30, 9, 26, 11, 29,
-                10, 27, 13, 31, 8, 28, 12, 32]
-        })
-        self.model_interaction = DummyFatorialDesign(
-            data=self.data_interaction,
+        cls.data_interaction = _DATA_INTERACTION_STRONG
+        cls.model_interaction = DummyFatorialDesign(
+            data=cls.data_interaction,
             response="y",
             factors=["f1", "f2"]
         )
@@ -102,6 +247,13 @@ class TestFatorialDesignExtra(unittest.TestCase):
     def test_safe_factor_reserved_name(self):
         self.assertIn("C_", self.model_reserved.data.columns)
 
+    def test_safe_factor_does_not_modify_caller_data(self):
+        # A renomeação de nomes reservados não altera o DataFrame do chamador
+        model = DummyFatorialDesign(data=self.data, response="y", factors=["C", "f2"])
+        self.assertIn("C_", model.data.columns)
+        self.assertEqual(list(self.data.columns), ["C", "f2", "y"])
+        self.assertNotIsInstance(self.data["f2"].dtype, pd.CategoricalDtype)
+
     def test_check_assumptions_prints(self):
         result = self.model_reserved.check_assumptions(print_conclusions=True)
         self.assertIn("normality (Shapiro-Wilk)", result)
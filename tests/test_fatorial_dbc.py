@@ -3,16 +3,18 @@ import pandas as pd
 
 from expdespy.datasets import load_fatorial_rcbd_np
 from expdespy.models import FactorialRCBD
-from statsmodels.stats.anova import anova_lm
 
 class TestFatorialRCBD(unittest.TestCase):
-    def setUp(self):
-        self.df, self.desc = load_fatorial_rcbd_np()
-        self.model = FactorialRCBD(
-            data=self.df,
-            response=self.desc['response'],
-            factors=self.desc['factors'],
-            block=self.desc['blocks']
+    @classmethod
+    def setUpClass(cls):
+        # Dados e modelo montados uma vez por classe: os testes só leem o
+        # modelo, que guarda o próprio ajuste entre as chamadas
+        cls.df, cls.desc = load_fatorial_rcbd_np()
+        cls.model = FactorialRCBD(
+            data=cls.df,
+            response=cls.desc['response'],
+            factors=cls.desc['factors'],
+            block=cls.desc['blocks']
         )
 
     def test_anova_returns_dataframe(self):
@@ -23,7 +25,7 @@ class TestFatorialRCBD(unittest.TestCase):
 
         f_np_esperado = 4.696
         # Teste do valor de F do termo de interação N:P
-        f_np = float(result.loc["C(N):C(P)", "F"])
+        f_np = float(result.at["C(N):C(P)", "F"])
         self.assertAlmostEqual(f_np, f_np_esperado, places=2)
 
     def test_check_assumptions_returns_dict(self):
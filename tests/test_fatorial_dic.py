@@ -29,22 +29,24 @@ class TestFactorialCRDExemploIrrigacao(unittest.TestCase):
 
         # Verifica tamanho e valores do DataFrame
         self.assertEqual(len(df), 12)
-        self.assertTrue((df["f1"].isin([0, 1])).all())
-        self.assertTrue((df["f2"].isin([0, 1])).all())
+        # Os dois fatores de uma vez, comparados direto no array
+        niveis = df[["f1", "f2"]].to_numpy()
+        self.assertTrue(((niveis == 0) | (niveis == 1)).all())
 
 class TestFactorialCRD(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Arrange
-        self.df, description = load_fatorial_dic_nitrogenio_fosforo()
+        cls.df, description = load_fatorial_dic_nitrogenio_fosforo()
         factors = description.get("factors")
         response = description.get("response")
-        self.model = FactorialCRD(data=self.df, response=response, factors=factors)
+        cls.model = FactorialCRD(data=cls.df, response=response, factors=factors)
 
     def test_anova_returns_dataframe(self):
         # Act
         result = self.model.run_anova()
-        f_calc_axb = float(result.loc["C(f1):C(f2)", "F"])
+        f_calc_axb = float(result.at["C(f1):C(f2)", "F"])
         f_calc_axb_esperado = 4.95
         # Assert
         self.assertIsInstance(result, pd.DataFrame)
@@ -61,3 +63,19 @@ class TestFactorialCRD(unittest.TestCase):
         self.assertIn("normality (Shapiro-Wilk)", result)
         self.assertIn("homoscedasticity (Levene)", result)
 
+    def test_balanced_anova_matches_statsmodels(self):
+        # A ANOVA em forma fechada (delineamento balanceado) coincide com o anova_lm
+        from statsmodels.stats.anova import anova_lm
+
+        result = self.model.run_anova().drop(columns="Signif")
+        expected = anova_lm(self.model._fitted_model(), typ=2)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_unbalanced_anova_falls_back_to_statsmodels(self):
+        # Com parcelas perdidas a tabela vem do anova_lm
+        df = self.df.drop(index=[0])
+        model = FactorialCRD(data=df, response=self.model.response, factors=self.model.factors)
+
+        self.assertIsNone(model._fast_anova())
+        self.assertIn("C(f1):C(f2)", model.run_anova().index)
@@ -4,30 +4,34 @@ import numpy as np
 from expdespy.models import FactorialCRD
 
 
+# Fatorial 2³ com 2 repetições → 8 combinações * 2 = 16 linhas
+# (np.indices enumera as combinações com f3 variando mais rápido)
+_DESIGN = pd.DataFrame(
+    np.tile(np.indices((2, 2, 2)).reshape(3, -1).T, (2, 1)),  # duas repetições
+    columns=["f1", "f2", "f3"],
+)
+
+# Produtividade simulada com efeito dos fatores, calculada uma vez na
+# importação; RandomState(42) reproduz o np.random.seed(42) sem alterar
+# o estado global do NumPy
+_PRODUTIVIDADE = (
+    10  # valor base
+    + 2 * _DESIGN["f1"]
+    + 1.5 * _DESIGN["f2"]
+    + 1 * _DESIGN["f3"]
+    + 0.5 * _DESIGN["f1"] * _DESIGN["f2"]
+    + np.random.RandomState(42).normal(0, 0.5, len(_DESIGN))  # ruído
+).to_numpy()
+
+
 class TestFatorialTriploDIC(unittest.TestCase):
 
-    def setUp(self):
-        # Fatorial 2³ com 2 repetições → 8 combinações * 2 = 16 linhas
-        levels = [0, 1]
-        base_design = [(a, b, c) for a in levels for b in levels for c in levels]
-        design = base_design * 2  # duas repetições
-        df = pd.DataFrame(design, columns=["f1", "f2", "f3"])
-
-        # Simula produtividade com efeito dos fatores
-        np.random.seed(42)
-        df["produtividade"] = (
-            10  # valor base
-            + 2 * df["f1"]
-            + 1.5 * df["f2"]
-            + 1 * df["f3"]
-            + 0.5 * df["f1"] * df["f2"]
-            + np.random.normal(0, 0.5, len(df))  # ruído
-        )
-
-        self.df = df
-        self.factors = ["f1", "f2", "f3"]
-        self.response = "produtividade"
-        self.model = FactorialCRD(data=self.df, response=self.response, factors=self.factors)
+    @classmethod
+    def setUpClass(cls):
+        cls.df = _DESIGN.assign(produtividade=_PRODUTIVIDADE)
+        cls.factors = ["f1", "f2", "f3"]
+        cls.response = "produtividade"
+        cls.model = FactorialCRD(data=cls.df, response=cls.response, factors=cls.factors)
 
     def test_anova_returns_dataframe(self):
         result = self.model.run_anova()
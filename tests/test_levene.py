@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import scipy.stats as stats
+from expdespy.stats import levene_fast
+
+
+class TestLeveneFast(unittest.TestCase):
+
+    def test_matches_scipy(self):
+        # Grupos de tamanhos diferentes, pares e ímpares, fora de ordem
+        rng = np.random.default_rng(0)
+        sizes = [3, 4, 7, 10]
+        groups = [rng.normal(0, sd, size=n) for sd, n in zip([1, 2, 0.5, 3], sizes)]
+        values = np.concatenate(groups)
+        codes = np.repeat(np.arange(len(sizes)), sizes)
+        perm = rng.permutation(values.size)
+
+        expected = stats.levene(*groups)
+        result = levene_fast(values[perm], codes[perm])
+
+        self.assertAlmostEqual(result.statistic, expected.statistic, places=10)
+        self.assertAlmostEqual(result.pvalue, expected.pvalue, places=10)
+
+    def test_ignores_missing_labels(self):
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 7.0, 100.0])
+        codes = np.array([0, 0, 0, 1, 1, 1, -1])
+        expected = stats.levene([1.0, 2.0, 3.0], [4.0, 5.0, 7.0])
+        self.assertAlmostEqual(levene_fast(values, codes).pvalue, expected.pvalue)
+
+    def test_single_group_raises(self):
+        with self.assertRaises(ValueError):
+            levene_fast(np.array([1.0, 2.0, 3.0]), np.array([0, 0, 0]))
+
+    def test_pairs_without_spread_match_scipy(self):
+        # Grupos de duas observações: desvios idênticos, como no scipy (inf / nan)
+        result = levene_fast(np.array([1.0, 2.0, 3.0, 5.0, 1.0, 4.0]), np.array([0, 0, 1, 1, 2, 2]))
+        self.assertEqual(result.statistic, np.inf)
+        self.assertEqual(result.pvalue, 0.0)
+
+        result = levene_fast(np.array([1.0, 2.0, 3.0, 4.0]), np.array([0, 0, 1, 1]))
+        self.assertTrue(np.isnan(result.pvalue))
+
+    def test_many_cells_with_gaps_and_missing_values(self):
+        # Muitas caselas (como parcela x subparcela), códigos sem uso e respostas ausentes
+        rng = np.random.default_rng(1)
+        codes = rng.integers(0, 60, size=600)
+        codes[codes == 13] = 14
+        values = rng.normal(0, 1 + codes % 3, size=codes.size)
+        values[::37] = np.nan
+
+        keep = ~np.isnan(values)
+        groups = [values[keep & (codes == c)] for c in np.unique(codes)]
+        expected = stats.levene(*groups)
+        result = levene_fast(values, codes)
+
+        self.assertAlmostEqual(result.statistic, expected.statistic, places=10)
+        self.assertAlmostEqual(result.pvalue, expected.pvalue, places=10)
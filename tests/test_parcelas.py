@@ -1,17 +1,22 @@
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
 
 from expdespy.datasets import load_splitplot_dic, load_splitplot_dbc
 from expdespy.models import SplitPlotCRD, SplitPlotRCBD
 
 class TestSplitPlotCRD(unittest.TestCase):
-    def setUp(self):
-        self.df, self.desc = load_splitplot_dic()
-        self.model = SplitPlotCRD(
-            data=self.df,
-            response=self.desc['response'],
-            main_plot=self.desc['main_plot'],
-            subplot=self.desc['subplot']
+    @classmethod
+    def setUpClass(cls):
+        # Dados e modelo montados uma vez por classe: os testes só leem o
+        # modelo, que guarda o próprio ajuste entre as chamadas
+        cls.df, cls.desc = load_splitplot_dic()
+        cls.model = SplitPlotCRD(
+            data=cls.df,
+            response=cls.desc['response'],
+            main_plot=cls.desc['main_plot'],
+            subplot=cls.desc['subplot']
         )
 
     def test_anova_returns_dataframe(self):
@@ -25,17 +30,63 @@ class TestSplitPlotCRD(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertIn("normality (Shapiro-Wilk)", result)
         self.assertIn("homoscedasticity (Levene)", result)
-        
+
+    def test_check_assumptions_after_anova_reuses_residuals(self):
+        # Depois da ANOVA os pressupostos não reajustam o modelo: os resíduos
+        # saem de uma solução QR, guardada para as chamadas seguintes
+        self.model.run_anova()
+        with mock.patch("statsmodels.formula.api.ols") as ols:
+            self.model.check_assumptions(print_conclusions=False)
+            residuals = self.model._residuals()
+            with mock.patch("expdespy.models.base._fit_anova_fast") as fit:
+                self.model.check_assumptions(print_conclusions=False)
+        ols.assert_not_called()
+        fit.assert_not_called()
+        self.assertIs(self.model._residuals(), residuals)
+
+    def test_levene_matches_scipy(self):
+        # O Levene vetorizado coincide com o scipy sobre os grupos do groupby
+        from scipy.stats import levene
+
+        groups = [
+            g[self.desc['response']].values
+            for _, g in self.df.groupby([self.desc['main_plot'], self.desc['subplot']])
+        ]
+        result = self.model.check_assumptions(print_conclusions=False)
+        self.assertAlmostEqual(
+            result["homoscedasticity (Levene)"]["p-value"], levene(*groups).pvalue, places=10
+        )
+
+    def test_unfolding_anova_matches_statsmodels(self):
+        # A ANOVA de cada desdobramento coincide com o ajuste via fórmula
+        import statsmodels.formula.api as smf
+        from statsmodels.stats.anova import anova_lm
+
+        result = self.model.unfold_interactions(print_results=False)
+        self.assertTrue(result["interactions"])
+        for level, subset in self.df.groupby(self.desc['main_plot']):
+            key = f"{self.desc['subplot']} within {self.desc['main_plot']}={level}"
+            expected = anova_lm(
+                smf.ols(f"{self.desc['response']} ~ C({self.desc['subplot']})", data=subset).fit(),
+                typ=2,
+            )
+            pd.testing.assert_frame_equal(
+                result["interactions"][key]["anova"], expected, check_exact=False, rtol=1e-8
+            )
+
 
 class TestSplitPlotRCBD(unittest.TestCase):
-    def setUp(self):
-        self.df, self.desc = load_splitplot_dbc()
-        self.model = SplitPlotRCBD(
-            data=self.df,
-            response=self.desc['response'],
-            block=self.desc['block'],
-            main_plot=self.desc['main_plot'],
-            subplot=self.desc['subplot']
+    @classmethod
+    def setUpClass(cls):
+        # Dados e modelo montados uma vez por classe: os testes só leem o
+        # modelo, que guarda o próprio ajuste entre as chamadas
+        cls.df, cls.desc = load_splitplot_dbc()
+        cls.model = SplitPlotRCBD(
+            data=cls.df,
+            response=cls.desc['response'],
+            block=cls.desc['block'],
+            main_plot=cls.desc['main_plot'],
+            subplot=cls.desc['subplot']
         )
 
     def test_anova_returns_dataframe(self):
@@ -48,4 +99,90 @@ class TestSplitPlotRCBD(unittest.TestCase):
         result = self.model.check_assumptions(alpha=0.05, print_conclusions=False)
         self.assertIsInstance(result, dict)
         self.assertIn("normality (Shapiro-Wilk)", result)
-        self.assertIn("homoscedasticity (Levene)", result)
\ No newline at end of file
+        self.assertIn("homoscedasticity (Levene)", result)
+
+    def test_design_skips_formula_parsing(self):
+        # A matriz de delineamento é montada a partir dos códigos dos fatores
+        with mock.patch("statsmodels.formula.api.ols") as ols:
+            self.model.run_anova()
+            residuals = self.model._residuals()
+        ols.assert_not_called()
+
+        np.testing.assert_allclose(residuals, self.model._fitted_model().resid.to_numpy(), atol=1e-10)
+
+    def test_anova_matches_statsmodels_unbalanced(self):
+        # Com parcelas perdidas a ANOVA via NumPy coincide com o anova_lm
+        from statsmodels.stats.anova import anova_lm
+
+        df = self.df.drop(index=[0, 7])
+        model = SplitPlotRCBD(
+            data=df,
+            response=self.desc['response'],
+            block=self.desc['block'],
+            main_plot=self.desc['main_plot'],
+            subplot=self.desc['subplot']
+        )
+
+        result = model.run_anova().drop(columns="Signif")
+        expected = anova_lm(model._fitted_model(), typ=2)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_anova_qr_downdate_matches_statsmodels(self):
+        # Sem o atalho de Cholesky, os modelos reduzidos saem da QR do modelo completo
+        from statsmodels.stats.anova import anova_lm
+
+        df = self.df.drop(index=[0, 7])
+        model = SplitPlotRCBD(
+            data=df,
+            response=self.desc['response'],
+            block=self.desc['block'],
+            main_plot=self.desc['main_plot'],
+            subplot=self.desc['subplot']
+        )
+
+        with mock.patch("expdespy.models._fast_ols._rss_cholesky", return_value=None):
+            result = model.run_anova().drop(columns="Signif")
+        expected = anova_lm(model._fitted_model(), typ=2)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_anova_with_empty_cell_falls_back_to_statsmodels(self):
+        # Com uma combinação sem observações a matriz perde posto e o anova_lm é usado
+        from statsmodels.stats.anova import anova_lm
+
+        main_plot, subplot = self.desc['main_plot'], self.desc['subplot']
+        first = self.df.iloc[0]
+        df = self.df[~((self.df[main_plot] == first[main_plot]) & (self.df[subplot] == first[subplot]))]
+        model = SplitPlotRCBD(
+            data=df,
+            response=self.desc['response'],
+            block=self.desc['block'],
+            main_plot=main_plot,
+            subplot=subplot
+        )
+
+        result = model.run_anova().drop(columns="Signif")
+        expected = anova_lm(model._fitted_model(), typ=2)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+
+    def test_anova_with_missing_response_matches_statsmodels(self):
+        # Parcela com resposta ausente: a linha sai do ajuste, como no anova_lm
+        from statsmodels.stats.anova import anova_lm
+
+        df = self.df.copy()
+        df.loc[3, self.desc['response']] = np.nan
+        model = SplitPlotRCBD(
+            data=df,
+            response=self.desc['response'],
+            block=self.desc['block'],
+            main_plot=self.desc['main_plot'],
+            subplot=self.desc['subplot']
+        )
+
+        result = model.run_anova().drop(columns="Signif")
+        expected = anova_lm(model._fitted_model(), typ=2)
+
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-8)
+        self.assertEqual(len(model._residuals()), len(df) - 1)
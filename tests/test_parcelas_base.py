@@ -1,6 +1,9 @@
+import io
 import unittest
+from unittest import mock
 import pandas as pd
 from expdespy.models.splitplot_base import SplitPlotDesign
+from expdespy.posthoc import PostHocLoader
 
 class DummySplitPlotDesign(SplitPlotDesign):
     """Implementa _get_formula para testes."""
@@ -48,6 +51,13 @@ class TestSplitPlotDesign(unittest.TestCase):
         model = DummySplitPlotDesign(df, "f1", "f1", "f1")
         self.assertIn("f1", model.data.columns)
 
+    def test_factors_converted_to_categorical(self):
+        # Parcela e subparcela viram Categorical sem alterar o DataFrame original
+        for col in ("main", "sub"):
+            self.assertIsInstance(self.model.data[col].dtype, pd.CategoricalDtype)
+            self.assertNotIsInstance(self.data[col].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(self.model.data["y"].dtype, pd.CategoricalDtype)
+
     def test_check_assumptions_returns_dict(self):
         result = self.model.check_assumptions(print_conclusions=False)
         self.assertIsInstance(result, dict)
@@ -59,6 +69,19 @@ class TestSplitPlotDesign(unittest.TestCase):
         self.assertIsInstance(result, pd.DataFrame)
         self.assertIn("Signif", result.columns)
 
+    def test_fitted_model_shared_across_methods(self):
+        # check_assumptions, run_anova e unfold_interactions usam o mesmo ajuste
+        self.model_interaction.check_assumptions(print_conclusions=False)
+        model = self.model_interaction._fitted_model()
+        expected = self.model_interaction.run_anova()
+
+        with mock.patch("statsmodels.stats.anova.anova_lm") as anova_lm:
+            results = self.model_interaction.unfold_interactions(print_results=False)
+
+        anova_lm.assert_not_called()
+        self.assertIs(self.model_interaction._fitted_model(), model)
+        pd.testing.assert_frame_equal(results["anova"], expected)
+
     def test_unfold_interactions_without_significant(self):
         results = self.model.unfold_interactions(print_results=False)
         self.assertIn("anova", results)
@@ -74,6 +97,31 @@ class TestSplitPlotDesign(unittest.TestCase):
         # Apenas validar que roda sem erro
         self.model.display_unfolded_interactions(results)
 
+    def test_unfold_interactions_reuses_posthoc_letters(self):
+        # Uma segunda chamada reaproveita as letras já calculadas
+        first = self.model_interaction.unfold_interactions(print_results=False)
+        self.assertTrue(first["main_effects"] or first["interactions"])
+
+        with mock.patch.object(PostHocLoader, "create") as create:
+            second = self.model_interaction.unfold_interactions(print_results=False)
+
+        create.assert_not_called()
+        for factor, letters in first["main_effects"].items():
+            pd.testing.assert_frame_equal(second["main_effects"][factor], letters)
+        for key, blocks in first["interactions"].items():
+            pd.testing.assert_frame_equal(second["interactions"][key]["posthoc"], blocks["posthoc"])
+
+    def test_display_writes_once(self):
+        # A saída é acumulada e enviada ao stdout numa única escrita
+        results = self.model_interaction.unfold_interactions(print_results=False)
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                mock.patch.object(stdout, "write", wraps=stdout.write) as write:
+            self.model_interaction.display_unfolded_interactions(results)
+
+        self.assertEqual(write.call_count, 1)
+        self.assertIn("MAIN ANOVA", stdout.getvalue())
+        self.assertIn("MAIN EFFECTS", stdout.getvalue())
+
 class TestSplitPlotDesignExtra(unittest.TestCase):
     def setUp(self):
         self.data = pd.DataFrame({
@@ -91,6 +139,12 @@ class TestSplitPlotDesignExtra(unittest.TestCase):
     def test_safe_factor_reserved_name(self):
         self.assertIn("C_", self.model_reserved.data.columns)
 
+    def test_caller_frame_not_modified(self):
+        # O DataFrame do chamador não é copiado nem alterado pelo renome/conversão
+        data = self.data.copy()
+        DummySplitPlotDesign(data=data, response="y", main_plot="C", subplot="sub")
+        pd.testing.assert_frame_equal(data, self.data)
+
     def test_check_assumptions_prints(self):
         result = self.model_reserved.check_assumptions(print_conclusions=True)
         self.assertIn("normality (Shapiro-Wilk)", result)
@@ -1,4 +1,7 @@
+import gc
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
 import statsmodels.formula.api as smf
 from expdespy.regressao import diagnostics as diag
@@ -6,7 +9,17 @@ from matplotlib import pyplot as plt
 
 class TestDiagnostics(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Uma única figura para a classe, limpa antes de cada teste
+        cls.fig, cls.ax = plt.subplots()
+
+    @classmethod
+    def tearDownClass(cls):
+        plt.close(cls.fig)
+
     def setUp(self):
+        self.ax.cla()
         # Arrange: cria dados artificiais para regressão simples
         self.df = pd.DataFrame({
             "y": [4, 6, 7, 9, 10, 13, 15, 16, 18, 20],
@@ -16,20 +29,76 @@ class TestDiagnostics(unittest.TestCase):
 
     def test_plot_residuals_vs_fitted(self):
         # Act + Assert: apenas verifica se roda sem erro
-        ax = diag.plot_residuals_vs_fitted(self.model)
-        self.assertIsInstance(ax, plt.Axes)
+        ax = diag.plot_residuals_vs_fitted(self.model, ax=self.ax)
+        self.assertIs(ax, self.ax)
 
     def test_qq_plot_residuals(self):
-        ax = diag.qq_plot_residuals(self.model)
-        self.assertIsInstance(ax, plt.Axes)
+        ax = diag.qq_plot_residuals(self.model, ax=self.ax)
+        self.assertIs(ax, self.ax)
 
     def test_plot_residual_hist(self):
-        ax = diag.plot_residual_hist(self.model)
-        self.assertIsInstance(ax, plt.Axes)
+        ax = diag.plot_residual_hist(self.model, ax=self.ax)
+        self.assertIs(ax, self.ax)
+
+    def test_plots_create_axes_when_none(self):
+        # Sem ax, cada gráfico cria a própria figura
+        for plot in (diag.plot_residuals_vs_fitted, diag.qq_plot_residuals,
+                     diag.plot_residual_hist, diag.cooks_distance_plot):
+            ax = plot(self.model)
+            self.assertIsInstance(ax, plt.Axes)
+            self.assertIsNot(ax, self.ax)
+            plt.close(ax.figure)
+
+    def test_plot_residual_hist_counts_all_residuals(self):
+        # Resíduos em float32: todas as observações nas barras e a curva KDE desenhada
+        ax = diag.plot_residual_hist(self.model, ax=self.ax)
+        self.assertEqual(sum(p.get_height() for p in ax.patches), len(self.df))
+        self.assertEqual(len(ax.lines), 1)
+        self.assertEqual(ax.get_xlabel(), "Residuals")
+
+    def test_plot_residual_hist_fft_kde_large_sample(self):
+        # Com muitos resíduos a KDE via FFT coincide com a curva do seaborn
+        import statsmodels.api as sm
+        import seaborn as sns
+
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=12000)
+        model = sm.OLS(x + rng.standard_t(4, size=12000), sm.add_constant(x)).fit()
+
+        ax = diag.plot_residual_hist(model, ax=self.ax)
+        fig, reference = plt.subplots()
+        sns.histplot(np.asarray(model.resid, dtype=np.float32), kde=True, ax=reference)
+
+        self.assertEqual(len(ax.lines), 1)
+        np.testing.assert_allclose(ax.lines[0].get_xdata(), reference.lines[0].get_xdata(), rtol=1e-5)
+        y, expected = ax.lines[0].get_ydata(), reference.lines[0].get_ydata()
+        self.assertLess(np.max(np.abs(y - expected)), 1e-3 * expected.max())
+        plt.close(fig)
 
     def test_cooks_distance_plot(self):
-        ax = diag.cooks_distance_plot(self.model)
-        self.assertIsInstance(ax, plt.Axes)
+        ax = diag.cooks_distance_plot(self.model, ax=self.ax)
+        self.assertIs(ax, self.ax)
+
+    def test_cooks_distance_plot_single_collection(self):
+        # Todas as hastes num único LineCollection, com a altura de cada observação
+        ax = diag.cooks_distance_plot(self.model, ax=self.ax)
+        self.assertEqual(len(ax.collections), 1)
+        segments = ax.collections[0].get_segments()
+        self.assertEqual(len(segments), len(self.df))
+        np.testing.assert_allclose([seg[1, 1] for seg in segments], diag._cooks_distance(self.model))
+
+    def test_diagnostics_panel(self):
+        # Uma figura 2x2 com os quatro gráficos, que compartilham as quantidades guardadas do modelo
+        with mock.patch("expdespy.regressao.diagnostics.plt.subplots", wraps=plt.subplots) as subplots:
+            fig = diag.diagnostics_panel(self.model)
+        subplots.assert_called_once()
+        self.assertIsInstance(fig, plt.Figure)
+        self.assertEqual(
+            [ax.get_title() for ax in fig.axes],
+            ["Residuals vs Fitted", "QQ Plot of Residuals", "Residuals Distribution", "Cook's Distance Plot"],
+        )
+        self.assertEqual(set(diag._diagnostics_cache[self.model]), {"resid", "resid_array", "fitted", "cooks"})
+        plt.close(fig)
 
     def test_shapiro_test_returns_dict(self):
         result = diag.shapiro_test(self.model)
@@ -37,6 +106,30 @@ class TestDiagnostics(unittest.TestCase):
         self.assertIn("statistic", result)
         self.assertIn("p_value", result)
 
+    def test_shapiro_test_matches_scipy(self):
+        # Resíduos centrados na mediana: mesmo W e p-valor do scipy
+        from scipy import stats
+
+        expected = stats.shapiro(self.model.resid)
+        result = diag.shapiro_test(self.model)
+        self.assertAlmostEqual(result["statistic"], expected.statistic, places=6)
+        self.assertAlmostEqual(result["p_value"], expected.pvalue, places=6)
+        self.assertEqual(result["n_used"], len(self.df))
+        self.assertFalse(result["subsampled"])
+
+    def test_shapiro_test_subsamples_large_models(self):
+        # Acima de 5000 resíduos o teste usa uma subamostra fixa de 5000
+        import statsmodels.api as sm
+
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=6000)
+        model = sm.OLS(x + rng.normal(size=6000), sm.add_constant(x)).fit()
+
+        result = diag.shapiro_test(model)
+        self.assertEqual(result["n_used"], 5000)
+        self.assertTrue(result["subsampled"])
+        self.assertEqual(result, diag.shapiro_test(model))
+
     def test_breusch_pagan_test_returns_dict(self):
         result = diag.breusch_pagan_test(self.model)
         self.assertIsInstance(result, dict)
@@ -45,8 +138,64 @@ class TestDiagnostics(unittest.TestCase):
         self.assertIn("f_stat", result)
         self.assertIn("f_pvalue", result)
 
+    def test_breusch_pagan_matches_statsmodels(self):
+        # A regressão auxiliar reaproveita a pseudo-inversa do ajuste: mesmos valores do het_breuschpagan
+        from statsmodels.stats.diagnostic import het_breuschpagan
+
+        expected = het_breuschpagan(self.model.resid, self.model.model.exog)
+        with mock.patch("expdespy.regressao.diagnostics.het_breuschpagan") as fallback:
+            result = diag.breusch_pagan_test(self.model)
+        fallback.assert_not_called()
+        np.testing.assert_allclose(
+            [result["lm_stat"], result["lm_pvalue"], result["f_stat"], result["f_pvalue"]],
+            expected, rtol=1e-10,
+        )
+
+    def test_breusch_pagan_requires_constant(self):
+        # Sem coluna constante o erro do statsmodels é mantido
+        import statsmodels.api as sm
+
+        model = sm.OLS(self.df["y"], self.df[["x"]]).fit()
+        with self.assertRaises(ValueError):
+            diag.breusch_pagan_test(model)
+
     def test_durbin_watson_test_returns_float(self):
         result = diag.durbin_watson_test(self.model)
         self.assertIsInstance(result, float)
         self.assertGreaterEqual(result, 0)
         self.assertLessEqual(result, 4)
+
+    def test_cooks_distance_closed_form(self):
+        # A distância de Cook sai da forma fechada (sem OLSInfluence) e fica guardada por modelo
+        expected = self.model.get_influence().cooks_distance[0]
+        with mock.patch.object(self.model, "get_influence") as get_influence:
+            diag.cooks_distance_plot(self.model, ax=self.ax)
+            ax = diag.cooks_distance_plot(self.model, ax=self.ax)
+        get_influence.assert_not_called()
+        np.testing.assert_allclose(diag._cooks_distance(self.model), expected, rtol=1e-10)
+        self.assertIsInstance(ax, plt.Axes)
+
+    def test_residual_array_shared(self):
+        # Um único buffer float64 contíguo e somente leitura, reaproveitado pelos testes
+        diag.shapiro_test(self.model)
+        residuals = diag._resid_array(self.model)
+        diag.durbin_watson_test(self.model)
+        diag.breusch_pagan_test(self.model)
+
+        self.assertIs(diag._resid_array(self.model), residuals)
+        self.assertEqual(residuals.dtype, np.float64)
+        self.assertTrue(residuals.flags.c_contiguous)
+        self.assertFalse(residuals.flags.writeable)
+        np.testing.assert_array_equal(residuals, self.model.resid.to_numpy())
+
+    def test_cache_released_with_model(self):
+        # O cache não mantém o modelo vivo
+        model = smf.ols("y ~ x", data=self.df).fit()
+        diag.cooks_distance_plot(model, ax=self.ax)
+        diag.shapiro_test(model)
+        self.assertIn(model, diag._diagnostics_cache)
+
+        before = len(diag._diagnostics_cache)
+        del model
+        gc.collect()
+        self.assertEqual(len(diag._diagnostics_cache), before - 1)
@@ -8,36 +8,47 @@ from expdespy.regressao import PolynomialRegression
 
 class TestPolynomialRegression(unittest.TestCase):
 
-    def setUp(self):
-        # Dados artificiais para um padrão quadrático
+    @classmethod
+    def setUpClass(cls):
+        # Dados artificiais para um padrão quadrático, montados uma vez por classe
         np.random.seed(42)
-        self.df = pd.DataFrame({
+        cls.df = pd.DataFrame({
             "dose": np.linspace(0, 5, 6),
             "yield": [5, 7, 9, 15, 18, 20]
         })
+        # Ajuste de grau 2 compartilhado pelos testes que só leem o modelo
+        cls.fitted = PolynomialRegression(data=cls.df, response="yield", factor="dose")
+        cls.fitted.fit(degree=2)
+
+    def setUp(self):
+        # Modelo novo por teste (sem cópia dos dados) para os testes que reajustam
         self.poly = PolynomialRegression(
             data=self.df,
             response="yield",
             factor="dose"
         )
 
-    def test_fit_degree_2_returns_results(self):
-        # Act
-        results = self.poly.fit(degree=2)
+    def test_fit_degrees(self):
+        # Um subteste por grau, cada um com um modelo novo sobre os dados da classe
+        for degree in (1, 2):
+            with self.subTest(degree=degree):
+                poly = PolynomialRegression(data=self.df, response="yield", factor="dose")
 
-        # Assert
-        self.assertIsInstance(
-            results, sm.regression.linear_model.RegressionResultsWrapper
-        )
-        self.assertEqual(len(results.params), 3)  # β0, β1, β2
-        self.assertIn("dose^2", self.poly.data.columns)
+                # Act
+                results = poly.fit(degree=degree)
 
-    def test_anova_returns_dataframe(self):
-        # Arrange
-        self.poly.fit(degree=2)
+                # Assert
+                self.assertIsInstance(
+                    results, sm.regression.linear_model.RegressionResultsWrapper
+                )
+                self.assertEqual(len(results.params), degree + 1)  # β0, ..., β_grau
+                # Só as potências acima de 1 viram colunas novas
+                extra_cols = [c for c in poly.data.columns if "^" in c]
+                self.assertEqual(extra_cols, [f"dose^{d}" for d in range(2, degree + 1)])
 
+    def test_anova_returns_dataframe(self):
         # Act
-        anova_df = self.poly.anova()
+        anova_df = self.fitted.anova()
 
         # Assert
         self.assertIsInstance(anova_df, pd.DataFrame)
@@ -48,26 +59,67 @@ class TestPolynomialRegression(unittest.TestCase):
             self.poly.anova()
 
     def test_plot_returns_axes(self):
-        # Arrange
-        self.poly.fit(degree=2)
-        fig, ax = plt.subplots()
+        # Arrange: Figure avulsa, fora do registro de figuras do pyplot
+        from matplotlib.figure import Figure
+
+        ax = Figure().add_subplot()
 
         # Act
-        returned_ax = self.poly.plot(ax=ax)
+        returned_ax = self.fitted.plot(ax=ax)
 
         # Assert
         self.assertIs(returned_ax, ax)
         self.assertEqual(len(ax.lines), 1)   # Linha do ajuste
         self.assertEqual(len(ax.collections), 1)  # Pontos scatter
 
-    def test_fit_degree_1_no_extra_columns(self):
-        # Act
-        self.poly.fit(degree=1)
-
-        # Assert
-        extra_cols = [c for c in self.poly.data.columns if "^" in c]
-        self.assertEqual(len(extra_cols), 0)
-
     def test_fit_with_invalid_degree(self):
         with self.assertRaises(ValueError):
             self.poly.fit(degree=0)  # não permitido, ajuste seu método se quiser suportar
+
+    def test_anova_matches_formula_fit(self):
+        # A ANOVA sequencial sem fórmula coincide com o anova_lm do ajuste via patsy
+        import statsmodels.formula.api as smf
+
+        data = self.df.assign(dose2=self.df["dose"] ** 2)
+        expected = sm.stats.anova_lm(smf.ols("Q('yield') ~ dose + dose2", data=data).fit())
+        expected.index = ["Q('dose')", "Q('dose^2')", "Residual"]
+
+        pd.testing.assert_frame_equal(self.fitted.anova(), expected, check_exact=False, rtol=1e-8)
+
+    def test_refit_after_data_change(self):
+        # Cada ajuste monta as potências a partir dos dados atuais, inclusive
+        # depois de uma edição no próprio DataFrame
+        self.poly.fit(degree=2)
+        self.poly.data["dose"] *= 10
+        results = self.poly.fit(degree=2)
+
+        scaled = self.df.assign(dose=self.df["dose"] * 10)
+        expected = sm.OLS(scaled["yield"], np.vander(scaled["dose"], N=3, increasing=True)).fit()
+        np.testing.assert_allclose(results.params.to_numpy(), expected.params.to_numpy())
+
+    def test_plot_curve_matches_predict(self):
+        # A curva avaliada por Horner coincide com o predict do modelo em toda a grade
+        results = self.poly.fit(degree=3)
+        ax = self.poly.plot()
+        self.addCleanup(plt.close, ax.figure)
+        x_vals, y_vals = ax.lines[0].get_data()
+        expected = results.predict(np.vander(x_vals, N=4, increasing=True))
+        np.testing.assert_allclose(y_vals, expected, rtol=1e-10)
+
+    def test_fit_does_not_modify_input(self):
+        # Sem cópia na criação; as colunas de potência vão para um novo DataFrame
+        self.assertIs(self.poly.data, self.df)
+        self.poly.fit(degree=3)
+        self.assertEqual(list(self.df.columns), ["dose", "yield"])
+        self.assertIn("dose^3", self.poly.data.columns)
+
+    def test_predict_matches_results(self):
+        # A avaliação por Horner coincide com o predict do statsmodels
+        results = self.poly.fit(degree=3)
+        x = np.linspace(-1, 6, 50)
+        expected = results.predict(np.vander(x, N=4, increasing=True))
+        np.testing.assert_allclose(self.poly.predict(x), expected, rtol=1e-10)
+
+    def test_predict_raises_if_not_fitted(self):
+        with self.assertRaises(ValueError):
+            self.poly.predict([1.0, 2.0])
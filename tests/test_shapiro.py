@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+import scipy.stats as stats
+from expdespy.stats import shapiro_fast
+from expdespy.stats._shapiro import _sw_coeffs
+
+
+class TestShapiroFast(unittest.TestCase):
+
+    def test_matches_scipy(self):
+        # Compara com scipy para amostras pequenas (n <= 11) e grandes
+        rng = np.random.default_rng(0)
+        for n in [3, 4, 5, 6, 11, 12, 20, 100]:
+            x = rng.exponential(size=n)
+            expected = stats.shapiro(x)
+            result = shapiro_fast(x)
+            self.assertAlmostEqual(result.statistic, expected.statistic, places=7)
+            self.assertAlmostEqual(result.pvalue, expected.pvalue, places=5)
+
+    def test_presorted_with_cached_coeffs(self):
+        # Entrada já ordenada com coeficientes explícitos deve dar o mesmo resultado
+        x = np.random.default_rng(1).normal(size=30)
+        expected = shapiro_fast(x)
+        result = shapiro_fast(np.sort(x), coeffs=_sw_coeffs(30), presorted=True)
+        self.assertEqual(result, expected)
+
+    def test_coeffs_are_cached(self):
+        self.assertIs(_sw_coeffs(25), _sw_coeffs(25))
+
+    def test_too_few_observations_raises(self):
+        with self.assertRaises(ValueError):
+            shapiro_fast(np.array([1.0, 2.0]))
@@ -1,6 +1,5 @@
 import unittest
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from expdespy.datasets.dic_milho import load_dic_milho
 from expdespy.posthoc.t_test import PairwiseTTest
@@ -8,8 +7,14 @@ from expdespy.posthoc.t_test import PairwiseTTest
 
 class TestPairwiseTTest(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Dados carregados uma vez por classe; o teste não altera o DataFrame
+        # recebido, então os testes o compartilham sem cópia
+        cls.df, _ = load_dic_milho()
+
     def setUp(self):
-        self.df, _ = load_dic_milho()
+        # Um teste novo por método: vários testes mexem no cache e nos atributos
         self.ttest = PairwiseTTest(
             self.df, values_column='produtividade', treatments_column='variedade')
 
@@ -25,8 +30,65 @@ class TestPairwiseTTest(unittest.TestCase):
         self.assertIsInstance(cld, pd.DataFrame)
         self.assertIn('Letters', cld.columns)
 
+    def test_run_matches_scipy_ttest_ind(self):
+        # Os testes vetorizados coincidem com um ttest_ind por par (variância combinada e Welch)
+        from itertools import combinations
+        from scipy.stats import ttest_ind
+
+        for equal_var in (True, False):
+            result = PairwiseTTest(
+                self.df, values_column='produtividade', treatments_column='variedade',
+                equal_var=equal_var).run()
+            pairs = list(combinations(self.df['variedade'].unique(), 2))
+            self.assertEqual(list(zip(result['group1'], result['group2'])), pairs)
+            for (g1, g2), pval in zip(pairs, result['p-value']):
+                vals1 = self.df.loc[self.df['variedade'] == g1, 'produtividade']
+                vals2 = self.df.loc[self.df['variedade'] == g2, 'produtividade']
+                self.assertAlmostEqual(
+                    pval, ttest_ind(vals1, vals2, equal_var=equal_var).pvalue, places=10)
+
+    def test_run_with_missing_value(self):
+        # Como no ttest_ind, o NaN propaga para o p-valor; a diferença de médias ignora o NaN
+        df = self.df.copy()
+        df.loc[0, 'produtividade'] = float('nan')
+        g = df.loc[0, 'variedade']
+        result = PairwiseTTest(df, 'produtividade', 'variedade').run()
+
+        involved = (result['group1'] == g) | (result['group2'] == g)
+        self.assertTrue(result.loc[involved, 'p-value'].isna().all())
+        self.assertFalse(result.loc[~involved, 'p-value'].isna().any())
+        means = df.groupby('variedade')['produtividade'].mean()
+        row = result[involved].iloc[0]
+        self.assertAlmostEqual(row['meandiff'], means[row['group1']] - means[row['group2']])
+
+    def test_run_keeps_label_dtype(self):
+        # Rótulos numéricos ou categóricos mantêm o tipo dos valores nas colunas dos pares
+        df = self.df.assign(dose=pd.factorize(self.df['variedade'])[0] * 10)
+        result = PairwiseTTest(df, 'produtividade', 'dose').run()
+        self.assertEqual(result['group1'].dtype, df['dose'].dtype)
+
+        df['variedade'] = df['variedade'].astype('category')
+        result = PairwiseTTest(df, 'produtividade', 'variedade').run()
+        self.assertEqual(result['group1'].dtype, df['variedade'].cat.categories.dtype)
+
+    def test_run_in_small_pair_blocks(self):
+        # O cálculo dos p-valores em blocos de pares não altera o resultado
+        from unittest import mock
+        from expdespy.posthoc import _ttest_fast
+
+        for equal_var in (True, False):
+            test = PairwiseTTest(
+                self.df, values_column='produtividade', treatments_column='variedade',
+                equal_var=equal_var)
+            expected = test.run()
+            with mock.patch.object(_ttest_fast, '_PAIR_BLOCK', 4):
+                pd.testing.assert_frame_equal(test.run(), expected)
+
     def test_plot_runs(self):
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots()
+        self.addCleanup(plt.close, fig)
         try:
             self.ttest.plot_compact_letters_display(ax=ax)
         except Exception as e:
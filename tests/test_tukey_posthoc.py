@@ -1,15 +1,28 @@
 import unittest
+from unittest import mock
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from expdespy.datasets.dic_milho import load_dic_milho
+from expdespy.posthoc._tukey_fast import _q_critical
 from expdespy.posthoc.tukey_test import TukeyHSD
+from expdespy.utils.utils import assign_letters
 
 
 class TestTukeyHSD(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Dados carregados uma vez por classe; o teste não altera o DataFrame
+        # recebido, então os testes o compartilham sem cópia
+        cls.df, _ = load_dic_milho()
+        # Instância e letras calculadas uma vez para os testes que só as leem
+        cls.shared_tukey = TukeyHSD(
+            cls.df, values_column='produtividade', treatments_column='variedade')
+        cls.cld = cls.shared_tukey.run_compact_letters_display()
+
     def setUp(self):
-        self.df, _ = load_dic_milho()
+        # Um teste novo por método: vários testes mexem no cache e nos atributos
         self.tukey = TukeyHSD(
             self.df, values_column='produtividade', treatments_column='variedade')
 
@@ -20,31 +33,205 @@ class TestTukeyHSD(unittest.TestCase):
         self.assertIn('group2', result.columns)
         self.assertIn('p-adj', result.columns)
 
+    def test_run_matches_statsmodels_unbalanced(self):
+        # Remove parcelas para testar o caso Tukey-Kramer (n desiguais)
+        from statsmodels.stats.multicomp import pairwise_tukeyhsd
+
+        df = self.df.drop(index=[0, 1, 7])
+        result = TukeyHSD(df, 'produtividade', 'variedade').run()
+        expected = pairwise_tukeyhsd(df['produtividade'], df['variedade'].astype(str))
+
+        np.testing.assert_allclose(result['p-adj'], expected.pvalues, atol=1e-4)
+        np.testing.assert_allclose(result['meandiff'], expected.meandiffs, atol=1e-4)
+        np.testing.assert_allclose(result[['lower', 'upper']], expected.confint, atol=1e-4)
+        np.testing.assert_array_equal(result['reject'], expected.reject)
+
+    def test_run_skips_missing_treatment_labels(self):
+        # Linhas sem tratamento ficam de fora, como no statsmodels sobre as linhas rotuladas
+        from statsmodels.stats.multicomp import pairwise_tukeyhsd
+
+        df = self.df.astype({'variedade': object})
+        df.loc[[0, 5], 'variedade'] = np.nan
+        result = TukeyHSD(df, 'produtividade', 'variedade').run()
+        labeled = df.dropna(subset=['variedade'])
+        expected = pairwise_tukeyhsd(labeled['produtividade'], labeled['variedade'].astype(str))
+
+        np.testing.assert_allclose(result['p-adj'], expected.pvalues, atol=1e-4)
+        np.testing.assert_allclose(result['meandiff'], expected.meandiffs, atol=1e-4)
+
+    def test_tail_evaluated_once_per_distinct_statistic(self):
+        # Pares com a mesma estatística q compartilham uma única avaliação da cauda
+        from scipy.stats import studentized_range
+        from statsmodels.stats.multicomp import pairwise_tukeyhsd
+
+        df = pd.DataFrame({'g': np.repeat(['A', 'B', 'C', 'D'], 3),
+                           'y': np.repeat([10.0, 12.0, 14.0, 16.0], 3) + np.tile([-1.0, 0.0, 1.0], 4)})
+        with mock.patch("scipy.stats.studentized_range.sf",
+                        wraps=studentized_range.sf) as sf:
+            result = TukeyHSD(df, 'y', 'g').run()
+
+        self.assertEqual(len(sf.call_args.args[0]), 3)  # diferenças 2, 4 e 6
+        expected = pairwise_tukeyhsd(df['y'], df['g'])
+        np.testing.assert_allclose(result['p-adj'], expected.pvalues, atol=1e-4)
+
+    def test_critical_value_is_cached(self):
+        # O valor crítico da amplitude estudentizada é calculado uma única vez
+        self.tukey.run()
+        hits = _q_critical.cache_info().hits
+        TukeyHSD(self.df.copy(), 'produtividade', 'variedade').run()
+        self.assertEqual(_q_critical.cache_info().hits, hits + 1)
+
     def test_cld_returns_dataframe(self):
-        cld = self.tukey.run_compact_letters_display()
-        self.assertIsInstance(cld, pd.DataFrame)
-        self.assertIn('Letters', cld.columns)
+        self.assertIsInstance(self.cld, pd.DataFrame)
+        self.assertIn('Letters', self.cld.columns)
 
     def test_plot_runs(self):
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots()
+        self.addCleanup(plt.close, fig)
         try:
-            self.tukey.plot_compact_letters_display(ax=ax)
+            self.shared_tukey.plot_compact_letters_display(ax=ax)
         except Exception as e:
             self.fail(
                 f"Tukey plot_compact_letters_display() raised an exception: {e}")
 
     def test_cld_expected_letters(self):
-        cld = self.tukey.run_compact_letters_display()
         expected_letters = {
             'D': 'a',
             'B': 'ab',
             'C': 'b',
             'A': 'b'
         }
-        actual_letters = cld.set_index('variedade')['Letters'].to_dict()
+        actual_letters = self.cld.set_index('variedade')['Letters'].to_dict()
         for group, expected in expected_letters.items():
             self.assertEqual(
                 actual_letters[group],
                 expected,
                 msg=f"Letra para o grupo {group} esperada: {expected}, obtida: {actual_letters[group]}"
             )
+
+    def test_cld_orders_letters_by_precomputed_means(self):
+        # As médias do CLD definem a ordem das letras; os dados não são reagrupados
+        with mock.patch("expdespy.posthoc.base.assign_letters", wraps=assign_letters) as spy:
+            cld = self.tukey.run_compact_letters_display()
+
+        kwargs = spy.call_args.kwargs
+        self.assertIsNone(kwargs.get("data"))
+        self.assertEqual(kwargs["order"], cld['variedade'].tolist())
+
+    def test_cld_is_cached_until_settings_change(self):
+        # Chamadas repetidas reaproveitam o teste; mudar alpha ou os dados refaz o cálculo
+        with mock.patch.object(TukeyHSD, "run", autospec=True, side_effect=TukeyHSD.run) as run:
+            first = self.tukey.run_compact_letters_display()
+            first["Letters"] = "z"
+            second = self.tukey.run_compact_letters_display()
+            self.assertEqual(run.call_count, 1)
+            self.assertNotIn("z", second["Letters"].tolist())
+
+            self.tukey.alpha = 0.01
+            self.tukey.run_compact_letters_display()
+            self.assertEqual(run.call_count, 2)
+
+            self.tukey.data = self.df.drop(index=[0])
+            self.tukey.run_compact_letters_display()
+            self.assertEqual(run.call_count, 3)
+
+    def test_group_stats_match_groupby_and_are_cached(self):
+        # Médias e máximos saem de uma única passada, reaproveitada pelo CLD e pelo gráfico
+        expected = (
+            self.df.groupby('variedade')['produtividade']
+            .agg(['mean', 'max'])
+            .rename(columns={'mean': 'Mean', 'max': 'Max'})
+        )
+        stats = self.tukey._group_stats()
+        pd.testing.assert_frame_equal(stats, expected, check_index_type=False, check_dtype=False)
+        self.assertIs(self.tukey._group_stats(), stats)
+
+    def test_treatments_converted_to_categorical(self):
+        # Os tratamentos viram Categorical sem alterar o DataFrame original
+        df = self.df.astype({'variedade': str})
+        tukey = TukeyHSD(df, values_column='produtividade', treatments_column='variedade')
+        self.assertIsInstance(tukey.data['variedade'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(df['variedade'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(tukey.run(), self.tukey.run())
+
+    def test_treatment_codes_match_factorize(self):
+        # Os códigos do Categorical equivalem ao factorize ordenado, sem categorias não observadas
+        df = self.df.assign(
+            variedade=pd.Categorical(self.df['variedade'], categories=['Z', 'D', 'C', 'B', 'A']))
+        tukey = TukeyHSD(df.drop(index=[0]), 'produtividade', 'variedade')
+        codes, groups = tukey._treatment_codes()
+        expected_codes, expected_groups = pd.factorize(tukey.data['variedade'], sort=True)
+
+        np.testing.assert_array_equal(codes, expected_codes)
+        pd.testing.assert_index_equal(groups, pd.Index(expected_groups))
+
+    def test_plot_annotates_letters(self):
+        # O gráfico escreve uma letra por tratamento, sem colunas duplicadas no merge
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots()
+        self.tukey.plot_compact_letters_display(ax=ax)
+        cld = self.tukey.run_compact_letters_display()
+        self.assertEqual(sorted(t.get_text() for t in ax.texts), sorted(cld['Letters']))
+        plt.close(fig)
+
+    def test_plot_letters_placed_over_their_boxes(self):
+        # Cada letra fica na posição x da caixa do seu tratamento
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots()
+        self.tukey.plot_compact_letters_display(ax=ax)
+        letters = self.tukey.run_compact_letters_display().set_index('variedade')['Letters']
+        ticks = {label.get_text(): x for x, label in zip(ax.get_xticks(), ax.get_xticklabels())}
+        for text in ax.texts:
+            x = text.get_position()[0]
+            treatment = next(t for t, tick in ticks.items() if tick == x)
+            self.assertEqual(text.get_text(), letters[treatment])
+        plt.close(fig)
+
+    def test_plot_does_not_change_global_style(self):
+        # O estilo whitegrid vale só para o gráfico; os rcParams globais ficam intactos
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+
+        created = []
+        subplots = plt.subplots
+
+        def record(*args, **kwargs):
+            created.append(subplots(*args, **kwargs))
+            return created[-1]
+
+        before = dict(mpl.rcParams)
+        with mock.patch("matplotlib.pyplot.subplots", side_effect=record):
+            self.tukey.plot_compact_letters_display()
+        fig, ax = created[0]
+        self.assertEqual(dict(mpl.rcParams), before)
+        self.assertEqual(ax.get_facecolor(), mpl.colors.to_rgba("white"))
+        plt.close(fig)
+
+    def test_values_converted_once(self):
+        # A coluna de valores (inteira neste exemplo) vira um array float64 contíguo, reaproveitado
+        values = self.tukey._values()
+        self.assertEqual(values.dtype, np.float64)
+        self.assertTrue(values.flags['C_CONTIGUOUS'])
+        self.assertIs(self.tukey._values(), values)
+        np.testing.assert_array_equal(values, self.df['produtividade'].to_numpy(dtype=float))
+
+    def test_import_does_not_load_scipy_stats(self):
+        # scipy.stats só é carregado no primeiro teste de Tukey, não na importação do pacote
+        import os
+        import subprocess
+        import sys
+
+        code = "import sys, expdespy.posthoc; print('scipy.stats' in sys.modules)"
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+        self.assertEqual(out.stdout.strip(), "False", out.stderr)
+
+    def test_cld_tied_means_keep_treatment_order(self):
+        # Médias empatadas aparecem na ordem dos tratamentos (ordenação estável)
+        df = pd.DataFrame({'g': list('AABBCCDD'), 'y': [1, 2, 1, 2, 3, 4, 3, 4.0]})
+        cld = TukeyHSD(df, 'y', 'g').run_compact_letters_display()
+        self.assertEqual(cld['g'].tolist(), ['C', 'D', 'A', 'B'])
@@ -6,30 +6,35 @@ from expdespy import utils
 
 class TestUtils(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        # Montados uma vez por classe: get_summary e assign_letters não alteram
+        # os DataFrames recebidos, então os testes os compartilham sem cópia
+
         # Dataset para get_summary (mesmo número de linhas em todas as colunas)
-        self.df = pd.DataFrame({
+        cls.df = pd.DataFrame({
             "num": [1, 2, 2, 3, np.nan],
             "cat": ["A", "A", "B", "B", "B"],
             "many": [0, 1, 2, 3, 4]  # agora só 5 valores
         })
 
         # Dataset todo NaN
-        self.df_nan = pd.DataFrame({
+        cls.df_nan = pd.DataFrame({
             "col": [np.nan] * 5
         })
 
         # Dataset para assign_letters
-        self.df_posthoc = pd.DataFrame({
+        cls.df_posthoc = pd.DataFrame({
             "G1": ["A", "A", "B"],
             "G2": ["B", "C", "C"],
             "pval": [0.04, 0.2, 0.03]
         })
 
-        self.data_original = pd.DataFrame({
+        cls.data_original = pd.DataFrame({
             "grupo": ["A", "A", "B", "B", "C", "C"],
             "valor": [10, 12, 15, 16, 20, 19]
         })
+
     def test_get_summary_basic(self):
         summary = utils.get_summary(self.df)
         self.assertIn("num", summary.index)
@@ -41,30 +46,129 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(summary_nan.loc["col", "top_class"], "...")
         self.assertEqual(summary_nan.loc["col", "top_class_pct"], "...")
 
-    def test_assign_letters_default_order(self):
+    def test_get_summary_counts(self):
+        # Contagens agregadas de uma vez, com as mesmas colunas de sempre
+        summary = utils.get_summary(self.df)
+        self.assertEqual(list(summary.columns), [
+            'clumn_dtype', 'na', 'na_pct', 'top_class', 'top_class_pct', 'nunique', 'unique_values'])
+        self.assertEqual(summary["na"].tolist(), [1, 0, 0])
+        self.assertEqual(summary["na_pct"].tolist(), [20.0, 0.0, 0.0])
+        self.assertEqual(summary["nunique"].tolist(), [3, 2, 5])
+        self.assertEqual(summary.loc["cat", "top_class_pct"], 60.0)
+        self.assertEqual(summary.loc["cat", "unique_values"], ["A", "B"])
+
+    def test_get_summary_top_class_tie(self):
+        # Empate na classe mais frequente: vale a primeira a aparecer, como no value_counts
+        df = pd.DataFrame({"t": ["y", "x", "x", "y", np.nan]})
+        summary = utils.get_summary(df)
+        self.assertEqual(summary.loc["t", "top_class"], df["t"].value_counts().index[0])
+        self.assertEqual(summary.loc["t", "top_class_pct"], 40.0)
+
+    def test_assign_letters_orders(self):
+        # Um subteste por modo de ordenação, todos sobre os mesmos dados da classe
+        by_mean = dict(data=self.data_original, vals="valor", group="grupo")
+        cases = [
+            ("default", {}, ["A", "B", "C"]),
+            ("custom", dict(order=["C", "B", "A"]), ["C", "B", "A"]),
+            ("ascending", dict(order="ascending", **by_mean), ["A", "B", "C"]),  # menores médias primeiro
+            ("descending", dict(order="descending", **by_mean), ["C", "B", "A"]),  # maiores médias primeiro
+        ]
+        for name, kwargs, expected_index in cases:
+            with self.subTest(order=name):
+                result = utils.assign_letters(self.df_posthoc, "G1", "G2", "pval", **kwargs)
+                self.assertEqual(list(result.index), expected_index)
+                self.assertTrue(all(isinstance(v, str) for v in result["Letters"]))
+
+    def test_assign_letters_order_ascending_without_data_raises(self):
+        with self.assertRaises(ValueError):
+            utils.assign_letters(self.df_posthoc, "G1", "G2", "pval", order="ascending")
+
+    def test_assign_letters_expected_letters(self):
+        # A difere de B e B difere de C, mas A e C não diferem entre si
         result = utils.assign_letters(self.df_posthoc, "G1", "G2", "pval")
-        self.assertIn("A", result.index)
-        self.assertTrue(all(isinstance(v, str) for v in result["Letters"]))
+        self.assertEqual(result["Letters"].to_dict(), {"A": "a", "B": "b", "C": "a"})
 
-    def test_assign_letters_with_custom_order(self):
-        result = utils.assign_letters(self.df_posthoc, "G1", "G2", "pval", order=["C", "B", "A"])
-        self.assertEqual(list(result.index), ["C", "B", "A"])
+    def test_assign_letters_reversed_pair_uses_first_row(self):
+        # O par (C, A) repetido em sentido inverso não sobrescreve o primeiro p-valor
+        df = pd.concat(
+            [self.df_posthoc, pd.DataFrame({"G1": ["C"], "G2": ["A"], "pval": [0.001]})],
+            ignore_index=True,
+        )
+        result = utils.assign_letters(df, "G1", "G2", "pval")
+        self.assertEqual(result.loc["C", "Letters"], "a")
+
+    def test_assign_letters_does_not_modify_inputs(self):
+        # p-valores e valores em texto são convertidos sem alterar os DataFrames recebidos
+        df_posthoc = self.df_posthoc.astype({"pval": object})
+        data = self.data_original.astype({"valor": str})
+        expected_posthoc, expected_data = df_posthoc.copy(), data.copy()
 
-    def test_assign_letters_with_order_ascending(self):
         result = utils.assign_letters(
-            self.df_posthoc, "G1", "G2", "pval",
-            order="ascending", data=self.data_original, vals="valor", group="grupo"
+            df_posthoc, "G1", "G2", "pval",
+            order="descending", data=data, vals="valor", group="grupo"
         )
-        self.assertEqual(list(result.index), ["A", "B", "C"])  # menores médias primeiro
 
-    def test_assign_letters_with_order_descending(self):
+        self.assertEqual(list(result.index), ["C", "B", "A"])
+        pd.testing.assert_frame_equal(df_posthoc, expected_posthoc)
+        pd.testing.assert_frame_equal(data, expected_data)
+
+    def test_assign_letters_skips_unobserved_categories(self):
+        # Níveis categóricos sem observações (ex.: após um filtro) não viram grupos
+        from expdespy.datasets import load_dic_milho
+
+        df, desc = load_dic_milho()
+        data = df[df["variedade"] != "A"]
+        df_posthoc = pd.DataFrame({
+            "G1": ["B", "B", "C"],
+            "G2": ["C", "D", "D"],
+            "pval": [0.5, 0.01, 0.02]
+        })
+
         result = utils.assign_letters(
-            self.df_posthoc, "G1", "G2", "pval",
-            order="descending", data=self.data_original, vals="valor", group="grupo"
+            df_posthoc, "G1", "G2", "pval",
+            order="descending", data=data, vals=desc["response"], group=desc["trat"]
         )
-        self.assertEqual(list(result.index), ["C", "B", "A"])  # maiores médias primeiro
 
-    def test_assign_letters_order_ascending_without_data_raises(self):
-        with self.assertRaises(ValueError):
-            utils.assign_letters(self.df_posthoc, "G1", "G2", "pval", order="ascending")
+        self.assertEqual(list(result.index), ["D", "B", "C"])
+        self.assertEqual(result["Letters"].to_dict(), {"D": "a", "B": "b", "C": "b"})
+
+    def test_assign_letters_degenerate_cases(self):
+        # Nenhum par significativo: uma letra para todos; todos significativos: uma letra por grupo
+        df = self.df_posthoc.assign(pval=0.5)
+        result = utils.assign_letters(df, "G1", "G2", "pval")
+        self.assertEqual(result["Letters"].tolist(), ["a", "a", "a"])
+
+        df = self.df_posthoc.assign(pval=0.001)
+        result = utils.assign_letters(df, "G1", "G2", "pval", order=["C", "A", "B"])
+        self.assertEqual(result["Letters"].to_dict(), {"C": "a", "A": "b", "B": "c"})
+
+    def test_assign_letters_no_significant_pair_skips_matrix(self):
+        # Sem p-valor abaixo de alpha a resposta sai direto, sem a varredura das letras
+        from unittest import mock
+
+        df = self.df_posthoc.assign(pval=[0.5, np.nan, 0.06])
+        with mock.patch("expdespy.utils.utils._letter_sets") as letter_sets:
+            result = utils.assign_letters(df, "G1", "G2", "pval", order=["B", "C", "A"])
+        letter_sets.assert_not_called()
+        self.assertEqual(result["Letters"].to_dict(), {"B": "a", "C": "a", "A": "a"})
+
+    def test_letter_sets_bitmasks_match_definition(self):
+        # Máscaras de bits sem limite de grupos (k > 64) coincidem com a varredura por conjuntos
+        from expdespy.utils.utils import _letter_sets
+
+        rng = np.random.default_rng(0)
+        k = 70
+        means = np.sort(rng.normal(size=k))
+        significant = np.abs(means[:, None] - means[None, :]) > 0.5
+
+        expected = []
+        for i in range(k):
+            members = [i]
+            for j in range(k):
+                if j != i and not significant[members, j].any():
+                    members.append(j)
+            if set(members) not in expected:
+                expected.append(set(members))
 
+        masks = _letter_sets(significant)
+        self.assertEqual([{i for i in range(k) if m >> i & 1} for m in masks], expected)